@@ -0,0 +1,5 @@
+from dotenv import load_dotenv
+
+# The `LLM_EVAL_*` settings, and `HF_TOKEN` or `HF_HOME` for the Hugging Face libraries, are read
+# when the modules using them are imported, so `.env` is loaded before any of them.
+load_dotenv()
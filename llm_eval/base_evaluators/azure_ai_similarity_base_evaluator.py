@@ -1,5 +1,13 @@
 import logging
-from llm_eval.tools.utils import format_dict_log
+
+from llm_eval.tools.lexical_metrics import score_pair
+from llm_eval.tools.result_sink import report_result
+from llm_eval.tools.score_cache import (
+    apply_threshold,
+    get_score_cache,
+    library_version,
+    scoring_params,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +21,8 @@ class BaseScoreEvaluator:
         result_key: str,
         evaluator: type,
         assertion_fail_message: str,
+        lexical_metric: str = None,
+        lexical_params: dict = None,
     ):
         """Initialize the score evaluator with comparison parameters.
 
@@ -23,6 +33,9 @@ class BaseScoreEvaluator:
             result_key: Key in the evaluation result indicating pass or fail.
             evaluator: Evaluator implementation providing `_do_eval`.
             assertion_fail_message: Message for assertion failures.
+            lexical_metric: Optional `llm_eval.tools.lexical_metrics` metric that computes the
+                same scores as `evaluator` from tokens and n-grams shared between evaluators.
+            lexical_params: Optional keyword arguments for `lexical_metrics.score_pair`.
 
         Raises:
             ValueError: If `threshold` falls outside the inclusive [0, 1] range.
@@ -33,17 +46,14 @@ class BaseScoreEvaluator:
         self.result_key = result_key
         self.evaluator = evaluator
         self.assertion_fail_message = assertion_fail_message
+        self.lexical_metric = lexical_metric
+        self.lexical_params = lexical_params or {}
 
         if not 0.0 <= threshold <= 1.0:
             raise ValueError(f"Threshold must be between 0 and 1. Got {threshold}.")
 
     async def __call__(self) -> dict:
-        result = await self.evaluator._do_eval(
-            {
-                "response": self.response,
-                "ground_truth": self.ground_truth,
-            }
-        )
+        result = await self._evaluate()
 
         result = {
             **result,
@@ -51,9 +61,51 @@ class BaseScoreEvaluator:
             "ground_truth": self.ground_truth,
         }
 
-        logger.info(format_dict_log(dictionary=result))
+        report_result(type(self).__name__, result, logger)
         return result
 
+    @property
+    def cache_identity(self) -> dict:
+        """The metric's non-threshold configuration and library version, used to key cached scores."""
+        return {
+            "metric": type(self.evaluator).__name__,
+            "params": scoring_params(self.evaluator),
+            "azure_ai_evaluation": library_version("azure-ai-evaluation"),
+        }
+
+    async def _evaluate(self) -> dict:
+        eval_input = {"response": self.response, "ground_truth": self.ground_truth}
+
+        cache = get_score_cache()
+        if cache is None:
+            return await self._score(eval_input)
+
+        key = cache.make_key(type(self).__name__, self.cache_identity, eval_input)
+        cached = cache.get(key)
+        if cached is not None:
+            return apply_threshold(
+                cached,
+                self.threshold,
+                higher_is_better=getattr(self.evaluator, "_higher_is_better", True),
+            )
+
+        result = await self._score(eval_input)
+        cache.set(key, result)
+        return result
+
+    async def _score(self, eval_input: dict) -> dict:
+        if self.lexical_metric is None:
+            return await self.evaluator._do_eval(eval_input)
+        # Lexical metrics share each text's tokens and n-gram counts through the text artefact
+        # cache, so a battery of them on one pair tokenizes each text once.
+        return score_pair(
+            self.lexical_metric,
+            eval_input["response"],
+            eval_input["ground_truth"],
+            threshold=self.threshold,
+            **self.lexical_params,
+        )
+
     async def assert_result(self):
         result = await self()
         if result.get(f"{self.result_key}") == "fail":
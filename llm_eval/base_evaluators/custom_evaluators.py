@@ -1,6 +1,16 @@
-from transformers import pipeline
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-from llm_eval.tools.model_tools import REQUIRED_MODELS
+from llm_eval.tools.micro_batcher import get_micro_batcher
+from llm_eval.tools.model_tools import REQUIRED_MODELS, resolve_model_revision
+from llm_eval.tools.parallel_scoring import score_in_processes
+from llm_eval.tools.pipeline_registry import get_pipeline_registry
+from llm_eval.tools.quantization import QUANTIZED_DTYPE
+from llm_eval.tools.score_cache import get_score_cache
+
+WINDOW_COMBINE_RULES = ("max", "mean")
+
+# Tokenizers without a real limit report a very large model_max_length.
+DEFAULT_WINDOW_LENGTH = 512
 
 
 class TransformerEvaluator:
@@ -8,17 +18,31 @@ class TransformerEvaluator:
     A general-purpose evaluator for text classification using Hugging Face Transformers.
 
     This class wraps a classification pipeline and allows for either single-label or weighted aggregate
-    scoring, depending on initialization parameters.
+    scoring, depending on initialization parameters. Pipelines are shared process-wide through the
+    pipeline registry, so the model is only loaded once per (model, revision, device, dtype, backend).
 
     Args:
         evaluator (str): Key to retrieve the model name from REQUIRED_MODELS.
         label_index (int, optional): Index of the label to extract the score from if not aggregating. Defaults to 0.
         aggregate (bool, optional): Whether to compute a weighted aggregate score across all labels. Defaults to False.
         aggregate_weights (dict, optional): Dictionary of label weights used during aggregation. Required if aggregate is True.
+        device (str, optional): Device to run inference on. Defaults to "cpu".
+        dtype (str, optional): Torch dtype name to load the model with. Defaults to the model's own dtype.
+        backend (str, optional): Inference backend, "pytorch" or "onnx". The ONNX backend exports the
+            model once and runs it on CPU with ONNX Runtime. Defaults to "pytorch".
+        quantize (bool, optional): Whether to run the model with dynamic int8 quantization of its linear
+            layers (CPU, PyTorch backend only). The quantized weights are cached on disk. Defaults to False.
+        chunked (bool, optional): Whether to score responses longer than the model's token limit as
+            overlapping token windows instead of truncating them. Defaults to False.
+        window_stride (int, optional): Number of tokens shared by consecutive windows. Defaults to 64.
+        window_combine (str, optional): How window scores are combined into one score: "max" takes the
+            highest window score, "mean" takes the mean weighted by window token count. Defaults to "max".
 
     Example:
         evaluator = TransformerEvaluator("sentiment", aggregate=True, aggregate_weights=...)
         result = evaluator(response="The response text.")
+        results = evaluator.evaluate_batch(["First response.", "Second response."])
+        result = await evaluator.ascore("The response text.")
     """
 
     def __init__(
@@ -28,11 +52,72 @@ class TransformerEvaluator:
         label_index: int = 0,
         aggregate: bool = False,
         aggregate_weights: dict = None,
+        device: str = "cpu",
+        dtype: str = None,
+        backend: str = "pytorch",
+        quantize: bool = False,
+        chunked: bool = False,
+        window_stride: int = 64,
+        window_combine: str = "max",
     ):
+        if backend == "onnx" and device != "cpu":
+            raise ValueError(f"The ONNX backend only runs on cpu. Got device {device}.")
+        if quantize and (backend != "pytorch" or device != "cpu" or dtype is not None):
+            raise ValueError(
+                "Quantized mode requires the pytorch backend on cpu without a custom dtype."
+            )
+        if window_combine not in WINDOW_COMBINE_RULES:
+            raise ValueError(
+                f"Window combine rule must be one of {WINDOW_COMBINE_RULES}. Got {window_combine}."
+            )
+
         self.evaluator = evaluator
         self.label_index = label_index
         self.aggregate = aggregate
         self.aggregate_weights = aggregate_weights
+        self.model_name = REQUIRED_MODELS[evaluator]["name"]
+        self.revision = REQUIRED_MODELS[evaluator].get("revision", "main")
+        self.device = device
+        self.dtype = QUANTIZED_DTYPE if quantize else dtype
+        self.backend = backend
+        self.chunked = chunked
+        self.window_stride = window_stride
+        self.window_combine = window_combine
+
+    @property
+    def commit_hash(self) -> Optional[str]:
+        """The model commit `revision` points to, see `resolve_model_revision`."""
+        return resolve_model_revision(self.model_name, self.revision)
+
+    @property
+    def configuration(self) -> dict:
+        """The evaluator's settings, without resolving the model revision to a commit."""
+        return {
+            "evaluator_class": type(self).__name__,
+            "evaluator": self.evaluator,
+            "model": self.model_name,
+            "revision": self.revision,
+            "dtype": str(self.dtype),
+            "backend": self.backend,
+            "label_index": self.label_index,
+            "aggregate_weights": self.aggregate_weights if self.aggregate else None,
+            "window": [self.window_stride, self.window_combine] if self.chunked else None,
+        }
+
+    @property
+    def cache_identity(self) -> dict:
+        """Everything that determines this evaluator's scores, used to key persistent caches."""
+        return {**self.configuration, "commit": self.commit_hash}
+
+    @property
+    def classifier(self):
+        return get_pipeline_registry().get(
+            self.model_name,
+            revision=self.revision,
+            device=self.device,
+            dtype=self.dtype,
+            backend=self.backend,
+        )
 
     def __call__(self, *, response: str, **kwargs):
         """
@@ -45,22 +130,207 @@ class TransformerEvaluator:
         Returns:
             dict: A dictionary containing the evaluation score with the evaluator name as the key.
         """
-        classifier = pipeline(
-            "text-classification",
-            model=REQUIRED_MODELS[self.evaluator]["name"],
-            return_all_scores=True,
-            device="cpu",
+        return self.evaluate_batch([response])[0]
+
+    async def ascore(self, response: str) -> dict:
+        """
+        Evaluates the response without blocking the event loop.
+
+        Requests from concurrent coroutines are queued and scored together in micro-batches on a
+        background thread (see `llm_eval.tools.micro_batcher`).
+
+        Args:
+            response (str): The textual response to evaluate.
+
+        Returns:
+            dict: The same result as `__call__`.
+        """
+        return await get_micro_batcher(self).ascore(response)
+
+    def evaluate_batch(
+        self, responses: Sequence[str], batch_size: int = 32
+    ) -> List[dict]:
+        """
+        Evaluates many responses by running the classification model on padded mini-batches.
+
+        Responses are sorted by token length before batching so each mini-batch pads to a similar
+        length, and the scores are returned in the original order of `responses`. When the score
+        cache is enabled, only responses without a cached score are run through the model. In chunked
+        mode, long responses are scored as overlapping token windows (see `_score_windows`).
+
+        Args:
+            responses (Sequence[str]): The textual responses to evaluate.
+            batch_size (int, optional): Number of responses (or windows, in chunked mode) per forward
+                pass. Defaults to 32.
+
+        Returns:
+            List[dict]: One result dictionary per response, as returned by `__call__`.
+        """
+        responses = list(responses)
+        scores = [None] * len(responses)
+
+        cache = get_score_cache()
+        cache_keys = []
+        if cache is not None:
+            identity = self.cache_identity
+            for index, response in enumerate(responses):
+                key = cache.make_key(type(self).__name__, identity, {"response": response})
+                cache_keys.append(key)
+                cached = cache.get(key)
+                if cached is not None:
+                    scores[index] = {self.evaluator: cached}
+
+        pending = [index for index, score in enumerate(scores) if score is None]
+        if not pending:
+            return scores
+
+        classifier = self.classifier
+        if self.chunked:
+            new_scores = self._score_windows(classifier, responses, pending, batch_size)
+        else:
+            token_lengths = classifier.tokenizer([responses[i] for i in pending])["input_ids"]
+            lengths = {index: len(ids) for index, ids in zip(pending, token_lengths)}
+            order = sorted(pending, key=lambda i: lengths[i])
+
+            outputs = classifier([responses[i] for i in order], batch_size=batch_size)
+            new_scores = {
+                index: self._score(results) for index, results in zip(order, outputs)
+            }
+
+        for index, score in new_scores.items():
+            scores[index] = {self.evaluator: score}
+            if cache is not None:
+                cache.set(cache_keys[index], score)
+        return scores
+
+    def evaluate_parallel(
+        self,
+        responses: Sequence[str],
+        num_workers: int = None,
+        intra_op_threads: int = 1,
+        batch_size: int = 32,
+    ) -> List[dict]:
+        """
+        Evaluates a large corpus of responses sharded across worker processes.
+
+        See `llm_eval.tools.parallel_scoring.score_in_processes`.
+
+        Args:
+            responses (Sequence[str]): The textual responses to evaluate.
+            num_workers (int, optional): Number of worker processes. Defaults to the CPU count divided
+                by `intra_op_threads`.
+            intra_op_threads (int, optional): Threads each worker's model may use. Defaults to 1.
+            batch_size (int, optional): Number of responses per forward pass. Defaults to 32.
+
+        Returns:
+            List[dict]: One result dictionary per response, in the order of `responses`.
+        """
+        return score_in_processes(
+            self,
+            responses,
+            num_workers=num_workers,
+            intra_op_threads=intra_op_threads,
+            batch_size=batch_size,
         )
-        results = classifier(response)[0]
 
-        if self.aggregate and self.aggregate_weights:
-            score = sum(
-                self.aggregate_weights[x["label"]] * x["score"] for x in results
+    def _score_windows(
+        self, classifier, responses: List[str], pending: List[int], batch_size: int
+    ) -> dict:
+        """
+        Scores responses as overlapping token windows and combines the window scores per response.
+
+        Windows are streamed into mini-batches of `batch_size` and each response keeps only a running
+        max or weighted sum, so memory stays bounded however long the responses are.
+
+        Returns:
+            dict: The combined score of each response, keyed by its index in `responses`.
+        """
+        max_length = classifier.tokenizer.model_max_length
+        if not max_length or max_length > 100_000:
+            max_length = DEFAULT_WINDOW_LENGTH
+
+        combined = {}
+        buffer = []
+
+        def flush():
+            outputs = classifier(
+                [text for _, text, _ in buffer], batch_size=batch_size, truncation=True
             )
-        else:
-            score = results[self.label_index]["score"]
+            for (index, _, weight), results in zip(buffer, outputs):
+                score = self._score(results)
+                if self.window_combine == "max":
+                    combined[index] = max(combined.get(index, score), score)
+                else:
+                    total, total_weight = combined.get(index, (0.0, 0))
+                    combined[index] = (total + score * weight, total_weight + weight)
+            buffer.clear()
+
+        for index in pending:
+            for text, weight in self._iter_windows(
+                classifier.tokenizer, responses[index], max_length
+            ):
+                buffer.append((index, text, weight))
+                if len(buffer) >= batch_size:
+                    flush()
+        if buffer:
+            flush()
+
+        if self.window_combine == "mean":
+            return {
+                index: total / total_weight if total_weight else 0.0
+                for index, (total, total_weight) in combined.items()
+            }
+        return combined
+
+    def _iter_windows(
+        self, tokenizer, text: str, max_length: int
+    ) -> Iterator[Tuple[str, int]]:
+        """
+        Yields the text of each overlapping token window of `text` with its token count.
 
-        return {self.evaluator: score}
+        The text is tokenized one character segment at a time. Each segment's last window may be cut
+        mid-word, so it is dropped and the next segment starts where that window started.
+        """
+        segment_chars = max_length * 32
+        position = 0
+        while True:
+            segment = text[position : position + segment_chars]
+            is_last = position + segment_chars >= len(text)
+            encoding = tokenizer(
+                segment,
+                truncation=True,
+                max_length=max_length,
+                stride=min(self.window_stride, max_length // 2),
+                return_overflowing_tokens=True,
+                return_offsets_mapping=True,
+            )
+
+            windows = []
+            for ids, offsets in zip(encoding["input_ids"], encoding["offset_mapping"]):
+                spans = [(start, end) for start, end in offsets if end > start]
+                if spans:
+                    windows.append((spans[0][0], spans[-1][1], len(ids)))
+
+            if is_last and position == 0 and len(windows) <= 1:
+                # Short enough for a single forward pass: score the response as is.
+                yield text, len(encoding["input_ids"][0]) if encoding["input_ids"] else 0
+                return
+            if is_last or len(windows) <= 1:
+                for start, end, length in windows:
+                    yield segment[start:end], length
+                if is_last:
+                    return
+                position += windows[-1][1] if windows else len(segment)
+                continue
+
+            for start, end, length in windows[:-1]:
+                yield segment[start:end], length
+            position += windows[-1][0]
+
+    def _score(self, results: List[dict]) -> float:
+        if self.aggregate and self.aggregate_weights:
+            return sum(self.aggregate_weights[x["label"]] * x["score"] for x in results)
+        return results[self.label_index]["score"]
 
 
 class SentimentEvaluator(TransformerEvaluator):
@@ -77,12 +347,14 @@ class SentimentEvaluator(TransformerEvaluator):
         - "Positive": 0.5
         - "Very Positive": 1.0
 
+    In chunked mode, window scores are averaged weighted by their token count.
+
     Example:
         evaluator = SentimentEvaluator()
         result = evaluator(response="This is a great product!")
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         WEIGHTS = {
             "Very Negative": -1.0,
             "Negative": -0.5,
@@ -90,10 +362,12 @@ class SentimentEvaluator(TransformerEvaluator):
             "Positive": 0.5,
             "Very Positive": 1.0,
         }
+        kwargs.setdefault("window_combine", "mean")
         super().__init__(
             evaluator="sentiment",
             aggregate=True,
             aggregate_weights=WEIGHTS,
+            **kwargs,
         )
 
 
@@ -109,8 +383,8 @@ class BiasEvaluator(TransformerEvaluator):
         result = evaluator(response="That’s not how everyone sees it.")
     """
 
-    def __init__(self):
-        super().__init__(evaluator="bias", label_index=0)
+    def __init__(self, **kwargs):
+        super().__init__(evaluator="bias", label_index=0, **kwargs)
 
 
 class ToxicityEvaluator(TransformerEvaluator):
@@ -118,12 +392,13 @@ class ToxicityEvaluator(TransformerEvaluator):
     Evaluates the toxicity of a response using a transformer model.
 
     Selects the score from a specific label index (default 1), which is assumed
-    to correspond to the toxicity class in the classification output.
+    to correspond to the toxicity class in the classification output. In chunked mode, the most
+    toxic window sets the score.
 
     Example:
         evaluator = ToxicityEvaluator()
         result = evaluator(response="You’re an idiot.")
     """
 
-    def __init__(self):
-        super().__init__(evaluator="toxicity", label_index=1)
+    def __init__(self, **kwargs):
+        super().__init__(evaluator="toxicity", label_index=1, **kwargs)
@@ -2,9 +2,8 @@ import logging
 from typing import Any
 from abc import ABC, abstractmethod
 
-from llm_eval.tools.utils import format_dict_log
+from llm_eval.tools.result_sink import report_result
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
@@ -26,7 +25,7 @@ class FormatBaseEvaluator(ABC):
 
     def __call__(self):
         result = self.evaluate()
-        logger.info(format_dict_log(dictionary=result))
+        report_result(type(self).__name__, result, logger)
         return result
 
     def _format_result(self, result_flag: bool):
@@ -1,10 +1,16 @@
-from ragas.dataset_schema import SingleTurnSample
+import asyncio
+import inspect
 import logging
-from llm_eval.tools.utils import format_dict_log, camel_to_snake
+from typing import Iterable, List, Sequence
+
+from llm_eval.tools.result_sink import report_result
+from llm_eval.tools.score_cache import get_score_cache, library_version, model_identity
+from llm_eval.tools.utils import camel_to_snake, lazy_attributes
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+__getattr__ = lazy_attributes(__name__, {"SingleTurnSample": "ragas.dataset_schema"})
+
 
 class RagasBaseEvaluator:
     def __init__(
@@ -42,36 +48,17 @@ class RagasBaseEvaluator:
     async def __call__(self) -> dict:
         """
         Scores the response and determines if it passes the threshold.
+
+        When the score cache is enabled, a previously computed score for the same metric,
+        model and sample is reused instead of calling the metric.
         """
-        sample = SingleTurnSample(**self.sample_data)
-        score = await self.ragas_metric(**self.ragas_metric_args).single_turn_ascore(
-            sample=sample
-        )
+        score = await self._score()
 
         if isinstance(self.threshold, bool):
             pass_eval = "pass" if round(score) == 1 else "fail"
         else:
             pass_eval = "pass" if score >= self.threshold else "fail"
 
-
-        sample_data_logging = self.sample_data.copy()
-
-        for col in ['retrieved_contexts', 'reference_contexts']:
-            if col in sample_data_logging:
-                sample_data_logging[col] = [
-                    x if len(x) <= 200 else x[:100] + '......' + x[-100:]
-                    for x in sample_data_logging[col]
-                ]
-
-        logging_results = {
-            **sample_data_logging,
-            self.metric_name: score,
-            f"{self.metric_name}_threshold": self.threshold,
-            self.metric_name_result: pass_eval,
-        }
-
-        logger.info(format_dict_log(dictionary=logging_results))
-
         results = {
             **self.sample_data,
             self.metric_name: score,
@@ -79,9 +66,193 @@ class RagasBaseEvaluator:
             self.metric_name_result: pass_eval,
         }
 
+        report_result(type(self).__name__, results, logger)
         return results
 
+    @property
+    def metric(self):
+        """The ragas metric instance, built on first use. Batch runs share one across samples."""
+        if getattr(self, "_metric", None) is None:
+            self._metric = self.ragas_metric(**self.ragas_metric_args)
+        return self._metric
+
+    @classmethod
+    def from_sample(cls, sample: dict, **kwargs) -> "RagasBaseEvaluator":
+        """
+        Builds an evaluator from a sample dictionary, keeping only the fields it accepts.
+
+        Args:
+            sample (dict): Sample fields such as `user_input`, `response`, `reference`,
+                `retrieved_contexts` or `reference_contexts`.
+            **kwargs: Constructor arguments shared by every sample (e.g. `threshold`, `llm`).
+
+        Returns:
+            RagasBaseEvaluator: The evaluator for the sample.
+
+        Raises:
+            ValueError: If the sample is missing a field the evaluator requires.
+        """
+        parameters = inspect.signature(cls.__init__).parameters
+        arguments = {
+            name: value
+            for name, value in {**sample, **kwargs}.items()
+            if name in parameters
+        }
+        missing = [
+            name
+            for name, parameter in parameters.items()
+            if name != "self"
+            and parameter.default is inspect.Parameter.empty
+            and name not in arguments
+        ]
+        if missing:
+            raise ValueError(f"{cls.__name__} requires the sample fields {missing}.")
+        return cls(**arguments)
+
+    @classmethod
+    async def evaluate_batch(
+        cls, samples: Iterable[dict], max_concurrency: int = 16, **kwargs
+    ) -> List[dict]:
+        """
+        Scores many samples with one shared metric instance and bounded concurrency.
+
+        A sample whose scoring raises gets `"error"` as its result (with the message under
+        `"{metric}_error"`) instead of failing the whole batch.
+
+        Args:
+            samples (Iterable[dict]): Sample dictionaries, see `from_sample`.
+            max_concurrency (int, optional): Maximum samples scored at once. Defaults to 16.
+            **kwargs: Constructor arguments shared by every sample (e.g. `threshold`, `llm`).
+
+        Returns:
+            List[dict]: One result dictionary per sample, in the order of `samples`.
+
+        Example:
+            results = await RunFaithfulnessEvaluator.evaluate_batch(samples, threshold=0.8)
+        """
+        runners = [cls.from_sample(sample, **kwargs) for sample in samples]
+        return await _run_all(runners, asyncio.Semaphore(max_concurrency))
+
+    @property
+    def cache_identity(self) -> dict:
+        """The metric, its model configuration and the ragas version, used to key cached scores."""
+        return {
+            "metric": self.ragas_metric.__name__,
+            "metric_args": {
+                name: model_identity(value)
+                for name, value in sorted(self.ragas_metric_args.items())
+            },
+            "ragas": library_version("ragas"),
+        }
+
+    async def _score(self) -> float:
+        cache = get_score_cache()
+        if cache is not None:
+            key = cache.make_key(type(self).__name__, self.cache_identity, self.sample_data)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        from ragas.dataset_schema import SingleTurnSample
+
+        sample = SingleTurnSample(**self.sample_data)
+        score = await self.metric.single_turn_ascore(sample=sample)
+
+        if cache is not None:
+            cache.set(key, score)
+        return score
+
     async def assert_result(self):
         result = await self()
         if result.get(f"{self.metric_name_result}") == "fail":
             raise AssertionError(self.assertion_fail_message)
+
+
+async def _run_all(runners: List[RagasBaseEvaluator], semaphore: asyncio.Semaphore) -> List[dict]:
+    """Scores evaluators of one class concurrently, sharing the first one's metric instance."""
+    if not runners:
+        return []
+
+    metric = runners[0].metric
+    for runner in runners[1:]:
+        runner._metric = metric
+
+    async def run(runner: RagasBaseEvaluator) -> dict:
+        async with semaphore:
+            try:
+                return await runner()
+            except Exception as e:
+                logger.warning(f"{runner.metric_name} failed for a sample: {e}")
+                result = {
+                    **runner.sample_data,
+                    runner.metric_name: None,
+                    f"{runner.metric_name}_threshold": runner.threshold,
+                    runner.metric_name_result: "error",
+                    f"{runner.metric_name}_error": str(e),
+                }
+                report_result(type(runner).__name__, result, logger)
+                return result
+
+    return await asyncio.gather(*(run(runner) for runner in runners))
+
+
+async def evaluate_dataset(
+    samples: Iterable[dict],
+    evaluator_classes: Sequence[type],
+    max_concurrency: int = 16,
+    **kwargs,
+) -> dict:
+    """
+    Scores a dataset of samples with one or more ragas evaluators.
+
+    All evaluators run concurrently under one shared concurrency limit, each with a single metric
+    instance reused across samples.
+
+    Args:
+        samples (Iterable[dict]): Sample dictionaries, see `RagasBaseEvaluator.from_sample`.
+        evaluator_classes (Sequence[type]): `RagasBaseEvaluator` subclasses, e.g. from
+            `llm_eval.evaluators.rag`.
+        max_concurrency (int, optional): Maximum samples scored at once across all evaluators.
+            Defaults to 16.
+        **kwargs: Constructor arguments shared by every evaluator, passed to those that accept them
+            (e.g. `threshold`, `llm`, `embeddings`).
+
+    Returns:
+        dict: `results`, one merged result dictionary per sample, and `summary`, the number of
+        passed, failed and errored samples with the pass rate and mean score for each metric.
+
+    Example:
+        report = await evaluate_dataset(
+            samples, [RunFaithfulnessEvaluator, RunResponseRelevancyEvaluator], threshold=0.8
+        )
+        report["summary"]["faithfulness"]["pass_rate"]
+    """
+    samples = list(samples)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    runner_sets = [
+        [evaluator_class.from_sample(sample, **kwargs) for sample in samples]
+        for evaluator_class in evaluator_classes
+    ]
+    batches = await asyncio.gather(
+        *(_run_all(runners, semaphore) for runners in runner_sets)
+    )
+
+    results = [dict(sample) for sample in samples]
+    summary = {}
+    for runners, batch in zip(runner_sets, batches):
+        if not runners:
+            continue
+        metric_name = runners[0].metric_name
+        outcomes = [result[f"{metric_name}_result"] for result in batch]
+        scores = [result[metric_name] for result in batch if result[metric_name] is not None]
+        summary[metric_name] = {
+            "passed": outcomes.count("pass"),
+            "failed": outcomes.count("fail"),
+            "errors": outcomes.count("error"),
+            "pass_rate": outcomes.count("pass") / len(outcomes),
+            "mean_score": sum(scores) / len(scores) if scores else None,
+        }
+        for merged, result in zip(results, batch):
+            merged.update(result)
+
+    return {"results": results, "summary": summary}
@@ -1,10 +1,9 @@
 import logging
-from statistics import mean, stdev
-from typing import List
+from typing import List, Sequence
 
-from llm_eval.tools.utils import format_dict_log
+from llm_eval.tools.reference_cache import get_reference_cache
+from llm_eval.tools.result_sink import report_result
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +60,41 @@ class TransformerRunEvaluator:
         self.result = self.evaluator_class()(response=self.response)
         return self.evaluate_method(**self.evaluate_method_args)
 
+    @classmethod
+    def evaluate_batch(
+        cls, responses: Sequence[str], batch_size: int = 32, **kwargs
+    ) -> List[dict]:
+        """
+        Runs the evaluation for many responses, scoring them together in batched model passes.
+
+        Args:
+            responses (Sequence[str]): The textual responses to be evaluated.
+            batch_size (int, optional): Number of responses per forward pass. Defaults to 32.
+            **kwargs: Remaining constructor arguments of the runner, shared by every response
+                (e.g. `expected_score` or `references`).
+
+        Returns:
+            List[dict]: One result dictionary per response, in the order of `responses`.
+
+        Example:
+            results = RunToxicityEvaluatorAgainstExpectedScore.evaluate_batch(
+                responses, expected_score=0.0, allowed_uncertainty=0.1
+            )
+        """
+        runners = [cls(response=response, **kwargs) for response in responses]
+        if not runners:
+            return []
+
+        scores = runners[0].evaluator_class().evaluate_batch(
+            [runner.response for runner in runners], batch_size=batch_size
+        )
+
+        results = []
+        for runner, score in zip(runners, scores):
+            runner.result = score
+            results.append(runner.evaluate_method(**runner.evaluate_method_args))
+        return results
+
     def assert_result(self):
         """
         Raises an AssertionError if the result is not a pass.
@@ -104,7 +138,7 @@ class TransformerRunEvaluator:
             }
         )
 
-        logger.info(format_dict_log(dictionary=self.result))
+        report_result(type(self).__name__, self.result, logger)
 
         return self.result
 
@@ -115,6 +149,8 @@ class TransformerRunEvaluator:
         Compares the evaluated score to the distribution of scores from a set of golden standard responses.
 
         Uses the mean ± scaled standard deviation of the golden scores as the acceptance range.
+        The reference distribution is memoized per evaluator, model commit and reference list,
+        so the golden responses are only scored once across tests and runs.
 
         Args:
             references (List[str]): A list of gold-standard responses for comparison.
@@ -125,12 +161,12 @@ class TransformerRunEvaluator:
         """
 
         current_score = self.result[self.score_key]
-        reference_scores = []
-        for reference in references:
-            evaluator = self.evaluator_class()
-            reference_scores.append(evaluator(response=reference)[self.score_key])
-        score_mean = mean(reference_scores)
-        score_uncertainty = stdev(reference_scores) * scale_uncertainty
+        distribution = get_reference_cache().get_or_compute(
+            self.evaluator_class(), references
+        )
+        reference_scores = distribution["reference_scores"]
+        score_mean = distribution["mean_score"]
+        score_uncertainty = distribution["stdev"] * scale_uncertainty
         pass_state = (
             score_mean - score_uncertainty
             < current_score
@@ -147,5 +183,5 @@ class TransformerRunEvaluator:
             }
         )
 
-        logger.info(format_dict_log(dictionary=self.result))
+        report_result(type(self).__name__, self.result, logger)
         return self.result
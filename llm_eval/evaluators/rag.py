@@ -1,20 +1,32 @@
-from langchain.chat_models.base import BaseChatModel
-from ragas.embeddings import LangchainEmbeddingsWrapper
-from ragas.llms import LangchainLLMWrapper
-from ragas.metrics import (
-    Faithfulness,
-    LLMContextPrecisionWithReference,
-    LLMContextRecall,
-    NonLLMContextPrecisionWithReference,
-    NonLLMContextRecall,
-    ResponseRelevancy,
-)
+from typing import TYPE_CHECKING
 
 from llm_eval.base_evaluators.ragas_base_evaluator import RagasBaseEvaluator
 from llm_eval.tools.model_tools import (
     get_ragas_wrapped_azure_open_ai_embedding_model,
     get_ragas_wrapped_azure_openai_llm,
 )
+from llm_eval.tools.utils import lazy_attributes
+
+if TYPE_CHECKING:
+    from langchain.chat_models.base import BaseChatModel
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+    from ragas.llms import LangchainLLMWrapper
+
+# ragas and langchain are imported by the evaluators that use them, on first use.
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "BaseChatModel": "langchain.chat_models.base",
+        "LangchainEmbeddingsWrapper": "ragas.embeddings",
+        "LangchainLLMWrapper": "ragas.llms",
+        "Faithfulness": "ragas.metrics",
+        "LLMContextPrecisionWithReference": "ragas.metrics",
+        "LLMContextRecall": "ragas.metrics",
+        "NonLLMContextPrecisionWithReference": "llm_eval.tools.context_similarity",
+        "NonLLMContextRecall": "llm_eval.tools.context_similarity",
+        "ResponseRelevancy": "ragas.metrics",
+    },
+)
 
 
 class RunLLMContextPrecisionWithReferenceEvaluator(RagasBaseEvaluator):
@@ -45,8 +57,10 @@ class RunLLMContextPrecisionWithReferenceEvaluator(RagasBaseEvaluator):
         reference: str,
         retrieved_contexts: list[str],
         threshold: float,
-        llm: BaseChatModel = None,
+        llm: "BaseChatModel" = None,
     ):
+        from ragas.metrics import LLMContextPrecisionWithReference
+
         llm = llm or get_ragas_wrapped_azure_openai_llm()
         super().__init__(
             sample_data={
@@ -84,6 +98,8 @@ class RunNonLLMContextPrecisionWithReferenceEvaluator(RagasBaseEvaluator):
     def __init__(
         self, retrieved_contexts: list[str], reference_contexts: list[str], threshold: float
     ):
+        from llm_eval.tools.context_similarity import NonLLMContextPrecisionWithReference
+
         super().__init__(
             sample_data={
                 "retrieved_contexts": retrieved_contexts,
@@ -125,8 +141,10 @@ class RunLLMContextRecallEvaluator(RagasBaseEvaluator):
         reference: str,
         retrieved_contexts: list[str],
         threshold: float,
-        llm: BaseChatModel = None,
+        llm: "BaseChatModel" = None,
     ):
+        from ragas.metrics import LLMContextRecall
+
         llm = llm or get_ragas_wrapped_azure_openai_llm()
         super().__init__(
             sample_data={
@@ -167,6 +185,8 @@ class RunNonLLMContextRecallEvaluator(RagasBaseEvaluator):
         reference_contexts: list[str],
         threshold: float,
     ):
+        from llm_eval.tools.context_similarity import NonLLMContextRecall
+
         super().__init__(
             sample_data={
                 "retrieved_contexts": retrieved_contexts,
@@ -208,8 +228,10 @@ class RunFaithfulnessEvaluator(RagasBaseEvaluator):
         response: str,
         retrieved_contexts: list[str],
         threshold: float,
-        llm: LangchainLLMWrapper = None,
+        llm: "LangchainLLMWrapper" = None,
     ):
+        from ragas.metrics import Faithfulness
+
         llm = llm or get_ragas_wrapped_azure_openai_llm()
         super().__init__(
             sample_data={
@@ -257,9 +279,11 @@ class RunResponseRelevancyEvaluator(RagasBaseEvaluator):
         user_input: str,
         response: str,
         threshold: float,
-        llm: LangchainLLMWrapper = None,
-        embeddings: LangchainEmbeddingsWrapper = None,
+        llm: "LangchainLLMWrapper" = None,
+        embeddings: "LangchainEmbeddingsWrapper" = None,
     ):
+        from ragas.metrics import ResponseRelevancy
+
         llm = llm or get_ragas_wrapped_azure_openai_llm()
         embeddings = embeddings or get_ragas_wrapped_azure_open_ai_embedding_model()
         super().__init__(
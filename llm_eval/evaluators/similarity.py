@@ -1,37 +1,98 @@
+import asyncio
+import json
 import logging
-from typing import Optional
-
-from azure.ai.evaluation import (
-    AzureOpenAIModelConfiguration,
-    BleuScoreEvaluator,
-    F1ScoreEvaluator,
-    GleuScoreEvaluator,
-    MeteorScoreEvaluator,
-    RougeScoreEvaluator,
-    RougeType,
-    SimilarityEvaluator,
-)
-from ragas.embeddings import LangchainEmbeddingsWrapper
-from ragas.metrics import (
-    ExactMatch,
-    NonLLMStringSimilarity,
-    SemanticSimilarity,
-    StringPresence,
-)
+import threading
+from typing import TYPE_CHECKING, Iterable, List, Mapping, Optional
 
 from llm_eval.base_evaluators.azure_ai_similarity_base_evaluator import (
     BaseScoreEvaluator,
 )
 from llm_eval.base_evaluators.ragas_base_evaluator import RagasBaseEvaluator
+from llm_eval.tools.completion_cache import get_completion_cache
 from llm_eval.tools.model_tools import (
     get_azure_ai_evaluation_model_config,
     get_ragas_wrapped_azure_open_ai_embedding_model,
 )
-from llm_eval.tools.utils import format_dict_log
+from llm_eval.tools.rate_limiter import estimate_request_tokens, get_rate_limiter
+from llm_eval.tools.result_sink import report_result
+from llm_eval.tools.score_cache import (
+    apply_threshold,
+    get_score_cache,
+    library_version,
+    model_identity,
+)
+from llm_eval.tools.utils import lazy_attributes
+
+if TYPE_CHECKING:
+    from azure.ai.evaluation import AzureOpenAIModelConfiguration
+    from ragas.embeddings import LangchainEmbeddingsWrapper
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# azure.ai.evaluation and ragas are imported by the evaluators that use them, on first use.
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "AzureOpenAIModelConfiguration": "azure.ai.evaluation",
+        "BleuScoreEvaluator": "azure.ai.evaluation",
+        "F1ScoreEvaluator": "azure.ai.evaluation",
+        "GleuScoreEvaluator": "azure.ai.evaluation",
+        "MeteorScoreEvaluator": "azure.ai.evaluation",
+        "RougeScoreEvaluator": "azure.ai.evaluation",
+        "RougeType": "azure.ai.evaluation",
+        "SimilarityEvaluator": "azure.ai.evaluation",
+        "LangchainEmbeddingsWrapper": "ragas.embeddings",
+        "ExactMatch": "ragas.metrics",
+        "NonLLMStringSimilarity": "ragas.metrics",
+        "SemanticSimilarity": "ragas.metrics",
+        "StringPresence": "ragas.metrics",
+    },
+)
+
+
+_SIMILARITY_EVALUATORS = {}
+_SIMILARITY_EVALUATORS_LOCK = threading.Lock()
+
+
+def _get_similarity_evaluator(model_config: "AzureOpenAIModelConfiguration", threshold: float):
+    """
+    Returns the shared azure.ai.evaluation `SimilarityEvaluator` for a model config and threshold.
+
+    Building one loads `similarity.prompty` and sets up its model client, so one instance per
+    (model_config, threshold) is kept and reused by every `RunSimilarityEvaluator`.
+    """
+    key = (json.dumps(dict(model_config), sort_keys=True, default=str), threshold)
+    with _SIMILARITY_EVALUATORS_LOCK:
+        evaluator = _SIMILARITY_EVALUATORS.get(key)
+        if evaluator is None:
+            from azure.ai.evaluation import SimilarityEvaluator
+
+            # The evaluator adds keys to the configuration it is given, which would change the key.
+            evaluator = SimilarityEvaluator(model_config=dict(model_config), threshold=threshold)
+            _SIMILARITY_EVALUATORS[key] = evaluator
+    return evaluator
+
+
+def _similarity_error(threshold: float, message: str) -> dict:
+    return {
+        "similarity": None,
+        "similarity_result": "error",
+        "similarity_threshold": threshold,
+        "similarity_error": message,
+    }
+
+
+def _cache_hits() -> int:
+    """Lookups the score and completion caches have answered so far."""
+    caches = (get_score_cache(), get_completion_cache())
+    return sum(cache.hits for cache in caches if cache is not None)
+
+
+def _similarity_triple(sample) -> tuple:
+    if isinstance(sample, Mapping):
+        return sample["query"], sample["response"], sample["reference"]
+    return tuple(sample)
+
 
 class RunSimilarityEvaluator:
     """
@@ -66,7 +127,7 @@ class RunSimilarityEvaluator:
         response: str,
         reference: str,
         threshold: float,
-        model_config: Optional[AzureOpenAIModelConfiguration],
+        model_config: Optional["AzureOpenAIModelConfiguration"],
     ):
         self.query = query
         self.response = response
@@ -77,20 +138,214 @@ class RunSimilarityEvaluator:
         if not 0.0 <= threshold <= 5.0:
             raise ValueError(f"Threshold must be between 0 and 5. Got {threshold}.")
 
+    @property
+    def cache_identity(self) -> dict:
+        return {
+            "model_config": model_identity(dict(self.model_config)),
+            "azure_ai_evaluation": library_version("azure-ai-evaluation"),
+        }
+
     def __call__(self) -> dict:
-        evaluator = SimilarityEvaluator(
-            model_config=self.model_config, threshold=self.threshold
+        cache, key, result = self._cached_score()
+        if result is None:
+            result = self._judge()
+            if cache is not None:
+                cache.set(key, result)
+        return self._report(result)
+
+    async def acall(self) -> dict:
+        """Scores the triple like `__call__`, awaiting the judge without blocking the event loop."""
+        cache, key, result = self._cached_score()
+        if result is None:
+            result = await self._ajudge()
+            if cache is not None:
+                cache.set(key, result)
+        return self._report(result)
+
+    @classmethod
+    async def abatch(
+        cls,
+        samples: Iterable,
+        threshold: float,
+        model_config: Optional["AzureOpenAIModelConfiguration"] = None,
+        max_concurrency: int = 16,
+        packed: bool = False,
+        pack_token_budget: int = None,
+    ) -> List[dict]:
+        """
+        Scores many (query, response, reference) triples concurrently with one shared judge.
+
+        Every triple is judged by the same loaded `SimilarityEvaluator`, and up to
+        `max_concurrency` requests are in flight at once, so network latency overlaps. A triple
+        whose scoring raises gets `"error"` as its result (with the message under
+        `"similarity_error"`) instead of failing the whole batch.
+
+        With `packed=True`, triples are instead rated several to a request by a
+        `PackedSimilarityJudge`, which repeats the prompt's instructions and examples once per
+        pack rather than once per triple. Packed ratings can differ from one-at-a-time ratings;
+        check them on your data with `report_packed_similarity_calibration`.
+
+        Args:
+            samples (Iterable): `(query, response, reference)` tuples, or dictionaries with those
+                keys.
+            threshold (float): The minimum similarity score to pass, from 1.0 to 5.0.
+            model_config (Optional[AzureOpenAIModelConfiguration]): Configuration for the judge.
+                Defaults to the Azure OpenAI environment variables.
+            max_concurrency (int, optional): Maximum requests in flight. Defaults to 16.
+            packed (bool, optional): Rate several triples per request. Defaults to False.
+            pack_token_budget (int, optional): Estimated tokens per packed request. Defaults to
+                the `LLM_EVAL_SIMILARITY_PACK_TOKENS` environment variable, or 4000.
+
+        Returns:
+            List[dict]: One result dictionary per triple, in the order of `samples`.
+
+        Example:
+            results = await RunSimilarityEvaluator.abatch(triples, threshold=3.0)
+        """
+        model_config = model_config or get_azure_ai_evaluation_model_config()
+        runners = [
+            cls(
+                *_similarity_triple(sample),
+                threshold=threshold,
+                model_config=model_config,
+            )
+            for sample in samples
+        ]
+        if packed:
+            from llm_eval.tools.packed_similarity import PackedSimilarityJudge
+
+            judge = PackedSimilarityJudge(model_config, token_budget=pack_token_budget)
+            return await cls._abatch_packed(runners, judge, max_concurrency)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(runner: "RunSimilarityEvaluator") -> dict:
+            async with semaphore:
+                try:
+                    return await runner.acall()
+                except Exception as e:
+                    logger.warning(f"similarity failed for a sample: {e}")
+                    return runner._report(_similarity_error(runner.threshold, str(e)))
+
+        return await asyncio.gather(*(run(runner) for runner in runners))
+
+    @classmethod
+    async def _abatch_packed(
+        cls, runners: List["RunSimilarityEvaluator"], judge, max_concurrency: int
+    ) -> List[dict]:
+        results = [None] * len(runners)
+        unscored = []
+        for index, runner in enumerate(runners):
+            cache, key, cached = runner._cached_score(packed=True)
+            if cached is not None:
+                results[index] = runner._report(cached)
+            else:
+                unscored.append((index, cache, key))
+
+        stars = await judge.arate(
+            [
+                (runners[index].query, runners[index].response, runners[index].reference)
+                for index, _, _ in unscored
+            ],
+            max_concurrency=max_concurrency,
         )
-        result =  evaluator(
-            query=self.query,
-            response=self.response,
-            ground_truth=self.reference,
+        for (index, cache, key), rating in zip(unscored, stars):
+            runner = runners[index]
+            if rating is None:
+                message = f"No valid packed rating after {judge.max_attempts} attempts."
+                results[index] = runner._report(_similarity_error(runner.threshold, message))
+                continue
+            # The result layout of azure.ai.evaluation's `SimilarityEvaluator`.
+            result = apply_threshold(
+                {
+                    "similarity": float(rating),
+                    "gpt_similarity": float(rating),
+                    "similarity_result": None,
+                    "similarity_threshold": runner.threshold,
+                },
+                runner.threshold,
+            )
+            if cache is not None:
+                cache.set(key, result)
+            results[index] = runner._report(result)
+        return results
+
+    def _cached_score(self, packed: bool = False) -> tuple:
+        """Returns the score cache, this triple's key in it and the cached result, if any."""
+        cache = get_score_cache()
+        if cache is None:
+            return None, None, None
+        # Packed ratings are cached apart from one-at-a-time ratings.
+        identity = {**self.cache_identity, "packed": True} if packed else self.cache_identity
+        key = cache.make_key(
+            type(self).__name__,
+            identity,
+            {"query": self.query, "response": self.response, "reference": self.reference},
         )
+        cached = cache.get(key)
+        return cache, key, apply_threshold(cached, self.threshold) if cached is not None else None
 
+    def _report(self, result: dict) -> dict:
         result.update({'query': self.query, 'response': self.response, 'reference': self.reference})
 
-        logger.info(format_dict_log(dictionary=result))
+        report_result(type(self).__name__, result, logger)
+
+        return result
+
+    def _cached_completion(self) -> tuple:
+        """Returns the completion cache, this prompt's key in it and the cached result, if any."""
+        completion_cache = get_completion_cache()
+        if completion_cache is None:
+            return None, None, None
+        # The prompty template ships with azure.ai.evaluation, so the library version and
+        # the inputs rendered into it determine the prompt sent.
+        prompt = json.dumps(
+            {
+                "prompty": "similarity",
+                "query": self.query,
+                "response": self.response,
+                "ground_truth": self.reference,
+            },
+            ensure_ascii=False,
+        )
+        llm_string = json.dumps(self.cache_identity, sort_keys=True)
+        cached = completion_cache.lookup(prompt, llm_string)
+        if cached is not None:
+            cached = apply_threshold(cached, self.threshold)
+        return completion_cache, (prompt, llm_string), cached
+
+    def _judge_request(self) -> tuple:
+        # azure.ai.evaluation builds its own OpenAI client, so the call is scheduled as a whole
+        # against the deployment's budgets rather than through the shared HTTP pool.
+        limiter = get_rate_limiter(self.model_config.get("azure_deployment") or "default")
+        tokens = estimate_request_tokens({"messages": [self.query, self.response, self.reference]})
+        inputs = {"query": self.query, "response": self.response, "ground_truth": self.reference}
+        return limiter, tokens, inputs
+
+    def _judge(self) -> dict:
+        """Runs the prompty judge, answering from the completion cache when it is enabled."""
+        completion_cache, completion_key, result = self._cached_completion()
+        if result is not None:
+            return result
+
+        evaluator = _get_similarity_evaluator(self.model_config, self.threshold)
+        limiter, tokens, inputs = self._judge_request()
+        result = limiter.call(evaluator, tokens=tokens, **inputs)
+        if completion_cache is not None:
+            completion_cache.update(*completion_key, result)
+        return result
 
+    async def _ajudge(self) -> dict:
+        """Awaits the prompty judge, answering from the completion cache when it is enabled."""
+        completion_cache, completion_key, result = self._cached_completion()
+        if result is not None:
+            return result
+
+        evaluator = _get_similarity_evaluator(self.model_config, self.threshold)
+        limiter, tokens, inputs = self._judge_request()
+        result = await limiter.acall(evaluator._to_async(), tokens=tokens, **inputs)
+        if completion_cache is not None:
+            completion_cache.update(*completion_key, result)
         return result
 
     def assert_result(self):
@@ -109,13 +364,98 @@ class RunSimilarityEvaluator:
             }
         )
 
-        logger.info(format_dict_log(dictionary=result))
-
         if assert_result:
             assert result["similarity_result"] == "pass"
 
         return result
 
+
+async def report_packed_similarity_calibration(
+    samples: Iterable,
+    threshold: float = 3.0,
+    model_config: Optional["AzureOpenAIModelConfiguration"] = None,
+    pack_token_budget: int = None,
+    max_concurrency: int = 16,
+) -> dict:
+    """
+    Compares packed similarity ratings against one-at-a-time ratings of the same triples.
+
+    Scores `samples` with `RunSimilarityEvaluator.abatch` in both modes. Run it with the score
+    and completion caches disabled, so that both modes reach the model. The request counts only
+    include requests sent to the model, not answers replayed from either cache.
+
+    Args:
+        samples (Iterable): `(query, response, reference)` tuples, or dictionaries with those keys.
+        threshold (float, optional): The pass threshold, from 1.0 to 5.0. Defaults to 3.0.
+        model_config (Optional[AzureOpenAIModelConfiguration]): Configuration for the judge.
+            Defaults to the Azure OpenAI environment variables.
+        pack_token_budget (int, optional): Estimated tokens per packed request.
+        max_concurrency (int, optional): Maximum requests in flight. Defaults to 16.
+
+    Returns:
+        dict: Per-triple unpacked and packed scores with their difference. Also the mean and
+        maximum absolute difference, the fractions of triples rated identically, within one
+        star and with the same verdict, the errors in each mode, and the requests each mode sent.
+
+    Example:
+        report = await report_packed_similarity_calibration(triples)
+        report["exact_agreement"]
+    """
+    from llm_eval.tools.packed_similarity import PackedSimilarityJudge
+
+    triples = [_similarity_triple(sample) for sample in samples]
+    model_config = model_config or get_azure_ai_evaluation_model_config()
+    cache_hits = _cache_hits()
+    unpacked = await RunSimilarityEvaluator.abatch(
+        triples, threshold, model_config, max_concurrency=max_concurrency
+    )
+    unpacked_requests = len(triples) - (_cache_hits() - cache_hits)
+    judge = PackedSimilarityJudge(model_config, token_budget=pack_token_budget)
+    runners = [
+        RunSimilarityEvaluator(*triple, threshold=threshold, model_config=model_config)
+        for triple in triples
+    ]
+    packed = await RunSimilarityEvaluator._abatch_packed(runners, judge, max_concurrency)
+
+    scores = []
+    for (query, response, reference), single, multi in zip(triples, unpacked, packed):
+        both = single["similarity"] is not None and multi["similarity"] is not None
+        scores.append(
+            {
+                "query": query,
+                "response": response,
+                "reference": reference,
+                "unpacked": single["similarity"],
+                "packed": multi["similarity"],
+                "difference": multi["similarity"] - single["similarity"] if both else None,
+                "same_verdict": single["similarity_result"] == multi["similarity_result"],
+            }
+        )
+    compared = [score for score in scores if score["difference"] is not None]
+    differences = [abs(score["difference"]) for score in compared]
+
+    def fraction(count: int) -> Optional[float]:
+        return count / len(compared) if compared else None
+
+    return {
+        "threshold": threshold,
+        "pack_token_budget": judge.token_budget,
+        "compared": len(compared),
+        "mean_abs_difference": sum(differences) / len(differences) if differences else None,
+        "max_abs_difference": max(differences) if differences else None,
+        "exact_agreement": fraction(sum(difference == 0 for difference in differences)),
+        "within_one": fraction(sum(difference <= 1 for difference in differences)),
+        "verdict_agreement": fraction(sum(score["same_verdict"] for score in compared)),
+        "errors": {
+            "unpacked": sum(result["similarity"] is None for result in unpacked),
+            "packed": sum(result["similarity"] is None for result in packed),
+        },
+        "requests": {"unpacked": unpacked_requests, "packed": judge.requests},
+        "retried": judge.retried,
+        "scores": scores,
+    }
+
+
 class RunSemanticSimilarityEvaluator(RagasBaseEvaluator):
     """
     Evaluation Class: Similarity
@@ -144,8 +484,10 @@ class RunSemanticSimilarityEvaluator(RagasBaseEvaluator):
         response: str,
         reference: str,
         threshold: float,
-        embedding_model: LangchainEmbeddingsWrapper = None,
+        embedding_model: "LangchainEmbeddingsWrapper" = None,
     ):
+        from ragas.metrics import SemanticSimilarity
+
         embedding_model = (
             embedding_model or get_ragas_wrapped_azure_open_ai_embedding_model()
         )
@@ -177,6 +519,8 @@ class RunMeteorScoreEvaluator(BaseScoreEvaluator):
     """
 
     def __init__(self, response: str, reference: str, threshold: float):
+        from azure.ai.evaluation import MeteorScoreEvaluator
+
         evaluator = MeteorScoreEvaluator(threshold=threshold)
         super().__init__(
             response,
@@ -184,6 +528,7 @@ class RunMeteorScoreEvaluator(BaseScoreEvaluator):
             threshold,
             result_key="meteor_result",
             evaluator=evaluator,
+            lexical_metric="meteor",
             assertion_fail_message="Evaluation failed: the METEOR similarity score is not within the acceptable threshold",
         )
 
@@ -205,6 +550,8 @@ class RunBleuScoreEvaluator(BaseScoreEvaluator):
     """
 
     def __init__(self, response: str, reference: str, threshold: float):
+        from azure.ai.evaluation import BleuScoreEvaluator
+
         evaluator = BleuScoreEvaluator(threshold=threshold)
         super().__init__(
             response,
@@ -212,6 +559,7 @@ class RunBleuScoreEvaluator(BaseScoreEvaluator):
             threshold,
             result_key="bleu_result",
             evaluator=evaluator,
+            lexical_metric="bleu",
             assertion_fail_message="Evaluation failed: the BLUE similarity score is not within the acceptable threshold",
         )
 
@@ -234,6 +582,8 @@ class RunGleuScoreEvaluator(BaseScoreEvaluator):
     """
 
     def __init__(self, response: str, reference: str, threshold: float):
+        from azure.ai.evaluation import GleuScoreEvaluator
+
         evaluator = GleuScoreEvaluator(threshold=threshold)
         super().__init__(
             response,
@@ -241,6 +591,7 @@ class RunGleuScoreEvaluator(BaseScoreEvaluator):
             threshold,
             result_key="gleu_result",
             evaluator=evaluator,
+            lexical_metric="gleu",
             assertion_fail_message="Evaluation failed: the GLEU similarity score is not within the acceptable threshold",
         )
 
@@ -265,6 +616,8 @@ class RunRougeScoreEvaluator(BaseScoreEvaluator):
     """
 
     def __init__(self, response: str, reference: str, threshold: float):
+        from azure.ai.evaluation import RougeScoreEvaluator, RougeType
+
         evaluator = RougeScoreEvaluator(
             rouge_type=RougeType.ROUGE_L,
             precision_threshold=threshold,
@@ -277,6 +630,8 @@ class RunRougeScoreEvaluator(BaseScoreEvaluator):
             threshold,
             result_key="rouge_f1_score_result",
             evaluator=evaluator,
+            lexical_metric="rouge",
+            lexical_params={"rouge_type": RougeType.ROUGE_L},
             assertion_fail_message="Evaluation failed: the ROUGE similarity score is not within the acceptable threshold",
         )
 
@@ -304,6 +659,8 @@ class RunF1ScoreEvaluator(BaseScoreEvaluator):
     """
 
     def __init__(self, response: str, reference: str, threshold: float):
+        from azure.ai.evaluation import F1ScoreEvaluator
+
         evaluator = F1ScoreEvaluator(threshold=threshold)
         super().__init__(
             response,
@@ -311,6 +668,7 @@ class RunF1ScoreEvaluator(BaseScoreEvaluator):
             threshold,
             result_key="f1_result",
             evaluator=evaluator,
+            lexical_metric="f1",
             assertion_fail_message="Evaluation failed: the F1 similarity score is not within the acceptable threshold",
         )
 
@@ -332,6 +690,8 @@ class RunNonLLMStringSimilarityEvaluator(RagasBaseEvaluator):  # TODO add distan
     """
 
     def __init__(self, response: str, reference: str, threshold: float):
+        from ragas.metrics import NonLLMStringSimilarity
+
         super().__init__(
             sample_data={"response": response, "reference": reference},
             threshold=threshold,
@@ -356,6 +716,8 @@ class RunStringPresenceEvaluator(RagasBaseEvaluator):
     """
 
     def __init__(self, response: str, reference: str):
+        from ragas.metrics import StringPresence
+
         super().__init__(
             sample_data={"response": response, "reference": reference},
             threshold=False,
@@ -380,6 +742,8 @@ class RunExactMatchEvaluator(RagasBaseEvaluator):
     """
 
     def __init__(self, response: str, reference: str):
+        from ragas.metrics import ExactMatch
+
         super().__init__(
             sample_data={"response": response, "reference": reference},
             threshold=False,
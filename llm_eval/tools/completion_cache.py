@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Optional
+
+from llm_eval.tools.score_cache import SQLiteStore
+from llm_eval.tools.utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_MB = float(os.getenv("LLM_EVAL_COMPLETION_CACHE_MB", "1024"))
+
+
+class CompletionCache:
+    """
+    A persistent cache of LLM completions keyed on the model configuration and the full prompt.
+
+    The model configuration (`llm_string`) covers the deployment and every generation parameter
+    (temperature, n, stop sequences, ...), and the prompt covers every message sent, so a cached
+    completion is only returned for a request that would have been sent unchanged. Completions
+    are stored in a size-bounded SQLite file with least-recently-used eviction.
+
+    Args:
+        directory (str, optional): Directory for the cache database. Defaults to `completions`
+            inside the llm_eval cache directory.
+        max_size_mb (float, optional): Cap on the cache size in megabytes. Defaults to the
+            `LLM_EVAL_COMPLETION_CACHE_MB` environment variable, or 1024.
+
+    Example:
+        cache = enable_completion_cache()
+        ...
+        cache.stats  # {"hits": 4210, "misses": 0, "hit_rate": 1.0, ...}
+    """
+
+    def __init__(self, directory: str = None, max_size_mb: float = None):
+        directory = directory or get_cache_dir("completions")
+        self.store = SQLiteStore(
+            os.path.join(directory, "completions.sqlite"),
+            max_size_mb if max_size_mb is not None else DEFAULT_MAX_SIZE_MB,
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._langchain_cache = None
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        payload = json.dumps({"llm": llm_string, "prompt": prompt}, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Any]:
+        value = self.store.get(self.make_key(prompt, llm_string))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def update(self, prompt: str, llm_string: str, value: Any):
+        self.store.set(self.make_key(prompt, llm_string), json.dumps(value))
+
+    @property
+    def langchain_cache(self):
+        """This cache as a LangChain `BaseCache`, to pass as the `cache` of a chat model."""
+        with self._lock:
+            if self._langchain_cache is None:
+                self._langchain_cache = _langchain_cache_class()(self)
+            return self._langchain_cache
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.store),
+            "size_bytes": self.store.size_bytes,
+        }
+
+    def clear(self):
+        self.store.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+_LANGCHAIN_CACHE_CLASS = None
+
+
+def _langchain_cache_class() -> type:
+    # Defined on first use so importing this module does not import langchain.
+    global _LANGCHAIN_CACHE_CLASS
+    if _LANGCHAIN_CACHE_CLASS is not None:
+        return _LANGCHAIN_CACHE_CLASS
+
+    from langchain_core.caches import BaseCache
+    from langchain_core.load import dumps, loads
+
+    class LangchainCompletionCache(BaseCache):
+        """Stores LangChain generations in a `CompletionCache`, serialized with `langchain_core.load`."""
+
+        def __init__(self, cache: CompletionCache):
+            self.cache = cache
+
+        def lookup(self, prompt: str, llm_string: str):
+            value = self.cache.lookup(prompt, llm_string)
+            if value is None:
+                return None
+            try:
+                return [loads(generation) for generation in value]
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cached completion: {e}")
+                return None
+
+        def update(self, prompt: str, llm_string: str, return_val):
+            self.cache.update(
+                prompt, llm_string, [dumps(generation) for generation in return_val]
+            )
+
+        def clear(self, **kwargs):
+            self.cache.clear()
+
+    _LANGCHAIN_CACHE_CLASS = LangchainCompletionCache
+    return _LANGCHAIN_CACHE_CLASS
+
+
+_COMPLETION_CACHE: Optional[CompletionCache] = None
+_COMPLETION_CACHE_LOCK = threading.Lock()
+
+
+def enable_completion_cache(directory: str = None, max_size_mb: float = None) -> CompletionCache:
+    """
+    Enables the persistent completion cache for the LLM clients built in this process.
+
+    Args:
+        directory (str, optional): Directory for the cache database.
+        max_size_mb (float, optional): Cap on the cache size in megabytes.
+
+    Returns:
+        CompletionCache: The active cache.
+    """
+    global _COMPLETION_CACHE
+    with _COMPLETION_CACHE_LOCK:
+        _COMPLETION_CACHE = CompletionCache(directory=directory, max_size_mb=max_size_mb)
+    return _COMPLETION_CACHE
+
+
+def disable_completion_cache():
+    global _COMPLETION_CACHE
+    with _COMPLETION_CACHE_LOCK:
+        _COMPLETION_CACHE = None
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """
+    Returns the active completion cache, or None when caching is disabled.
+
+    The cache is off by default. It is enabled by `enable_completion_cache`, or on first use when
+    the `LLM_EVAL_COMPLETION_CACHE` environment variable is set to a truthy value.
+    """
+    global _COMPLETION_CACHE
+    if _COMPLETION_CACHE is None and os.getenv("LLM_EVAL_COMPLETION_CACHE", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    ):
+        with _COMPLETION_CACHE_LOCK:
+            if _COMPLETION_CACHE is None:
+                _COMPLETION_CACHE = CompletionCache()
+    return _COMPLETION_CACHE
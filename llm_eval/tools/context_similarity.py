@@ -0,0 +1,152 @@
+import logging
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+from rapidfuzz import distance, process
+from ragas.metrics import DistanceMeasure, NonLLMStringSimilarity
+from ragas.metrics import NonLLMContextPrecisionWithReference as RagasContextPrecision
+from ragas.metrics import NonLLMContextRecall as RagasContextRecall
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("LLM_EVAL_STRING_SIMILARITY_WORKERS", "1"))
+
+SCORERS = {
+    DistanceMeasure.LEVENSHTEIN: distance.Levenshtein.normalized_distance,
+    DistanceMeasure.HAMMING: distance.Hamming.normalized_distance,
+    DistanceMeasure.JARO: distance.Jaro.normalized_distance,
+    DistanceMeasure.JARO_WINKLER: distance.JaroWinkler.normalized_distance,
+}
+
+# Slack on the distance cutoff: rapidfuzz rounds cutoffs internally, and the slack keeps it from
+# clipping a pair whose similarity is exactly at the threshold.
+_CUTOFF_SLACK = 1e-5
+
+
+def similarity_matrix(
+    retrieved_contexts: Sequence[str],
+    reference_contexts: Sequence[str],
+    distance_measure: DistanceMeasure = DistanceMeasure.LEVENSHTEIN,
+    score_cutoff: float = None,
+    workers: int = None,
+) -> np.ndarray:
+    """
+    Computes the normalized string similarity of every retrieved context to every reference.
+
+    The matrix is computed natively in one `rapidfuzz.process.cdist` call. Like ragas, each
+    similarity is `1 - normalized_distance` in float64, so the values (and the verdicts of pairs
+    exactly at a threshold) are identical to the ragas metrics.
+
+    Args:
+        retrieved_contexts (Sequence[str]): The retrieved contexts (rows).
+        reference_contexts (Sequence[str]): The reference contexts (columns).
+        distance_measure (DistanceMeasure, optional): The string distance. Defaults to Levenshtein.
+        score_cutoff (float, optional): Similarities below this may be reported as 0, letting
+            rapidfuzz stop early on pairs that cannot reach it.
+        workers (int, optional): Threads used by rapidfuzz, -1 for all cores. Defaults to the
+            `LLM_EVAL_STRING_SIMILARITY_WORKERS` environment variable, or 1.
+
+    Returns:
+        np.ndarray: A (retrieved, reference) matrix of similarities between 0 and 1.
+    """
+    distance_cutoff = None
+    if score_cutoff is not None and score_cutoff > _CUTOFF_SLACK:
+        distance_cutoff = min(1.0, 1.0 - score_cutoff + _CUTOFF_SLACK)
+    distances = process.cdist(
+        retrieved_contexts,
+        reference_contexts,
+        scorer=SCORERS[DistanceMeasure(distance_measure)],
+        dtype=np.float64,
+        score_cutoff=distance_cutoff,
+        workers=workers or DEFAULT_WORKERS,
+    )
+    return 1.0 - distances
+
+
+def average_precision(verdicts: Sequence[int]) -> float:
+    """Average precision of ranked binary verdicts, summed in the same order as ragas."""
+    verdicts = [int(verdict) for verdict in verdicts]
+    hits = 0
+    terms = []
+    for rank, verdict in enumerate(verdicts, start=1):
+        hits += verdict
+        terms.append(hits / rank * verdict)
+    return sum(terms) / (sum(verdicts) + 1e-10)
+
+
+def context_precision_with_reference(
+    retrieved_contexts: Sequence[str],
+    reference_contexts: Sequence[str],
+    threshold: float = 0.5,
+    distance_measure: DistanceMeasure = DistanceMeasure.LEVENSHTEIN,
+    workers: int = None,
+) -> float:
+    """
+    Average precision of the retrieved contexts against the reference contexts.
+
+    A retrieved context is relevant when its best similarity to any reference reaches
+    `threshold`. Matches ragas' `NonLLMContextPrecisionWithReference`.
+    """
+    matrix = similarity_matrix(
+        retrieved_contexts, reference_contexts, distance_measure, threshold, workers
+    )
+    return average_precision(matrix.max(axis=1) >= threshold)
+
+
+def context_recall(
+    retrieved_contexts: Sequence[str],
+    reference_contexts: Sequence[str],
+    threshold: float = 0.5,
+    distance_measure: DistanceMeasure = DistanceMeasure.LEVENSHTEIN,
+    workers: int = None,
+) -> float:
+    """
+    Fraction of reference contexts matched by a retrieved context.
+
+    A reference context is recalled when its best similarity to any retrieved context exceeds
+    `threshold`. Matches ragas' `NonLLMContextRecall`.
+    """
+    if not reference_contexts:
+        return np.nan
+    matrix = similarity_matrix(
+        retrieved_contexts, reference_contexts, distance_measure, threshold, workers
+    )
+    return float(np.mean(matrix.max(axis=0) > threshold))
+
+
+def _string_distance(metric) -> Optional[DistanceMeasure]:
+    measure = metric.distance_measure
+    return measure.distance_measure if isinstance(measure, NonLLMStringSimilarity) else None
+
+
+# The subclasses keep the ragas class names, so evaluator result keys and cached scores are
+# unchanged. Both fall back to the ragas loop for distance measures other than string distances.
+
+
+class NonLLMContextPrecisionWithReference(RagasContextPrecision):
+    """ragas' `NonLLMContextPrecisionWithReference` computed from one similarity matrix."""
+
+    async def _single_turn_ascore(self, sample, callbacks) -> float:
+        measure = _string_distance(self)
+        if measure is None:
+            return await super()._single_turn_ascore(sample, callbacks)
+        assert sample.retrieved_contexts is not None, "retrieved_contexts is empty"
+        assert sample.reference_contexts is not None, "reference_contexts is empty"
+        return context_precision_with_reference(
+            sample.retrieved_contexts, sample.reference_contexts, self.threshold, measure
+        )
+
+
+class NonLLMContextRecall(RagasContextRecall):
+    """ragas' `NonLLMContextRecall` computed from one similarity matrix."""
+
+    async def _single_turn_ascore(self, sample, callbacks) -> float:
+        measure = _string_distance(self)
+        if measure is None:
+            return await super()._single_turn_ascore(sample, callbacks)
+        assert sample.retrieved_contexts is not None, "retrieved_contexts is empty"
+        assert sample.reference_contexts is not None, "reference_contexts is empty"
+        return context_recall(
+            sample.retrieved_contexts, sample.reference_contexts, self.threshold, measure
+        )
@@ -0,0 +1,318 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai.embeddings import OpenAIEmbeddings
+from ragas.embeddings import LangchainEmbeddingsWrapper
+from ragas.run_config import RunConfig
+
+from llm_eval.tools.score_cache import model_identity
+from llm_eval.tools.utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DTYPES = ("float32", "float16")
+DEFAULT_DTYPE = os.getenv("LLM_EVAL_EMBEDDING_CACHE_DTYPE", "float32")
+
+# SQLite limits the number of bound parameters per statement.
+_LOOKUP_CHUNK = 500
+
+
+class EmbeddingStore:
+    """
+    A persistent store of embedding vectors for one embedding model.
+
+    Vectors are appended to a flat file read through a `numpy.memmap`, one row per text, and a
+    SQLite index maps the sha256 of each text to its row. Rows are allocated inside an SQLite
+    write transaction and written before their index entries are committed, so several processes
+    can share the store and a reader never sees a row that is not fully written.
+
+    Args:
+        directory (str): Directory for the vector file and its index.
+        dtype (str, optional): 'float32', or 'float16' to halve the file size. Defaults to the
+            `LLM_EVAL_EMBEDDING_CACHE_DTYPE` environment variable, or 'float32'.
+    """
+
+    def __init__(self, directory: str, dtype: str = None):
+        dtype = dtype or DEFAULT_DTYPE
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}. Got {dtype}.")
+        self.dtype = np.dtype(dtype)
+        self.vectors_path = os.path.join(directory, f"vectors.{dtype}")
+        self._lock = threading.Lock()
+        self._vectors = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            os.path.join(directory, f"index.{dtype}.sqlite"),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE name = 'dimensions'"
+        ).fetchone()
+        self.dimensions: Optional[int] = row[0] if row else None
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _rows(self, keys: Sequence[str]) -> dict:
+        rows = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start : start + _LOOKUP_CHUNK]
+            rows.update(
+                self._connection.execute(
+                    f"SELECT key, row FROM vectors WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            )
+        return rows
+
+    def _mapped_vectors(self, min_rows: int) -> np.ndarray:
+        # Other processes may have appended rows since the file was mapped, so remap on demand.
+        if self._vectors is None or len(self._vectors) < min_rows:
+            row_bytes = self.dimensions * self.dtype.itemsize
+            rows = os.path.getsize(self.vectors_path) // row_bytes
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=self.dtype, mode="r", shape=(rows, self.dimensions)
+            )
+        return self._vectors
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Returns the stored vector of each text, or None for texts not stored yet."""
+        keys = [self.make_key(text) for text in texts]
+        with self._lock:
+            rows = self._rows(list(set(keys)))
+            if not rows:
+                return [None] * len(texts)
+            if self.dimensions is None:
+                self.dimensions = self._connection.execute(
+                    "SELECT value FROM meta WHERE name = 'dimensions'"
+                ).fetchone()[0]
+            vectors = self._mapped_vectors(max(rows.values()) + 1)
+            return [
+                vectors[rows[key]].astype(np.float32).tolist() if key in rows else None
+                for key in keys
+            ]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """Stores the vector of each text. Texts stored already keep their first vector."""
+        if not texts:
+            return
+        array = np.asarray(vectors, dtype=self.dtype)
+        keys = [self.make_key(text) for text in texts]
+
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                stored = self._connection.execute(
+                    "SELECT value FROM meta WHERE name = 'dimensions'"
+                ).fetchone()
+                if stored is None:
+                    self._connection.execute(
+                        "INSERT INTO meta (name, value) VALUES ('dimensions', ?)",
+                        (array.shape[1],),
+                    )
+                elif stored[0] != array.shape[1]:
+                    raise ValueError(
+                        f"Expected {stored[0]}-dimensional vectors. Got {array.shape[1]}."
+                    )
+                self.dimensions = array.shape[1]
+
+                existing = self._rows(keys)
+                new = {}
+                for key, vector in zip(keys, array):
+                    if key not in existing and key not in new:
+                        new[key] = vector
+                if new:
+                    next_row = self._connection.execute(
+                        "SELECT COALESCE(MAX(row) + 1, 0) FROM vectors"
+                    ).fetchone()[0]
+                    with open(self.vectors_path, "ab") as file:
+                        file.truncate(next_row * self.dimensions * self.dtype.itemsize)
+                        file.write(np.stack(list(new.values())).tobytes())
+                    self._connection.executemany(
+                        "INSERT INTO vectors (key, row) VALUES (?, ?)",
+                        [(key, next_row + offset) for offset, key in enumerate(new)],
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps a LangChain embedding model so each distinct text is embedded once across runs.
+
+    Texts found in the store are answered from it. The misses of a call are deduplicated and
+    sent to the model in a single `embed_documents` request, then stored for later calls and
+    other processes. Wrap the result in a `CachedEmbeddingsWrapper` for ragas.
+
+    Args:
+        embeddings (Embeddings): The embedding model, e.g. `AzureOpenAIEmbeddings`.
+        store (EmbeddingStore, optional): Where vectors are kept. Defaults to a store in the
+            `embeddings` cache folder, one per embedding model.
+        dtype (str, optional): Storage precision of the default store.
+
+    Example:
+        embeddings = CachedEmbeddingsWrapper(CachedEmbeddings(AzureOpenAIEmbeddings(...)))
+    """
+
+    def __init__(self, embeddings: Embeddings, store: EmbeddingStore = None, dtype: str = None):
+        self.embeddings = embeddings
+        if store is None:
+            identity = json.dumps(model_identity(embeddings), sort_keys=True)
+            store = EmbeddingStore(
+                get_cache_dir("embeddings", hashlib.sha256(identity.encode()).hexdigest()[:16]),
+                dtype=dtype,
+            )
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, texts: List[str]):
+        vectors = self.store.get_many(texts)
+        missing = [text for text, vector in zip(texts, vectors) if vector is None]
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        misses = list(dict.fromkeys(missing))
+        return vectors, misses
+
+    @staticmethod
+    def _fill(
+        texts: List[str], vectors: list, misses: List[str], embedded: list
+    ) -> List[List[float]]:
+        found = dict(zip(misses, embedded))
+        return [
+            vector if vector is not None else found[text] for text, vector in zip(texts, vectors)
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors, misses = self._lookup(texts)
+        embedded = []
+        if misses:
+            logger.debug(f"Embedding {len(misses)} uncached texts")
+            embedded = self.embeddings.embed_documents(misses)
+            self.store.put_many(misses, embedded)
+        return self._fill(texts, vectors, misses, embedded)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors, misses = self._lookup(texts)
+        embedded = []
+        if misses:
+            logger.debug(f"Embedding {len(misses)} uncached texts")
+            embedded = await self.embeddings.aembed_documents(misses)
+            self.store.put_many(misses, embedded)
+        return self._fill(texts, vectors, misses, embedded)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self.store),
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped model's attributes (deployment, model, ...) for cache identities.
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+
+class CachedEmbeddingsWrapper(LangchainEmbeddingsWrapper):
+    """
+    A ragas `LangchainEmbeddingsWrapper` for a `CachedEmbeddings` model.
+
+    ragas only applies the OpenAI settings of a `RunConfig` (the request timeout and retrying
+    `RateLimitError`) when it sees an `OpenAIEmbeddings` model, so this wrapper applies them to
+    the model behind the cache.
+
+    Args:
+        embeddings (CachedEmbeddings): The cached embedding model.
+        run_config (RunConfig, optional): The ragas run config. Defaults to `RunConfig()`.
+    """
+
+    def set_run_config(self, run_config: RunConfig):
+        super().set_run_config(run_config)
+        model = getattr(self.embeddings, "embeddings", None)
+        if isinstance(model, OpenAIEmbeddings):
+            from openai import RateLimitError
+
+            model.request_timeout = run_config.timeout
+            self.run_config.exception_types = RateLimitError
+
+
+_EMBEDDING_CACHE_DTYPE: Optional[str] = None
+
+
+def enable_embedding_cache(dtype: str = None) -> str:
+    """
+    Wraps the Azure OpenAI embedding clients built from now on in `CachedEmbeddings`.
+
+    Args:
+        dtype (str, optional): Storage precision, 'float32' or 'float16'.
+
+    Returns:
+        str: The storage precision in use.
+    """
+    global _EMBEDDING_CACHE_DTYPE
+    dtype = dtype or DEFAULT_DTYPE
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {DTYPES}. Got {dtype}.")
+    _EMBEDDING_CACHE_DTYPE = dtype
+    return dtype
+
+
+def disable_embedding_cache():
+    global _EMBEDDING_CACHE_DTYPE
+    _EMBEDDING_CACHE_DTYPE = None
+
+
+def get_embedding_cache_dtype() -> Optional[str]:
+    """
+    Returns the storage precision of the embedding cache, or None when caching is disabled.
+
+    The cache is off by default. It is enabled by `enable_embedding_cache`, or on first use when
+    the `LLM_EVAL_EMBEDDING_CACHE` environment variable is set to a truthy value.
+    """
+    global _EMBEDDING_CACHE_DTYPE
+    if _EMBEDDING_CACHE_DTYPE is None and os.getenv("LLM_EVAL_EMBEDDING_CACHE", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    ):
+        _EMBEDDING_CACHE_DTYPE = DEFAULT_DTYPE
+    return _EMBEDDING_CACHE_DTYPE
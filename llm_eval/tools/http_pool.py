@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Callable
+
+import httpx
+
+from llm_eval.tools.rate_limiter import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RateLimiter,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("LLM_EVAL_HTTP_MAX_CONNECTIONS", "100"))
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_EVAL_HTTP_MAX_KEEPALIVE", "20"))
+DEFAULT_TIMEOUT = float(os.getenv("LLM_EVAL_HTTP_TIMEOUT", "60"))
+
+
+class LoopLocalAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    An async transport keeping one connection pool per event loop.
+
+    Pooled connections belong to the event loop that opened them, so a single async client shared
+    across `asyncio.run` calls (or test cases) would otherwise reuse connections from a closed loop.
+
+    Args:
+        transport_factory (Callable): Builds the pooled transport for a new event loop.
+    """
+
+    def __init__(self, transport_factory: Callable[[], httpx.AsyncBaseTransport]):
+        self.transport_factory = transport_factory
+        self._transports = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _transport(self) -> httpx.AsyncBaseTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = self.transport_factory()
+            return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self):
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+class HTTPPool:
+    """
+    A pair of keep-alive HTTP clients (sync and async) shared by every LLM and embedding client.
+
+    Args:
+        max_connections (int, optional): Maximum open connections per pool. Defaults to the
+            `LLM_EVAL_HTTP_MAX_CONNECTIONS` environment variable, or 100.
+        max_keepalive_connections (int, optional): Maximum idle connections kept open per pool.
+            Defaults to the `LLM_EVAL_HTTP_MAX_KEEPALIVE` environment variable, or 20.
+        timeout (float, optional): Request timeout in seconds. Defaults to the
+            `LLM_EVAL_HTTP_TIMEOUT` environment variable, or 60.
+        transport_factory (Callable, optional): Builds the sync transport. Defaults to an
+            `httpx.HTTPTransport` with the pool limits.
+        async_transport_factory (Callable, optional): Builds an async transport for each event loop.
+            Defaults to an `httpx.AsyncHTTPTransport` with the pool limits.
+        rate_limiter (RateLimiter, optional): Schedules every request sent through the pool.
+            Defaults to the process-wide limiter of the Azure OpenAI deployment each request
+            targets.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = None,
+        max_keepalive_connections: int = None,
+        timeout: float = None,
+        transport_factory: Callable[[], httpx.BaseTransport] = None,
+        async_transport_factory: Callable[[], httpx.AsyncBaseTransport] = None,
+        rate_limiter: RateLimiter = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                max_keepalive_connections or DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+        )
+        self.timeout = httpx.Timeout(timeout or DEFAULT_TIMEOUT)
+        self.transport_factory = transport_factory or (
+            lambda: httpx.HTTPTransport(limits=self.limits)
+        )
+        self.async_transport_factory = async_transport_factory or (
+            lambda: httpx.AsyncHTTPTransport(limits=self.limits)
+        )
+        self.rate_limiter = rate_limiter
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                transport = RateLimitedTransport(self.transport_factory(), self.rate_limiter)
+                self._client = httpx.Client(transport=transport, timeout=self.timeout)
+                # A pool that is dropped without `close` (see `ClientProvider.clear`) may still
+                # serve clients built on it, so its connections close with the last of them.
+                weakref.finalize(self._client, transport.close)
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    transport=AsyncRateLimitedTransport(
+                        LoopLocalAsyncTransport(self.async_transport_factory), self.rate_limiter
+                    ),
+                    timeout=self.timeout,
+                )
+            return self._async_client
+
+    def close(self):
+        """Closes the sync client's connections. Async pools close with their event loops."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._async_client = None
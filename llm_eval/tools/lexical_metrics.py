@@ -0,0 +1,557 @@
+import logging
+import math
+import multiprocessing
+import os
+import re
+import string
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from llm_eval.tools.parallel_scoring import get_start_method
+from llm_eval.tools.text_artefacts import get_text_artefact_cache
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("bleu", "gleu", "meteor", "rouge", "f1")
+ROUGE_TYPES = ("rouge1", "rouge2", "rouge3", "rouge4", "rouge5", "rougeL")
+
+# BLEU and GLEU both use n-grams of orders 1 to 4.
+MAX_ORDER = 4
+
+# SmoothingFunction().method4 in nltk, the smoothing azure.ai.evaluation applies to BLEU.
+_BLEU_SMOOTHING_K = 5
+
+_ROUGE_NON_ALPHANUM = re.compile(r"[^a-z0-9]+")
+_ROUGE_SPACES = re.compile(r"\s+")
+_ROUGE_VALID_TOKEN = re.compile(r"^[a-z0-9]+$")
+_F1_PUNCTUATION = set(string.punctuation)
+_F1_ARTICLES = re.compile(r"\b(a|an|the)\b")
+
+# The METEOR parameters of azure.ai.evaluation's `MeteorScoreEvaluator`.
+_METEOR_DEFAULTS = {"alpha": 0.9, "beta": 3.0, "gamma": 0.5}
+
+
+class NgramStats(NamedTuple):
+    """The n-gram statistics of one (response, reference) pair that BLEU and GLEU share."""
+
+    matches: Tuple[int, ...]  # clipped matching n-grams, per order
+    hypothesis_counts: Tuple[int, ...]  # n-grams in the response, per order
+    reference_counts: Tuple[int, ...]  # n-grams in the reference, per order
+    hypothesis_length: int
+    reference_length: int
+
+
+class _NltkTokenizer:
+    """
+    The tokenizer of `azure.ai.evaluation._common.utils.nltk_tokenize`, set up once.
+
+    azure.ai.evaluation checks for the NLTK data on every call and builds a new
+    `NISTTokenizer` for every non-ASCII text. Both are done once here instead.
+    """
+
+    def __init__(self):
+        import nltk
+        from azure.ai.evaluation._common.utils import ensure_nltk_data_downloaded
+
+        ensure_nltk_data_downloaded()
+        self._word_tokenize = nltk.word_tokenize
+        self._nist = None
+
+    def __call__(self, text: str) -> List[str]:
+        if text.isascii():
+            return list(self._word_tokenize(text))
+        if self._nist is None:
+            from nltk.tokenize.nist import NISTTokenizer
+
+            self._nist = NISTTokenizer()
+        return list(self._nist.international_tokenize(text))
+
+
+_NLTK_TOKENIZER: Optional[_NltkTokenizer] = None
+
+
+def nltk_tokenize(text: str) -> List[str]:
+    """Tokenizes text as azure.ai.evaluation's `nltk_tokenize` does, for BLEU, GLEU and METEOR."""
+    global _NLTK_TOKENIZER
+    if _NLTK_TOKENIZER is None:
+        _NLTK_TOKENIZER = _NltkTokenizer()
+    return _NLTK_TOKENIZER(text)
+
+
+def rouge_tokenize(text: str) -> List[str]:
+    """Tokenizes text as the ROUGE scorer vendored in azure.ai.evaluation does (no stemming)."""
+    tokens = _ROUGE_SPACES.split(_ROUGE_NON_ALPHANUM.sub(" ", text.lower()))
+    return [token for token in tokens if _ROUGE_VALID_TOKEN.match(token)]
+
+
+def f1_tokenize(text: str) -> List[str]:
+    """Normalizes and splits text as azure.ai.evaluation's `F1ScoreEvaluator` does."""
+    text = "".join(ch for ch in text.lower() if ch not in _F1_PUNCTUATION)
+    return _F1_ARTICLES.sub(" ", text).split()
+
+
+def _ngrams(tokens: Sequence[str], n: int) -> Counter:
+    return Counter(tuple(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+
+
+def ngram_counts(tokens: Sequence[str], max_order: int = MAX_ORDER) -> List[Counter]:
+    """Counts the n-grams of each order from 1 to `max_order`."""
+    return [_ngrams(tokens, n) for n in range(1, max_order + 1)]
+
+
+# Per-text artefacts, shared through the text artefact cache: each text is tokenized and counted
+# once, whichever metrics or evaluators score it. The returned tuples and Counters must not be
+# mutated.
+
+
+def nltk_tokens(text: str) -> Tuple[str, ...]:
+    """The cached `nltk_tokenize` tokens of a text."""
+    return get_text_artefact_cache().get("nltk_tokens", text, lambda t: tuple(nltk_tokenize(t)))
+
+
+def nltk_ngrams(text: str) -> List[Counter]:
+    """The cached n-gram counts of orders 1 to 4 of a text's NLTK tokens, for BLEU and GLEU."""
+    return get_text_artefact_cache().get(
+        "nltk_ngrams", text, lambda t: ngram_counts(nltk_tokens(t))
+    )
+
+
+def rouge_tokens(text: str) -> Tuple[str, ...]:
+    """The cached `rouge_tokenize` tokens of a text."""
+    return get_text_artefact_cache().get("rouge_tokens", text, lambda t: tuple(rouge_tokenize(t)))
+
+
+def rouge_ngrams(text: str, n: int) -> Counter:
+    """The cached n-gram counts of order `n` of a text's ROUGE tokens."""
+    return get_text_artefact_cache().get(
+        f"rouge_ngrams{n}", text, lambda t: _ngrams(rouge_tokens(t), n)
+    )
+
+
+def f1_counts(text: str) -> Counter:
+    """The cached counts of a text's normalized `f1_tokenize` tokens."""
+    return get_text_artefact_cache().get("f1_counts", text, lambda t: Counter(f1_tokenize(t)))
+
+
+def ngram_stats(hypothesis: Sequence[str], reference: Sequence[str]) -> NgramStats:
+    """Counts the response and reference n-grams once, for both BLEU and GLEU."""
+    return ngram_stats_from_counts(ngram_counts(hypothesis), ngram_counts(reference))
+
+
+def ngram_stats_from_counts(
+    hypothesis_ngrams: Sequence[Counter], reference_ngrams: Sequence[Counter]
+) -> NgramStats:
+    """The `NgramStats` of a pair from each side's n-gram counts of orders 1 to 4."""
+    hypothesis_counts = tuple(sum(hyp.values()) for hyp in hypothesis_ngrams)
+    reference_counts = tuple(sum(ref.values()) for ref in reference_ngrams)
+    return NgramStats(
+        matches=tuple(
+            sum(min(count, ref[ngram]) for ngram, count in hyp.items())
+            for hyp, ref in zip(hypothesis_ngrams, reference_ngrams)
+        ),
+        hypothesis_counts=hypothesis_counts,
+        reference_counts=reference_counts,
+        # There are as many unigrams as tokens.
+        hypothesis_length=hypothesis_counts[0],
+        reference_length=reference_counts[0],
+    )
+
+
+def bleu_from_counts(
+    matches: Sequence[int],
+    denominators: Sequence[int],
+    hypothesis_length: int,
+    reference_length: int,
+) -> float:
+    """
+    BLEU with uniform weights and NIST smoothing (nltk `method4`), from clipped n-gram counts.
+
+    Reproduces nltk's `corpus_bleu` operation for operation, so the score equals
+    `sentence_bleu` for one pair and `corpus_bleu` for counts summed over a corpus.
+    """
+    if matches[0] == 0:
+        return 0
+    precisions = []
+    increment = 1
+    for numerator, denominator in zip(matches, denominators):
+        if numerator == 0 and hypothesis_length > 1:
+            smoothed = 1 / (2**increment * _BLEU_SMOOTHING_K / math.log(hypothesis_length))
+            precisions.append(smoothed / denominator)
+            increment += 1
+        else:
+            precisions.append(numerator / denominator)
+
+    if hypothesis_length > reference_length:
+        brevity_penalty = 1
+    elif hypothesis_length == 0:
+        brevity_penalty = 0
+    else:
+        brevity_penalty = math.exp(1 - reference_length / hypothesis_length)
+
+    weight = 1 / len(matches)
+    return brevity_penalty * math.exp(
+        math.fsum(weight * math.log(precision) for precision in precisions if precision > 0)
+    )
+
+
+def bleu(stats: NgramStats) -> float:
+    """Sentence BLEU of a pair, equal to azure.ai.evaluation's `BleuScoreEvaluator`."""
+    return bleu_from_counts(
+        stats.matches,
+        [max(1, count) for count in stats.hypothesis_counts],
+        stats.hypothesis_length,
+        stats.reference_length,
+    )
+
+
+def gleu_counts(stats: NgramStats) -> Tuple[int, int]:
+    """GLEU's matching n-grams and the larger of the response and reference n-gram totals."""
+    return sum(stats.matches), max(sum(stats.hypothesis_counts), sum(stats.reference_counts))
+
+
+def gleu(stats: NgramStats) -> float:
+    """Sentence GLEU of a pair, equal to azure.ai.evaluation's `GleuScoreEvaluator`."""
+    n_match, n_all = gleu_counts(stats)
+    return n_match / n_all if n_all > 0 else 0.0
+
+
+def corpus_bleu(stats: Sequence[NgramStats]) -> float:
+    """Corpus BLEU from the pairs' n-gram statistics, equal to nltk's `corpus_bleu` with `method4`."""
+    return bleu_from_counts(
+        [sum(pair.matches[n] for pair in stats) for n in range(MAX_ORDER)],
+        [sum(max(1, pair.hypothesis_counts[n]) for pair in stats) for n in range(MAX_ORDER)],
+        sum(pair.hypothesis_length for pair in stats),
+        sum(pair.reference_length for pair in stats),
+    )
+
+
+def corpus_gleu(stats: Sequence[NgramStats]) -> float:
+    """Corpus GLEU from the pairs' n-gram statistics, equal to nltk's `corpus_gleu`."""
+    counts = [gleu_counts(pair) for pair in stats]
+    n_all = sum(total for _, total in counts if total > 0)
+    return sum(match for match, total in counts if total > 0) / n_all if n_all else 0.0
+
+
+def _fmeasure(precision: float, recall: float) -> float:
+    if precision + recall > 0:
+        return 2 * precision * recall / (precision + recall)
+    return 0.0
+
+
+def lcs_length(a: Sequence[str], b: Sequence[str]) -> int:
+    """
+    Length of the longest common subsequence of two token sequences.
+
+    Uses the bit-parallel algorithm of Allison and Dix, in Hyyrö's formulation: one row of the
+    LCS table is a bit vector over the tokens of the longer sequence, held in a Python integer,
+    and each token of the shorter sequence updates the whole row in a few word-parallel integer
+    operations. Time is O(len(a) * len(b) / 64) and memory is linear, against the quadratic
+    table of the ROUGE scorer vendored in azure.ai.evaluation.
+    """
+    if len(b) > len(a):
+        a, b = b, a
+    if not b:
+        return 0
+    # Bit i of a token's match mask is set where the token occurs in `a`.
+    match_masks = {}
+    for i, token in enumerate(a):
+        match_masks[token] = match_masks.get(token, 0) | (1 << i)
+    all_ones = (1 << len(a)) - 1
+    row = all_ones
+    for token in b:
+        matches = row & match_masks.get(token, 0)
+        row = ((row + matches) | (row - matches)) & all_ones
+    # Each zero bit of the row is one step of the common subsequence.
+    return len(a) - row.bit_count()
+
+
+def _rouge_l(hypothesis: Sequence[str], reference: Sequence[str]) -> Tuple[float, float, float]:
+    if not hypothesis or not reference:
+        return 0.0, 0.0, 0.0
+    lcs = lcs_length(reference, hypothesis)
+    precision = lcs / len(hypothesis)
+    recall = lcs / len(reference)
+    return float(precision), float(recall), float(_fmeasure(precision, recall))
+
+
+def _rouge_n(hypothesis: Counter, reference: Counter) -> Tuple[float, float, float]:
+    overlap = sum(min(count, hypothesis[ngram]) for ngram, count in reference.items())
+    precision = overlap / max(sum(hypothesis.values()), 1)
+    recall = overlap / max(sum(reference.values()), 1)
+    return float(precision), float(recall), float(_fmeasure(precision, recall))
+
+
+def rouge(
+    hypothesis: Sequence[str], reference: Sequence[str], rouge_type: str = "rougeL"
+) -> Tuple[float, float, float]:
+    """ROUGE precision, recall and F-measure of a pair of `rouge_tokenize` token lists."""
+    if rouge_type == "rougeL":
+        return _rouge_l(hypothesis, reference)
+    n = int(rouge_type[5:])
+    return _rouge_n(_ngrams(hypothesis, n), _ngrams(reference, n))
+
+
+def _f1_from_counts(hypothesis: Counter, reference: Counter) -> float:
+    common = sum((hypothesis & reference).values())
+    if common == 0:
+        return 0.0
+    precision = 1.0 * common / sum(hypothesis.values())
+    recall = 1.0 * common / sum(reference.values())
+    return (2.0 * precision * recall) / (precision + recall)
+
+
+def f1(hypothesis: Sequence[str], reference: Sequence[str]) -> float:
+    """Token F1 of a pair of `f1_tokenize` token lists."""
+    return _f1_from_counts(Counter(hypothesis), Counter(reference))
+
+
+def _check_options(metrics: Sequence[str], rouge_type: str, threshold: Optional[float]) -> str:
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}. Choose from {METRICS}.")
+    rouge_type = getattr(rouge_type, "value", rouge_type)
+    if rouge_type not in ROUGE_TYPES:
+        raise ValueError(f"rouge_type must be one of {ROUGE_TYPES}. Got {rouge_type}.")
+    if threshold is not None and not 0.0 <= threshold <= 1.0:
+        raise ValueError(f"Threshold must be between 0 and 1. Got {threshold}.")
+    return rouge_type
+
+
+def _add(result: dict, metric: str, score: float, threshold: Optional[float]):
+    # The `{metric}_score`, `{metric}_result` and `{metric}_threshold` keys of azure.ai.evaluation.
+    result[f"{metric}_score"] = score
+    if threshold is not None:
+        result[f"{metric}_result"] = "pass" if score >= threshold else "fail"
+        result[f"{metric}_threshold"] = threshold
+
+
+def _score_metric(
+    metric: str,
+    response: str,
+    reference: str,
+    threshold: Optional[float],
+    rouge_type: str,
+    meteor_params: Dict[str, float],
+    stats: Optional[NgramStats] = None,
+) -> dict:
+    result = {}
+    if metric in ("bleu", "gleu"):
+        stats = stats or ngram_stats_from_counts(nltk_ngrams(response), nltk_ngrams(reference))
+        _add(result, metric, bleu(stats) if metric == "bleu" else gleu(stats), threshold)
+    elif metric == "meteor":
+        from nltk.translate.meteor_score import meteor_score
+
+        score = meteor_score(
+            [list(nltk_tokens(reference))], list(nltk_tokens(response)), **meteor_params
+        )
+        _add(result, "meteor", score, threshold)
+    elif metric == "rouge":
+        if rouge_type == "rougeL":
+            scores = _rouge_l(rouge_tokens(response), rouge_tokens(reference))
+        else:
+            n = int(rouge_type[5:])
+            scores = _rouge_n(rouge_ngrams(response, n), rouge_ngrams(reference, n))
+        for name, score in zip(("rouge_precision", "rouge_recall", "rouge_f1_score"), scores):
+            result[name] = score
+            if threshold is not None:
+                result[f"{name}_result"] = "pass" if score >= threshold else "fail"
+                result[f"{name}_threshold"] = threshold
+    else:
+        _add(result, "f1", _f1_from_counts(f1_counts(response), f1_counts(reference)), threshold)
+    return result
+
+
+def score_pair(
+    metric: str,
+    response: str,
+    reference: str,
+    threshold: float = None,
+    rouge_type: str = "rougeL",
+    meteor_params: Dict[str, float] = None,
+) -> dict:
+    """
+    Scores one (response, reference) pair with one lexical metric.
+
+    The tokens and n-gram counts of both texts come from the text artefact cache, so scoring
+    the same pair with several metrics, or the same reference against several responses,
+    tokenizes each text once per tokenizer. The result has the keys and values that the
+    azure.ai.evaluation evaluator of the metric returns.
+
+    Args:
+        metric (str): One of "bleu", "gleu", "meteor", "rouge" and "f1".
+        response (str): The generated text.
+        reference (str): The reference text.
+        threshold (float, optional): When given, each score gets a pass/fail `*_result` and a
+            `*_threshold` key.
+        rouge_type (str, optional): One of "rouge1" to "rouge5" or "rougeL". Defaults to "rougeL".
+        meteor_params (Dict[str, float], optional): `alpha`, `beta` and `gamma` for METEOR.
+            Defaults to azure.ai.evaluation's 0.9, 3.0 and 0.5.
+
+    Returns:
+        dict: The scores of the pair.
+
+    Example:
+        score_pair("rouge", response, reference, threshold=0.5)["rouge_f1_score"]
+    """
+    rouge_type = _check_options((metric,), rouge_type, threshold)
+    meteor_params = {**_METEOR_DEFAULTS, **(meteor_params or {})}
+    return _score_metric(metric, response, reference, threshold, rouge_type, meteor_params)
+
+
+class _PairScorer:
+    """Scores pairs with the selected metrics from the shared per-text artefacts."""
+
+    def __init__(
+        self,
+        metrics: Sequence[str],
+        rouge_type: str,
+        threshold: Optional[float],
+        meteor_params: Dict[str, float],
+    ):
+        self.metrics = metrics
+        self.rouge_type = rouge_type
+        self.threshold = threshold
+        self.meteor_params = meteor_params
+
+    def score(self, response: str, reference: str) -> Tuple[dict, Optional[NgramStats]]:
+        stats = None
+        if "bleu" in self.metrics or "gleu" in self.metrics:
+            stats = ngram_stats_from_counts(nltk_ngrams(response), nltk_ngrams(reference))
+        result = {}
+        for metric in self.metrics:
+            result.update(
+                _score_metric(
+                    metric,
+                    response,
+                    reference,
+                    self.threshold,
+                    self.rouge_type,
+                    self.meteor_params,
+                    stats,
+                )
+            )
+        result.update({"response": response, "ground_truth": reference})
+        return result, stats
+
+    def score_pairs(self, pairs: Sequence[Tuple[str, str]]) -> List[Tuple[dict, NgramStats]]:
+        return [self.score(response, reference) for response, reference in pairs]
+
+
+_WORKER_SCORER: Optional[_PairScorer] = None
+
+
+def _init_worker(metrics, rouge_type, threshold, meteor_params):
+    global _WORKER_SCORER
+    _WORKER_SCORER = _PairScorer(metrics, rouge_type, threshold, meteor_params)
+
+
+def _score_shard(shard: Tuple[int, List[Tuple[str, str]]]) -> Tuple[int, list]:
+    start, pairs = shard
+    return start, _WORKER_SCORER.score_pairs(pairs)
+
+
+def _summarize(results: List[dict], stats: List[Optional[NgramStats]], metrics) -> dict:
+    def mean(name: str) -> Optional[float]:
+        return math.fsum(result[name] for result in results) / len(results) if results else None
+
+    summary = {}
+    if "bleu" in metrics:
+        summary["bleu"] = {
+            "mean_score": mean("bleu_score"),
+            "corpus_score": corpus_bleu(stats) if results else None,
+        }
+    if "gleu" in metrics:
+        summary["gleu"] = {"mean_score": mean("gleu_score"), "corpus_score": corpus_gleu(stats)}
+    if "meteor" in metrics:
+        summary["meteor"] = {"mean_score": mean("meteor_score")}
+    if "rouge" in metrics:
+        summary["rouge"] = {
+            "mean_precision": mean("rouge_precision"),
+            "mean_recall": mean("rouge_recall"),
+            "mean_f1_score": mean("rouge_f1_score"),
+        }
+    if "f1" in metrics:
+        summary["f1"] = {"mean_score": mean("f1_score")}
+
+    if results and any(key.endswith("_result") for key in results[0]):
+        for key in [key for key in results[0] if key.endswith("_result")]:
+            outcomes = [result[key] for result in results]
+            summary.setdefault("pass_rates", {})[key] = outcomes.count("pass") / len(outcomes)
+    return summary
+
+
+def score_lexical_metrics(
+    responses: Sequence[str],
+    references: Sequence[str],
+    metrics: Sequence[str] = METRICS,
+    threshold: float = None,
+    rouge_type: str = "rougeL",
+    meteor_params: Dict[str, float] = None,
+    num_workers: int = 1,
+    shard_size: int = None,
+) -> dict:
+    """
+    Scores many (response, reference) pairs with BLEU, GLEU, METEOR, ROUGE and F1 in one pass.
+
+    Each text is tokenized once per tokenizer through the text artefact cache: the NLTK tokens
+    feed BLEU, GLEU and METEOR, and a single n-gram count per pair feeds both BLEU and GLEU.
+    Per-pair scores equal those of the azure.ai.evaluation evaluators behind
+    `RunBleuScoreEvaluator`, `RunGleuScoreEvaluator`, `RunMeteorScoreEvaluator`,
+    `RunRougeScoreEvaluator` and `RunF1ScoreEvaluator`.
+
+    Args:
+        responses (Sequence[str]): The generated texts.
+        references (Sequence[str]): The reference texts, parallel to `responses`.
+        metrics (Sequence[str], optional): Any of "bleu", "gleu", "meteor", "rouge" and "f1".
+            Defaults to all five. METEOR needs the NLTK WordNet data.
+        threshold (float, optional): When given, each score gets a pass/fail `*_result` and a
+            `*_threshold` key, as the single-pair evaluators return.
+        rouge_type (str, optional): One of "rouge1" to "rouge5" or "rougeL". Defaults to "rougeL",
+            as `RunRougeScoreEvaluator` uses.
+        meteor_params (Dict[str, float], optional): `alpha`, `beta` and `gamma` for METEOR.
+            Defaults to azure.ai.evaluation's 0.9, 3.0 and 0.5.
+        num_workers (int, optional): Worker processes to spread the pairs over, or None for one
+            per CPU. Defaults to 1, scoring in this process.
+        shard_size (int, optional): Pairs per task sent to a worker. Defaults to about four
+            tasks per worker.
+
+    Returns:
+        dict: `results`, one dictionary of scores per pair in input order, and `summary`, the
+        mean of each score, corpus-level BLEU and GLEU, and pass rates when a threshold is given.
+
+    Example:
+        report = score_lexical_metrics(responses, references, threshold=0.5, num_workers=4)
+        report["summary"]["bleu"]["corpus_score"]
+    """
+    responses = list(responses)
+    references = list(references)
+    if len(responses) != len(references):
+        raise ValueError(
+            f"Expected as many references as responses. Got {len(references)} and {len(responses)}."
+        )
+    rouge_type = _check_options(metrics, rouge_type, threshold)
+    metrics = tuple(metric for metric in METRICS if metric in metrics)
+    meteor_params = {**_METEOR_DEFAULTS, **(meteor_params or {})}
+    config = (metrics, rouge_type, threshold, meteor_params)
+
+    pairs = list(zip(responses, references))
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(pairs)))
+    if num_workers == 1:
+        scored = _PairScorer(*config).score_pairs(pairs)
+    else:
+        size = shard_size or max(1, math.ceil(len(pairs) / (num_workers * 4)))
+        shards = [(start, pairs[start : start + size]) for start in range(0, len(pairs), size)]
+        start_method = get_start_method()
+        logger.info(
+            f"Scoring {len(pairs)} pairs in {len(shards)} shards "
+            f"on {num_workers} {start_method} workers"
+        )
+        context = multiprocessing.get_context(start_method)
+        scored = [None] * len(pairs)
+        with context.Pool(num_workers, initializer=_init_worker, initargs=config) as pool:
+            for start, shard_scores in pool.imap_unordered(_score_shard, shards):
+                scored[start : start + len(shard_scores)] = shard_scores
+
+    results = [result for result, _ in scored]
+    stats = [pair_stats for _, pair_stats in scored]
+    return {"results": results, "summary": _summarize(results, stats, metrics)}
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("LLM_EVAL_MAX_BATCH_SIZE", "32"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("LLM_EVAL_MAX_WAIT_MS", "10"))
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collects scoring requests from many callers into batches run on a background thread.
+
+    A batch is flushed as soon as it holds `max_batch_size` requests, or once `max_wait_ms` has
+    passed since its first request arrived. Each caller gets a future resolved with its own result,
+    or with the exception raised while scoring its batch.
+
+    Args:
+        score_batch (Callable): Function scoring a list of inputs and returning one result per input.
+        max_batch_size (int, optional): Largest batch to score at once. Defaults to the
+            `LLM_EVAL_MAX_BATCH_SIZE` environment variable, or 32.
+        max_wait_ms (float, optional): Longest time a request waits for its batch to fill. Defaults
+            to the `LLM_EVAL_MAX_WAIT_MS` environment variable, or 10.
+
+    Example:
+        batcher = MicroBatcher(evaluator.evaluate_batch)
+        result = await batcher.ascore("The response text.")
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = None,
+        max_wait_ms: float = None,
+    ):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size or DEFAULT_MAX_BATCH_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else DEFAULT_MAX_WAIT_MS
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1. Got {self.max_batch_size}.")
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, item: Any) -> Future:
+        """Queues one input for scoring and returns a future for its result."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+
+    async def ascore(self, item: Any) -> Any:
+        """Queues one input for scoring and awaits its result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def close(self):
+        """Stops the worker thread once the requests already queued have been scored."""
+        with self._lock:
+            if self._worker is None:
+                return
+            self._queue.put(_STOP)
+            worker, self._worker = self._worker, None
+        worker.join()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="llm-eval-micro-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is _STOP:
+                return
+
+            batch = [request]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                batch.append(request)
+
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list):
+        batch = [
+            (item, future) for item, future in batch if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        logger.debug(f"Scoring micro-batch of {len(batch)} requests")
+        try:
+            results = list(self.score_batch([item for item, _ in batch]))
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"score_batch returned {len(results)} results for {len(batch)} requests."
+                )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+_BATCHERS = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def get_micro_batcher(evaluator) -> MicroBatcher:
+    """
+    Returns the process-wide micro-batcher for an evaluator's configuration.
+
+    Evaluators with the same `configuration` and device score identically, so they share one queue
+    and their requests are batched together. The key leaves out the model commit, which may need
+    a filesystem or hub lookup, so the event loop never waits on it: `evaluate_batch` resolves it
+    on the batch thread.
+
+    Args:
+        evaluator (TransformerEvaluator): The evaluator whose `evaluate_batch` scores the batches.
+
+    Returns:
+        MicroBatcher: The shared batcher.
+    """
+    key = json.dumps(
+        {"configuration": evaluator.configuration, "device": str(evaluator.device)},
+        sort_keys=True,
+    )
+    with _BATCHERS_LOCK:
+        if key not in _BATCHERS:
+            _BATCHERS[key] = MicroBatcher(evaluator.evaluate_batch)
+        return _BATCHERS[key]
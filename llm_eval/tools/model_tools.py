@@ -1,16 +1,48 @@
+import hashlib
+import json
+import logging
 import os
-from typing import Optional
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Hashable, List, Optional
+
+from llm_eval.tools.completion_cache import get_completion_cache
+from llm_eval.tools.utils import get_cache_dir, lazy_attributes
+
+if TYPE_CHECKING:
+    from langchain.chat_models.base import BaseChatModel
+    from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+
+    from llm_eval.tools.http_pool import HTTPPool
+
+logger = logging.getLogger(__name__)
+
+# Heavy dependencies are imported on first use so importing an evaluator stays cheap.
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "AzureOpenAIModelConfiguration": "azure.ai.evaluation",
+        "HfApi": "huggingface_hub",
+        "snapshot_download": "huggingface_hub",
+        "BaseChatModel": "langchain.chat_models.base",
+        "AzureChatOpenAI": "langchain_openai",
+        "AzureOpenAIEmbeddings": "langchain_openai",
+        "LangchainEmbeddingsWrapper": "ragas.embeddings",
+        "LangchainLLMWrapper": "ragas.llms",
+        "AutoConfig": "transformers",
+        "AutoModel": "transformers",
+        "AutoTokenizer": "transformers",
+    },
+)
+
 
-from azure.ai.evaluation import AzureOpenAIModelConfiguration
-from dotenv import load_dotenv
-from huggingface_hub import snapshot_download
-from langchain.chat_models.base import BaseChatModel
-from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
-from ragas.embeddings import LangchainEmbeddingsWrapper
-from ragas.llms import LangchainLLMWrapper
-from transformers import AutoConfig, AutoModel, AutoTokenizer
+def _lazy(name: str):
+    """Returns a lazily imported name, or the value patched onto this module in its place."""
+    return globals().get(name) or __getattr__(name)
 
-load_dotenv()
 
 REQUIRED_MODELS = {
     "sentiment": {"name": "tabularisai/multilingual-sentiment-analysis"},
@@ -21,23 +53,209 @@ REQUIRED_MODELS = {
 }
 
 
+def get_local_snapshot(model_name: str, revision: str = "main") -> Optional[str]:
+    """
+    Returns the local snapshot directory of a cached model without any network calls.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        Optional[str]: The snapshot directory, or None if the model is not cached.
+    """
+    try:
+        return _lazy("snapshot_download")(
+            repo_id=model_name, revision=revision, local_files_only=True
+        )
+    except Exception:
+        return None
+
+
+_COMMIT_HASH = re.compile(r"[0-9a-f]{40}")
+_REVISIONS = {}
+_REVISIONS_LOCK = threading.Lock()
+
+
+def resolve_model_revision(model_name: str, revision: str = "main") -> Optional[str]:
+    """
+    Returns the commit hash a branch, tag or commit ID of a model points to.
+
+    Branches such as 'main' move when a model is updated upstream, so anything derived from a
+    model and kept across runs is keyed on the commit hash instead. As when loading the model, a
+    cached snapshot wins: its directory is named after the commit the revision pointed to when
+    it was downloaded. Models that are not cached are looked up on the hub. Either way the
+    revision is resolved once per process, like the pipeline loaded for it.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        Optional[str]: The commit hash, or None if the model is not cached and the hub cannot be
+        reached.
+    """
+    if _COMMIT_HASH.fullmatch(revision):
+        return revision
+    with _REVISIONS_LOCK:
+        if (model_name, revision) in _REVISIONS:
+            return _REVISIONS[(model_name, revision)]
+
+    local_path = get_local_snapshot(model_name, revision)
+    if local_path:
+        commit = os.path.basename(os.path.normpath(local_path))
+    else:
+        try:
+            commit = _lazy("HfApi")().model_info(model_name, revision=revision).sha
+        except Exception as e:
+            logger.warning(f"Could not resolve '{model_name}' ({revision}) to a commit: {e}")
+            commit = None
+    with _REVISIONS_LOCK:
+        _REVISIONS[(model_name, revision)] = commit
+    return commit
+
+
+def find_safetensors_files(model_path: str) -> List[str]:
+    """Returns the safetensors weight files of a model directory, sorted by name."""
+    if not os.path.isdir(model_path):
+        return []
+    return sorted(
+        os.path.join(model_path, name)
+        for name in os.listdir(model_path)
+        if name.endswith(".safetensors")
+    )
+
+
+def read_safetensors_header(path: str) -> dict:
+    """
+    Reads the JSON header of a safetensors file without reading any tensor data.
+
+    Args:
+        path (str): Path of the safetensors file.
+
+    Returns:
+        dict: The header, mapping tensor names to their dtype, shape and data offsets.
+
+    Raises:
+        EnvironmentError: If the header is malformed or the file is shorter than the header says.
+    """
+    try:
+        with open(path, "rb") as f:
+            (header_size,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_size))
+    except (OSError, struct.error, ValueError) as e:
+        raise EnvironmentError(f"Invalid safetensors header in '{path}': {e}")
+
+    data_size = max(
+        (
+            entry["data_offsets"][1]
+            for name, entry in header.items()
+            if name != "__metadata__"
+        ),
+        default=0,
+    )
+    if os.path.getsize(path) < 8 + header_size + data_size:
+        raise EnvironmentError(f"Safetensors file '{path}' is truncated.")
+    return header
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_file_hash(path: str) -> bool:
+    """
+    Checks a Hugging Face cache file against the sha256 its blob is named after.
+
+    Hub cache snapshots link each large file to `blobs/<sha256>`. The file is hashed once, and the
+    result is stamped with its size and modification time in llm_eval's cache directory, so later
+    checks only need a `stat`.
+
+    Args:
+        path (str): Path of the file inside a snapshot directory.
+
+    Returns:
+        bool: True if the file was verified, False if no expected hash is known (e.g. a copy
+        outside the hub cache).
+
+    Raises:
+        EnvironmentError: If the file's content does not match its expected hash.
+    """
+    real_path = os.path.realpath(path)
+    expected = os.path.basename(real_path)
+    if not re.fullmatch(r"[0-9a-f]{64}", expected):
+        return False
+
+    stat = os.stat(real_path)
+    stamp_path = os.path.join(get_cache_dir("verified"), f"{expected}.json")
+    stamp = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": expected}
+    if os.path.exists(stamp_path):
+        with open(stamp_path) as f:
+            if json.load(f) == stamp:
+                return True
+
+    if _sha256_file(real_path) != expected:
+        raise EnvironmentError(f"File '{path}' does not match its sha256 {expected}.")
+
+    temp_path = f"{stamp_path}.tmp-{os.getpid()}"
+    with open(temp_path, "w") as f:
+        json.dump(stamp, f)
+    os.replace(temp_path, stamp_path)
+    return True
+
+
+def verify_cached_model(model_path: str) -> bool:
+    """
+    Checks a model's safetensors weights from their headers and file hashes, without loading them.
+
+    Args:
+        model_path (str): The local model directory.
+
+    Returns:
+        bool: True if the model has safetensors weights and they were verified, False if it has
+        none, in which case it must be checked by loading it.
+
+    Raises:
+        EnvironmentError: If a weight file is malformed, truncated, or fails its hash check.
+    """
+    weight_files = find_safetensors_files(model_path)
+    for path in weight_files:
+        read_safetensors_header(path)
+        verify_file_hash(path)
+    return bool(weight_files)
+
+
 def preload_huggingface_model(
     model_name: str, local_dir: str = None, revision: str = "main"
 ):
     """
     Downloads and caches a Hugging Face model, tokenizer, and config.
-    Automatically uses `from_tf=True` if TensorFlow weights are detected.
+    Safetensors weights are checked from their headers and file hashes without instantiating the
+    model. Other weights are checked by loading the model, automatically using `from_tf=True` if
+    TensorFlow weights are detected.
 
     Args:
         model_name (str): Name or path of the model on Hugging Face Hub.
         local_dir (str): Optional path to store the snapshot (overrides default cache).
         revision (str): Branch, tag or commit ID to download (default is 'main').
 
+    Returns:
+        str: The local snapshot directory. A manifest of its files is written so later calls to
+        `cache_required_models` can skip the hub (see `is_snapshot_complete`).
+
     Raises:
         EnvironmentError: If model/tokenizer/config loading fails completely.
     """
 
     os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+    snapshot_download = _lazy("snapshot_download")
+    AutoConfig = _lazy("AutoConfig")
+    AutoModel = _lazy("AutoModel")
+    AutoTokenizer = _lazy("AutoTokenizer")
 
     try:
         model_path = snapshot_download(
@@ -81,29 +299,138 @@ def preload_huggingface_model(
                 f"Failed to load tokenizer for '{model_name}': {e} | Fallback failed: {fallback_e}"
             )
 
+    if verify_cached_model(model_path):
+        logger.debug(f"Verified safetensors weights for '{model_name}'")
+        write_model_manifest(model_name, model_path, revision, local_dir)
+        return model_path
+
     # Load Model: Auto-detect if TF weights exist, then try appropriate option
     def model_loader(from_tf=False):
         return AutoModel.from_pretrained(model_path, revision=revision, from_tf=from_tf)
 
     try_with_fallback(model_loader, "model")
+    write_model_manifest(model_name, model_path, revision, local_dir)
+    return model_path
+
+
+def get_manifest_path(model_name: str, revision: str = "main", local_dir: str = None) -> str:
+    """Returns the manifest file recording a verified snapshot of a model."""
+    key = hashlib.sha256(
+        json.dumps([model_name, revision, local_dir and os.path.abspath(local_dir)]).encode()
+    ).hexdigest()[:16]
+    return os.path.join(
+        get_cache_dir("manifests"), f"models--{model_name.replace('/', '--')}-{key}.json"
+    )
+
+
+def _file_entry(path: str) -> dict:
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    blob_name = os.path.basename(real_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": (
+            blob_name
+            if re.fullmatch(r"[0-9a-f]{64}", blob_name)
+            else _sha256_file(real_path)
+        ),
+    }
+
+
+def write_model_manifest(
+    model_name: str, model_path: str, revision: str = "main", local_dir: str = None
+):
+    """
+    Records the files of a verified model snapshot with their sizes and sha256 hashes.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        model_path (str): The verified local snapshot directory.
+        revision (str): The requested branch, tag or commit ID.
+        local_dir (str, optional): The `local_dir` the snapshot was downloaded to.
+    """
+    if not os.path.isdir(model_path):
+        return
+
+    files = {}
+    for root, dirs, names in os.walk(model_path, followlinks=True):
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
+        for name in names:
+            path = os.path.join(root, name)
+            files[os.path.relpath(path, model_path)] = _file_entry(path)
+
+    manifest = {
+        "model_name": model_name,
+        "revision": revision,
+        "path": os.path.abspath(model_path),
+        "files": files,
+    }
+    manifest_path = get_manifest_path(model_name, revision, local_dir)
+    temp_path = f"{manifest_path}.tmp-{os.getpid()}"
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, manifest_path)
+
+
+def is_snapshot_complete(
+    model_name: str, revision: str = "main", local_dir: str = None
+) -> Optional[str]:
+    """
+    Checks a previously verified snapshot against its manifest, without any network calls.
+
+    Every file in the manifest must still exist with the same size. Files whose modification
+    time changed are re-hashed and compared with the recorded sha256.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): The requested branch, tag or commit ID (default is 'main').
+        local_dir (str, optional): The `local_dir` the snapshot was downloaded to.
+
+    Returns:
+        Optional[str]: The snapshot directory if it is complete, otherwise None.
+    """
+    manifest_path = get_manifest_path(model_name, revision, local_dir)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        for relative_path, expected in manifest["files"].items():
+            real_path = os.path.realpath(os.path.join(manifest["path"], relative_path))
+            stat = os.stat(real_path)
+            if stat.st_size != expected["size"]:
+                return None
+            if (
+                stat.st_mtime_ns != expected["mtime_ns"]
+                and _sha256_file(real_path) != expected["sha256"]
+            ):
+                return None
+    except (OSError, ValueError, KeyError):
+        return None
+    return manifest["path"]
 
 
 def cache_required_models(
     use_standard_models: bool = True,
     custom_cache_dir: str = None,
     custom_model_config: dict = None,
+    max_workers: int = None,
 ):
     """
     Downloads and caches required Hugging Face models.
 
+    Models are prefetched concurrently on a thread pool. A model whose local snapshot still
+    matches the manifest written when it was last verified is skipped without contacting the hub.
+
     Args:
         use_standard_models (bool): If True, uses the default `_REQUIRED_MODELS`.
             If False, `custom_model_config` must be provided.
         custom_cache_dir (str, optional): Directory to store cached models. Defaults to Hugging Face's default cache location.
         custom_model_config (dict, optional): Custom mapping of task keys to model config dicts with 'name' and optional 'revision'.
+        max_workers (int, optional): Number of models to prefetch at once. Defaults to one per model.
 
     Raises:
         ValueError: If `use_standard_models` is False and `custom_model_config` is not provided.
+        EnvironmentError: If a model fails to download or load.
     """
     if not use_standard_models and not custom_model_config:
         raise ValueError(
@@ -112,20 +439,114 @@ def cache_required_models(
 
     MODELS = REQUIRED_MODELS if use_standard_models else custom_model_config
 
-    for area in MODELS.keys():
+    def prefetch(area: str):
+        model_name = MODELS[area]["name"]
+        revision = (
+            "main" if "revision" not in MODELS[area].keys() else MODELS[area]["revision"]
+        )
+        if is_snapshot_complete(model_name, revision, custom_cache_dir):
+            logger.debug(f"'{model_name}' ({revision}) is cached and complete")
+            return
         preload_huggingface_model(
-            model_name=MODELS[area]["name"],
+            model_name=model_name,
             local_dir=custom_cache_dir,
-            revision=(
-                "main"
-                if "revision" not in MODELS[area].keys()
-                else MODELS[area]["revision"]
-            ),
+            revision=revision,
         )
 
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(MODELS), 1)) as executor:
+        futures = [executor.submit(prefetch, area) for area in MODELS.keys()]
+        for future in futures:
+            future.result()
+
+
+class ClientProvider:
+    """
+    A process-wide cache of LLM and embedding clients sharing one keep-alive HTTP pool.
+
+    Clients are cached per configuration, so evaluators built with the same deployment reuse one
+    client, and every client sends its requests through the same sync and async connection pools
+    instead of opening and TLS-handshaking its own. Clients their users mutate, like the chat
+    clients ragas metrics wrap, are built per use and only share the pool.
+
+    Args:
+        http_pool (HTTPPool, optional): The shared connection pools. Defaults to an `HTTPPool`
+            configured from the `LLM_EVAL_HTTP_*` environment variables.
+
+    Example:
+        get_client_provider().configure(max_connections=200, timeout=30)
+        llm = get_ragas_wrapped_azure_openai_llm()
+    """
+
+    def __init__(self, http_pool: "HTTPPool" = None):
+        self._http_pool = http_pool
+        self._clients = {}
+        self._lock = threading.RLock()
+
+    @property
+    def http_pool(self) -> "HTTPPool":
+        with self._lock:
+            if self._http_pool is None:
+                from llm_eval.tools.http_pool import HTTPPool
+
+                self._http_pool = HTTPPool()
+            return self._http_pool
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Returns the client cached under `key`, building it with `factory` on first use."""
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    def configure(
+        self,
+        max_connections: int = None,
+        max_keepalive_connections: int = None,
+        timeout: float = None,
+    ):
+        """
+        Replaces the shared HTTP pool and drops the cached clients built on the previous one.
+
+        Clients handed out earlier keep working on the previous pool until they are discarded.
+
+        Args:
+            max_connections (int, optional): Maximum open connections per pool.
+            max_keepalive_connections (int, optional): Maximum idle connections kept open per pool.
+            timeout (float, optional): Request timeout in seconds.
+        """
+        from llm_eval.tools.http_pool import HTTPPool
+
+        self.clear()
+        with self._lock:
+            self._http_pool = HTTPPool(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                timeout=timeout,
+            )
+
+    def clear(self):
+        """
+        Drops the cached clients and the shared HTTP pool.
+
+        The pool is not closed, as clients handed out earlier (to evaluators, or ragas metrics)
+        still send requests through it. Its connections close once those clients are
+        garbage-collected.
+        """
+        with self._lock:
+            self._clients.clear()
+            self._http_pool = None
+
+
+_CLIENT_PROVIDER = ClientProvider()
+
+
+def get_client_provider() -> ClientProvider:
+    """Returns the process-wide client provider used by the Azure OpenAI client factories."""
+    return _CLIENT_PROVIDER
+
 
 def get_azure_ai_evaluation_model_config():
-    return AzureOpenAIModelConfiguration(
+    return _lazy("AzureOpenAIModelConfiguration")(
         azure_endpoint=os.getenv("AZURE_OPENAI_LLM_ENDPOINT"),
         api_key=os.getenv("AZURE_OPENAI_LLM_API_KEY"),
         azure_deployment=os.getenv("AZURE_OPENAI_LLM_MODEL"),
@@ -133,70 +554,136 @@ def get_azure_ai_evaluation_model_config():
     )
 
 
+def _azure_openai_llm_config(
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    azure_endpoint: Optional[str] = None,
+    api_version: Optional[str] = None,
+) -> dict:
+    return {
+        "model": model or os.getenv("AZURE_OPENAI_LLM_MODEL"),
+        "api_key": api_key or os.getenv("AZURE_OPENAI_LLM_API_KEY"),
+        "azure_endpoint": azure_endpoint or os.getenv("AZURE_OPENAI_LLM_ENDPOINT"),
+        "api_version": api_version or os.getenv("AZURE_OPENAI_LLM_API_VERSION"),
+    }
+
+
+def _azure_openai_embedding_config() -> dict:
+    return {
+        "model": os.getenv("AZURE_OPENAI_EMBEDDING_MODEL"),
+        "api_key": os.getenv("AZURE_OPENAI_EMBEDDING_MODEL_API_KEY"),
+        "azure_endpoint": os.getenv("AZURE_OPENAI_EMBEDDING_MODEL_ENDPONT"),
+        "api_version": os.getenv("AZURE_OPENAI_EMBEDDING_MODEL_API_VERSION"),
+    }
+
+
 def get_azure_openai_llm(
     model: Optional[str] = None,
     api_key: Optional[str] = None,
     azure_endpoint: Optional[str] = None,
     api_version: Optional[str] = None,
-) -> AzureChatOpenAI:
+    cache: bool = True,
+) -> "AzureChatOpenAI":
     """Returns an AzureChatOpenAI client with provided or environment-configured parameters.
 
+    Clients are cached per configuration by the process-wide `ClientProvider` and share its
+    keep-alive HTTP pool. When the completion cache is enabled (see
+    `llm_eval.tools.completion_cache`), the client answers repeated prompts from it.
+
     Args:
         model (Optional[str]): Azure OpenAI model deployment name.
         api_key (Optional[str]): Azure OpenAI API key.
         azure_endpoint (Optional[str]): Azure endpoint URL.
         api_version (Optional[str]): API version to use.
+        cache (bool, optional): Whether the client uses the completion cache when it is enabled.
+            Pass False to manage caching yourself. Defaults to True.
 
     Returns:
         AzureChatOpenAI: Configured Azure OpenAI chat client.
     """
+    config = _azure_openai_llm_config(model, api_key, azure_endpoint, api_version)
+    completion_cache = get_completion_cache() if cache else None
+
+    return get_client_provider().get(
+        ("llm", *config.values(), completion_cache),
+        lambda: _build_azure_openai_llm(config, completion_cache),
+    )
+
 
-    defaults = {
-        "model": os.getenv("AZURE_OPENAI_LLM_MODEL"),
-        "api_key": os.getenv("AZURE_OPENAI_LLM_API_KEY"),
-        "azure_endpoint": os.getenv("AZURE_OPENAI_LLM_ENDPOINT"),
-        "api_version": os.getenv("AZURE_OPENAI_LLM_API_VERSION"),
+def _http_pool_client_kwargs(http_pool: "HTTPPool") -> dict:
+    # The pool's transport already retries rate-limited requests through the deployment's
+    # `RateLimiter`, so retries in the openai SDK would multiply with its own.
+    return {
+        "http_client": http_pool.client,
+        "http_async_client": http_pool.async_client,
+        "max_retries": 0,
     }
 
-    return AzureChatOpenAI(
-        model=model or defaults["model"],
-        api_key=api_key or defaults["api_key"],
-        azure_endpoint=azure_endpoint or defaults["azure_endpoint"],
-        api_version=api_version or defaults["api_version"],
+
+def _build_azure_openai_llm(config: dict, completion_cache) -> "AzureChatOpenAI":
+    return _lazy("AzureChatOpenAI")(
+        **config,
+        **_http_pool_client_kwargs(get_client_provider().http_pool),
+        cache=completion_cache.langchain_cache if completion_cache is not None else None,
     )
 
 
-def get_ragas_wrapped_llm(model: BaseChatModel):
-    return LangchainLLMWrapper(model)
+def get_ragas_wrapped_llm(model: "BaseChatModel"):
+    return _lazy("LangchainLLMWrapper")(model)
 
 
 def get_ragas_wrapped_azure_openai_llm():
-    llm = get_azure_openai_llm()
-    return get_ragas_wrapped_llm(llm)
+    """Returns a ragas-wrapped Azure OpenAI chat client for one metric.
+
+    ragas sets `n` and `temperature` on the wrapped client before each request, so every call
+    builds a new client rather than sharing a cached one between concurrently running metrics.
+    The clients still send their requests through the `ClientProvider`'s shared HTTP pool.
+    """
+    config = _azure_openai_llm_config()
+    return get_ragas_wrapped_llm(_build_azure_openai_llm(config, get_completion_cache()))
 
 
 def get_azure_openai_embedding_model():
-    openai_embedding = AzureOpenAIEmbeddings(
-        model=os.getenv("AZURE_OPENAI_EMBEDDING_MODEL"),
-        api_key=os.getenv("AZURE_OPENAI_EMBEDDING_MODEL_API_KEY"),
-        azure_endpoint=os.getenv("AZURE_OPENAI_EMBEDDING_MODEL_ENDPONT"),
-        api_version=os.getenv("AZURE_OPENAI_EMBEDDING_MODEL_API_VERSION"),
+    config = _azure_openai_embedding_config()
+    provider = get_client_provider()
+
+    return provider.get(
+        ("embeddings", *config.values()),
+        lambda: _lazy("AzureOpenAIEmbeddings")(
+            **config, **_http_pool_client_kwargs(provider.http_pool)
+        ),
     )
 
-    return openai_embedding
 
+def get_ragas_wrapped_embedding_model(model: "AzureOpenAIEmbeddings"):
+    return _lazy("LangchainEmbeddingsWrapper")(model)
+
+
+def get_ragas_wrapped_azure_open_ai_embedding_model() -> "LangchainEmbeddingsWrapper":
+    """Returns the ragas-wrapped Azure OpenAI embedding model.
+
+    When the embedding cache is enabled (see `llm_eval.tools.embedding_cache`), the model is
+    wrapped in `CachedEmbeddings` so each distinct text is only embedded once across runs, and
+    in a `CachedEmbeddingsWrapper` so ragas still configures the Azure OpenAI model behind it.
+    """
+    from llm_eval.tools.embedding_cache import get_embedding_cache_dtype
+
+    config = _azure_openai_embedding_config()
+    dtype = get_embedding_cache_dtype()
 
-def get_ragas_wrapped_embedding_model(model: AzureOpenAIEmbeddings):
-    return LangchainEmbeddingsWrapper(model)
+    def build():
+        model = get_azure_openai_embedding_model()
+        if dtype is None:
+            return get_ragas_wrapped_embedding_model(model)
+        from llm_eval.tools.embedding_cache import CachedEmbeddings, CachedEmbeddingsWrapper
 
+        return CachedEmbeddingsWrapper(CachedEmbeddings(model, dtype=dtype))
 
-def get_ragas_wrapped_azure_open_ai_embedding_model() -> LangchainEmbeddingsWrapper:
-    model = get_azure_openai_embedding_model()
-    return get_ragas_wrapped_embedding_model(model)
+    return get_client_provider().get(("ragas_embeddings", *config.values(), dtype), build)
 
 
 def get_azure_openai_llm_inference(
-    prompt: str, model: Optional[AzureChatOpenAI] = None
+    prompt: str, model: Optional["AzureChatOpenAI"] = None
 ):
     """Invokes the Azure OpenAI model with a given prompt and returns the response content.
 
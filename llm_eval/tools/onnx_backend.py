@@ -0,0 +1,154 @@
+import logging
+import os
+import shutil
+import tempfile
+
+from llm_eval.tools.model_tools import resolve_model_revision
+
+logger = logging.getLogger(__name__)
+
+ONNX_INSTALL_HINT = (
+    "The ONNX backend requires optimum and onnxruntime. "
+    "Install them with `pip install audacia-llm-evaluation[onnx]`."
+)
+
+
+def get_onnx_model_dir(model_name: str, revision: str = "main") -> str:
+    """
+    Returns the directory holding the exported ONNX graph of a model.
+
+    Exports live next to the Hugging Face hub cache, in `<HF_HOME>/llm_eval_onnx`, mirroring
+    the hub's `models--<org>--<name>` layout with one folder per commit. The revision is resolved
+    to its commit first (see `resolve_model_revision`), so an updated model is exported again.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        str: The export directory (not necessarily existing yet).
+
+    Raises:
+        EnvironmentError: If the revision cannot be resolved to a commit.
+    """
+    from huggingface_hub.constants import HF_HUB_CACHE
+
+    commit = resolve_model_revision(model_name, revision)
+    if commit is None:
+        raise EnvironmentError(
+            f"Cannot resolve '{model_name}' ({revision}) to a commit to export to ONNX."
+        )
+    return os.path.join(
+        os.path.dirname(os.path.abspath(HF_HUB_CACHE)),
+        "llm_eval_onnx",
+        "models--" + model_name.replace("/", "--"),
+        commit,
+    )
+
+
+def export_onnx_model(model_name: str, revision: str = "main") -> str:
+    """
+    Exports a sequence-classification checkpoint to ONNX once and caches the graph on disk.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        str: The directory containing `model.onnx`, its config and tokenizer files.
+
+    Raises:
+        ImportError: If optimum/onnxruntime are not installed.
+        EnvironmentError: If the model cannot be exported.
+    """
+    export_dir = get_onnx_model_dir(model_name, revision)
+    if os.path.exists(os.path.join(export_dir, "model.onnx")):
+        return export_dir
+    # Export exactly the commit the directory is named after.
+    revision = os.path.basename(export_dir)
+
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise ImportError(ONNX_INSTALL_HINT) from e
+
+    logger.info(f"Exporting '{model_name}' ({revision}) to ONNX in {export_dir}")
+    try:
+        model = ORTModelForSequenceClassification.from_pretrained(
+            model_name, revision=revision, export=True
+        )
+        tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    except Exception as e:
+        raise EnvironmentError(f"Failed to export '{model_name}' to ONNX: {e}")
+
+    os.makedirs(os.path.dirname(export_dir), exist_ok=True)
+    # A directory of its own per export, so concurrent threads and processes never share one.
+    temp_dir = tempfile.mkdtemp(
+        prefix=f"{os.path.basename(export_dir)}.tmp-", dir=os.path.dirname(export_dir)
+    )
+    try:
+        model.save_pretrained(temp_dir)
+        tokenizer.save_pretrained(temp_dir)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    try:
+        os.replace(temp_dir, export_dir)
+    except OSError:
+        # Another export finished first; keep its copy.
+        logger.debug(f"ONNX export for '{model_name}' already present in {export_dir}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return export_dir
+
+
+def load_onnx_text_classification_pipeline(
+    model_name: str, revision: str = "main", intra_op_threads: int = None
+):
+    """
+    Builds a text-classification pipeline running the exported ONNX graph with ONNX Runtime.
+
+    The session uses the CPU execution provider with all graph optimizations enabled.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+        intra_op_threads (int, optional): Threads ONNX Runtime may use per operator. Defaults to
+            ONNX Runtime's own choice.
+
+    Returns:
+        transformers.Pipeline: A pipeline with the same inputs and outputs as the PyTorch one.
+
+    Raises:
+        ImportError: If optimum/onnxruntime are not installed.
+    """
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer, pipeline
+    except ImportError as e:
+        raise ImportError(ONNX_INSTALL_HINT) from e
+
+    export_dir = export_onnx_model(model_name, revision)
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = (
+        onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    if intra_op_threads:
+        session_options.intra_op_num_threads = intra_op_threads
+
+    model = ORTModelForSequenceClassification.from_pretrained(
+        export_dir,
+        provider="CPUExecutionProvider",
+        session_options=session_options,
+    )
+    tokenizer = AutoTokenizer.from_pretrained(export_dir)
+
+    return pipeline(
+        "text-classification",
+        model=model,
+        tokenizer=tokenizer,
+        return_all_scores=True,
+    )
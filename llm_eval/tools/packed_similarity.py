@@ -0,0 +1,306 @@
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from llm_eval.tools.completion_cache import get_completion_cache
+from llm_eval.tools.rate_limiter import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PACK_TOKEN_BUDGET = int(os.getenv("LLM_EVAL_SIMILARITY_PACK_TOKENS", "4000"))
+DEFAULT_MAX_PACK_SIZE = 20
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Completion tokens reserved per item for its `{"id": n, "stars": k}` entry in the answer.
+COMPLETION_TOKENS_PER_ITEM = 12
+
+# The instructions and examples of azure.ai.evaluation's `similarity.prompty`, sent once per pack.
+SYSTEM_PROMPT = (
+    "You are an AI assistant. You will be given the definition of an evaluation metric for "
+    "assessing the quality of answers in a question-answering task, and several numbered items "
+    "to rate. Your job is to compute an accurate evaluation score for every item using the "
+    "provided evaluation metric. You should return only a JSON array with one object per item, "
+    'in the form [{"id": 1, "stars": 4}], where stars is an integer between 1 and 5. You will '
+    "include no other text or information."
+)
+
+INSTRUCTIONS = """Equivalence, as a metric, measures the similarity between the predicted answer and the correct answer. If the information and content in the predicted answer is similar or equivalent to the correct answer, then the value of the Equivalence metric should be high, else it should be low. Given the question, correct answer, and predicted answer, determine the value of Equivalence metric using the following rating scale:
+One star: the predicted answer is not at all similar to the correct answer
+Two stars: the predicted answer is mostly not similar to the correct answer
+Three stars: the predicted answer is somewhat similar to the correct answer
+Four stars: the predicted answer is mostly similar to the correct answer
+Five stars: the predicted answer is completely similar to the correct answer
+
+This rating value should always be an integer between 1 and 5. So the rating produced should be 1 or 2 or 3 or 4 or 5.
+
+The examples below show the Equivalence score for a question, a correct answer, and a predicted answer.
+
+question: What is the role of ribosomes?
+correct answer: Ribosomes are cellular structures responsible for protein synthesis. They interpret the genetic information carried by messenger RNA (mRNA) and use it to assemble amino acids into proteins.
+predicted answer: Ribosomes participate in carbohydrate breakdown by removing nutrients from complex sugar molecules.
+stars: 1
+
+question: Why did the Titanic sink?
+correct answer: The Titanic sank after it struck an iceberg during its maiden voyage in 1912. The impact caused the ship's hull to breach, allowing water to flood into the vessel. The ship's design, lifeboat shortage, and lack of timely rescue efforts contributed to the tragic loss of life.
+predicted answer: The sinking of the Titanic was a result of a large iceberg collision. This caused the ship to take on water and eventually sink, leading to the death of many passengers due to a shortage of lifeboats and insufficient rescue attempts.
+stars: 2
+
+question: What causes seasons on Earth?
+correct answer: Seasons on Earth are caused by the tilt of the Earth's axis and its revolution around the Sun. As the Earth orbits the Sun, the tilt causes different parts of the planet to receive varying amounts of sunlight, resulting in changes in temperature and weather patterns.
+predicted answer: Seasons occur because of the Earth's rotation and its elliptical orbit around the Sun. The tilt of the Earth's axis causes regions to be subjected to different sunlight intensities, which leads to temperature fluctuations and alternating weather conditions.
+stars: 3
+
+question: How does photosynthesis work?
+correct answer: Photosynthesis is a process by which green plants and some other organisms convert light energy into chemical energy. This occurs as light is absorbed by chlorophyll molecules, and then carbon dioxide and water are converted into glucose and oxygen through a series of reactions.
+predicted answer: In photosynthesis, sunlight is transformed into nutrients by plants and certain microorganisms. Light is captured by chlorophyll molecules, followed by the conversion of carbon dioxide and water into sugar and oxygen through multiple reactions.
+stars: 4
+
+question: What are the health benefits of regular exercise?
+correct answer: Regular exercise can help maintain a healthy weight, increase muscle and bone strength, and reduce the risk of chronic diseases. It also promotes mental well-being by reducing stress and improving overall mood.
+predicted answer: Routine physical activity can contribute to maintaining ideal body weight, enhancing muscle and bone strength, and preventing chronic illnesses. In addition, it supports mental health by alleviating stress and augmenting general mood.
+stars: 5
+
+Rate each of the following items. Answer with a JSON array holding one {"id": <item id>, "stars": <rating>} object per item."""
+
+_JSON_ARRAY = re.compile(r"\[.*\]", re.DOTALL)
+
+Triple = Tuple[str, str, str]
+
+
+def render_item(item_id: int, triple: Triple) -> str:
+    """Renders one (query, response, ground_truth) triple as a numbered item of a packed prompt."""
+    query, response, ground_truth = triple
+    return (
+        f"item {item_id}\n"
+        f"question: {query}\n"
+        f"correct answer: {ground_truth}\n"
+        f"predicted answer: {response}"
+    )
+
+
+def render_messages(triples: Sequence[Triple]) -> List[dict]:
+    """Builds the chat messages judging `triples` in one request, numbered from 1."""
+    items = "\n\n".join(render_item(item_id, triple) for item_id, triple in enumerate(triples, 1))
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"{INSTRUCTIONS}\n\n{items}"},
+    ]
+
+
+def _estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def pack_triples(
+    triples: Sequence[Triple],
+    token_budget: int = None,
+    max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+) -> List[List[int]]:
+    """
+    Groups triples into packs whose prompt and answer fit a token budget.
+
+    Packs are filled greedily in input order. Tokens are estimated like the rate limiter does,
+    about four characters per token, and each item reserves `COMPLETION_TOKENS_PER_ITEM` for its
+    rating. A triple too large for the budget on its own is sent in a pack of one.
+
+    Args:
+        triples (Sequence[Triple]): The (query, response, ground_truth) triples.
+        token_budget (int, optional): Estimated tokens allowed per request. Defaults to the
+            `LLM_EVAL_SIMILARITY_PACK_TOKENS` environment variable, or 4000.
+        max_pack_size (int, optional): Most triples per pack. Defaults to 20.
+
+    Returns:
+        List[List[int]]: The indices of the triples in each pack.
+    """
+    token_budget = token_budget or DEFAULT_PACK_TOKEN_BUDGET
+    if max_pack_size < 1:
+        raise ValueError(f"max_pack_size must be at least 1. Got {max_pack_size}.")
+    header_tokens = _estimate_tokens(SYSTEM_PROMPT + INSTRUCTIONS)
+
+    packs, pack, used = [], [], header_tokens
+    for index, triple in enumerate(triples):
+        tokens = _estimate_tokens(render_item(len(pack) + 1, triple)) + COMPLETION_TOKENS_PER_ITEM
+        if pack and (used + tokens > token_budget or len(pack) >= max_pack_size):
+            packs.append(pack)
+            pack, used = [], header_tokens
+        pack.append(index)
+        used += tokens
+    if pack:
+        packs.append(pack)
+    return packs
+
+
+def parse_ratings(text: str, item_count: int) -> Dict[int, int]:
+    """
+    Reads the ratings out of a packed judge's answer.
+
+    Only well-formed entries are returned: objects with an `id` between 1 and `item_count` and
+    integer `stars` between 1 and 5. Items that are missing, duplicated or malformed are left
+    out, so the caller can retry just those.
+
+    Args:
+        text (str): The model's answer, a JSON array possibly wrapped in other text.
+        item_count (int): The number of items in the pack.
+
+    Returns:
+        Dict[int, int]: The stars of each validly rated item id.
+    """
+    match = _JSON_ARRAY.search(text or "")
+    try:
+        entries = json.loads(match.group(0)) if match else []
+    except ValueError:
+        return {}
+    if not isinstance(entries, list):
+        return {}
+
+    ratings, seen = {}, set()
+    for entry in entries:
+        if not isinstance(entry, Mapping):
+            continue
+        item_id, stars = entry.get("id"), entry.get("stars")
+        if isinstance(stars, str) and stars.strip().isdigit():
+            stars = int(stars)
+        if (
+            type(item_id) is not int
+            or type(stars) is not int
+            or not 1 <= item_id <= item_count
+            or not 1 <= stars <= 5
+        ):
+            continue
+        if item_id in seen:
+            # Conflicting answers for one item are not trusted.
+            ratings.pop(item_id, None)
+            continue
+        seen.add(item_id)
+        ratings[item_id] = stars
+    return ratings
+
+
+class PackedSimilarityJudge:
+    """
+    Rates many (query, response, ground_truth) triples with one LLM request per pack.
+
+    Each request carries the similarity prompt's instructions and examples once, followed by a
+    numbered list of triples, and asks for a JSON array of 1 to 5 star ratings. Items that come
+    back missing or malformed, or whose request failed, are packed again and retried on their
+    own, up to `max_attempts` times.
+
+    Requests go through `get_azure_openai_llm`, so they share the keep-alive HTTP pool and the
+    deployment's rate limiter. When the completion cache is enabled, only answers rating every
+    item of their pack are stored, and retries always reach the model. `requests` counts the
+    requests sent to the model and `cached` the packs answered from the cache.
+
+    Args:
+        model_config (Mapping): An Azure OpenAI model configuration, as for `SimilarityEvaluator`.
+        token_budget (int, optional): Estimated tokens per request, see `pack_triples`.
+        max_pack_size (int, optional): Most triples per request. Defaults to 20.
+        max_attempts (int, optional): Times an item is sent before it is given up. Defaults to 3.
+
+    Example:
+        judge = PackedSimilarityJudge(model_config)
+        stars = await judge.arate(triples)
+    """
+
+    def __init__(
+        self,
+        model_config: Mapping,
+        token_budget: int = None,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1. Got {max_attempts}.")
+        self.model_config = dict(model_config)
+        self.token_budget = token_budget or DEFAULT_PACK_TOKEN_BUDGET
+        self.max_pack_size = max_pack_size
+        self.max_attempts = max_attempts
+        self.requests = 0
+        self.cached = 0
+        self.retried = 0
+
+    def _llm(self):
+        from llm_eval.tools.model_tools import get_azure_openai_llm
+
+        return get_azure_openai_llm(
+            model=self.model_config.get("azure_deployment"),
+            api_key=self.model_config.get("api_key"),
+            azure_endpoint=self.model_config.get("azure_endpoint"),
+            api_version=self.model_config.get("api_version"),
+            cache=False,
+        )
+
+    async def _rate_pack(self, triples: Sequence[Triple], retry: bool = False) -> Dict[int, int]:
+        messages = render_messages(triples)
+        max_tokens = COMPLETION_TOKENS_PER_ITEM * len(triples) + 8
+        completion_cache = get_completion_cache()
+        if completion_cache is not None:
+            completion_key = (
+                json.dumps(messages, ensure_ascii=False),
+                json.dumps(
+                    {
+                        "packed_similarity": self.model_config.get("azure_deployment"),
+                        "temperature": 0.0,
+                        "max_tokens": max_tokens,
+                    },
+                    sort_keys=True,
+                ),
+            )
+            # A retried pack is rendered exactly as before, so a cached answer would not help it.
+            cached = None if retry else completion_cache.lookup(*completion_key)
+            if cached is not None:
+                self.cached += 1
+                return parse_ratings(cached, len(triples))
+
+        self.requests += 1
+        answer = await self._llm().ainvoke(messages, temperature=0.0, max_tokens=max_tokens)
+        ratings = parse_ratings(answer.content, len(triples))
+        if completion_cache is not None and len(ratings) == len(triples):
+            completion_cache.update(*completion_key, answer.content)
+        return ratings
+
+    async def arate(
+        self, triples: Sequence[Triple], max_concurrency: int = 16
+    ) -> List[Optional[int]]:
+        """
+        Rates every triple, sending up to `max_concurrency` packs at once.
+
+        Args:
+            triples (Sequence[Triple]): The (query, response, ground_truth) triples.
+            max_concurrency (int, optional): Maximum requests in flight. Defaults to 16.
+
+        Returns:
+            List[Optional[int]]: The stars of each triple, or None where no valid rating came
+            back within `max_attempts`.
+        """
+        triples = [tuple(triple) for triple in triples]
+        stars: List[Optional[int]] = [None] * len(triples)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(pack: List[int], retry: bool):
+            async with semaphore:
+                try:
+                    ratings = await self._rate_pack([triples[index] for index in pack], retry)
+                except Exception as e:
+                    logger.warning(f"Packed similarity request for {len(pack)} items failed: {e}")
+                    return
+            for item_id, rating in ratings.items():
+                stars[pack[item_id - 1]] = rating
+
+        pending = list(range(len(triples)))
+        for attempt in range(self.max_attempts):
+            if not pending:
+                break
+            if attempt:
+                self.retried += len(pending)
+                logger.debug(f"Retrying {len(pending)} unrated items (attempt {attempt + 1})")
+            packs = pack_triples(
+                [triples[index] for index in pending], self.token_budget, self.max_pack_size
+            )
+            await asyncio.gather(
+                *(run([pending[i] for i in pack], attempt > 0) for pack in packs)
+            )
+            pending = [index for index in pending if stars[index] is None]
+        return stars
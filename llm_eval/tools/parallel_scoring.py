@@ -0,0 +1,127 @@
+import logging
+import math
+import multiprocessing
+import os
+from typing import List, Sequence, Tuple
+
+from llm_eval.tools.score_cache import disable_score_cache, enable_score_cache, get_score_cache
+
+logger = logging.getLogger(__name__)
+
+_WORKER_EVALUATOR = None
+_WORKER_BATCH_SIZE = 32
+
+
+def get_start_method() -> str:
+    """
+    Returns the multiprocessing start method used for scoring workers.
+
+    "fork" is preferred: workers inherit the models already loaded in the parent and share their
+    weights copy-on-write. Where fork is unavailable, "spawn" workers load the model themselves,
+    with safetensors checkpoints memory-mapped from the Hugging Face cache.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return "fork" if "fork" in methods else "spawn"
+
+
+def _init_worker(evaluator, batch_size: int, intra_op_threads: int, cache_config):
+    global _WORKER_EVALUATOR, _WORKER_BATCH_SIZE
+    _WORKER_EVALUATOR = evaluator
+    _WORKER_BATCH_SIZE = batch_size
+
+    try:
+        import torch
+
+        torch.set_num_threads(intra_op_threads)
+    except ImportError:
+        pass
+
+    # SQLite connections must not cross a fork, so each worker opens its own.
+    if cache_config is None:
+        disable_score_cache()
+    else:
+        enable_score_cache(*cache_config)
+
+
+def _score_shard(shard: Tuple[int, List[str]]) -> Tuple[int, List[dict]]:
+    start, responses = shard
+    return start, _WORKER_EVALUATOR.evaluate_batch(responses, batch_size=_WORKER_BATCH_SIZE)
+
+
+def shard_responses(
+    responses: Sequence[str], num_workers: int, batch_size: int
+) -> List[Tuple[int, List[str]]]:
+    """
+    Splits responses into contiguous shards tagged with their start index.
+
+    Each worker gets about four shards so a slow shard does not hold up the whole run, and every
+    shard holds at least one full batch.
+    """
+    size = max(batch_size, math.ceil(len(responses) / (num_workers * 4)))
+    return [
+        (start, list(responses[start : start + size]))
+        for start in range(0, len(responses), size)
+    ]
+
+
+def score_in_processes(
+    evaluator,
+    responses: Sequence[str],
+    num_workers: int = None,
+    intra_op_threads: int = 1,
+    batch_size: int = 32,
+) -> List[dict]:
+    """
+    Scores responses with a transformer evaluator sharded across a pool of worker processes.
+
+    The model is loaded in the parent before the pool starts. Forked workers then share its
+    weights copy-on-write instead of each holding a copy. Results are returned in input order.
+
+    Args:
+        evaluator (TransformerEvaluator): The evaluator to score with.
+        responses (Sequence[str]): The textual responses to evaluate.
+        num_workers (int, optional): Number of worker processes. Defaults to the CPU count divided
+            by `intra_op_threads`.
+        intra_op_threads (int, optional): Threads each worker's PyTorch model may use. Defaults to 1.
+        batch_size (int, optional): Number of responses per forward pass. Defaults to 32.
+
+    Returns:
+        List[dict]: One result dictionary per response, as returned by `evaluate_batch`.
+    """
+    if intra_op_threads < 1:
+        raise ValueError(f"intra_op_threads must be at least 1. Got {intra_op_threads}.")
+    if num_workers is None:
+        num_workers = max(1, (os.cpu_count() or 1) // intra_op_threads)
+
+    responses = list(responses)
+    shards = shard_responses(responses, num_workers, batch_size)
+    if num_workers <= 1 or len(shards) <= 1:
+        return evaluator.evaluate_batch(responses, batch_size=batch_size)
+
+    start_method = get_start_method()
+    if start_method == "fork":
+        # Load the weights once here so every forked worker shares them.
+        _ = evaluator.classifier
+
+    cache = get_score_cache()
+    cache_config = (
+        (os.path.dirname(cache.store.path), cache.store.max_size_bytes / (1024 * 1024))
+        if cache is not None
+        else None
+    )
+
+    num_workers = min(num_workers, len(shards))
+    logger.info(
+        f"Scoring {len(responses)} responses in {len(shards)} shards "
+        f"on {num_workers} {start_method} workers"
+    )
+    context = multiprocessing.get_context(start_method)
+    with context.Pool(
+        num_workers,
+        initializer=_init_worker,
+        initargs=(evaluator, batch_size, intra_op_threads, cache_config),
+    ) as pool:
+        scores = [None] * len(responses)
+        for start, shard_scores in pool.imap_unordered(_score_shard, shards):
+            scores[start : start + len(shard_scores)] = shard_scores
+    return scores
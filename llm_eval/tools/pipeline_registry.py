@@ -0,0 +1,217 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from llm_eval.tools.quantization import (
+    QUANTIZED_DTYPE,
+    load_quantized_text_classification_pipeline,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MEMORY_MB = float(os.getenv("LLM_EVAL_PIPELINE_CACHE_MB", "4096"))
+
+BACKENDS = ("pytorch", "onnx")
+
+PipelineKey = Tuple[str, str, str, str, str]
+
+
+def load_text_classification_pipeline(
+    model_name: str,
+    revision: str = "main",
+    device: str = "cpu",
+    dtype: str = None,
+    backend: str = "pytorch",
+):
+    """
+    Builds a Hugging Face text-classification pipeline returning the scores for every label.
+
+    Args:
+        model_name (str): Name or path of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+        device (str): Device to run inference on (default is 'cpu').
+        dtype (str, optional): Torch dtype name such as 'float16', or 'qint8' for dynamic int8
+            quantization of the linear layers. Defaults to the model's own dtype.
+        backend (str): Inference backend, either 'pytorch' or 'onnx' (default is 'pytorch').
+
+    Returns:
+        transformers.Pipeline: The loaded text-classification pipeline.
+    """
+    if backend == "onnx":
+        from llm_eval.tools.onnx_backend import load_onnx_text_classification_pipeline
+
+        return load_onnx_text_classification_pipeline(model_name, revision=revision)
+
+    if dtype == QUANTIZED_DTYPE:
+        return load_quantized_text_classification_pipeline(model_name, revision=revision)
+
+    from transformers import pipeline
+
+    from llm_eval.tools.model_tools import find_safetensors_files, get_local_snapshot
+
+    # Load cached models from their snapshot directory so no hub requests are made, and ask for
+    # safetensors weights when present so they are memory-mapped rather than unpickled.
+    local_path = get_local_snapshot(model_name, revision)
+    model_kwargs = {}
+    if local_path and find_safetensors_files(local_path):
+        model_kwargs["use_safetensors"] = True
+
+    return pipeline(
+        "text-classification",
+        model=local_path or model_name,
+        revision=None if local_path else revision,
+        return_all_scores=True,
+        device=device,
+        torch_dtype=dtype,
+        model_kwargs=model_kwargs,
+    )
+
+
+def estimate_pipeline_memory(classifier: Any) -> int:
+    """
+    Estimates the resident size in bytes of a pipeline's model weights and buffers.
+
+    Args:
+        classifier (Any): A loaded pipeline.
+
+    Returns:
+        int: Approximate number of bytes held by the model, or 0 if it cannot be determined.
+    """
+    model = getattr(classifier, "model", None)
+    model_path = getattr(model, "model_path", None)
+    if model_path is not None and os.path.exists(model_path):
+        return os.path.getsize(model_path)
+    if model is None or not hasattr(model, "state_dict"):
+        return 0
+
+    def tensor_bytes(value) -> int:
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(item) for item in value)
+        if hasattr(value, "element_size"):
+            return value.numel() * value.element_size()
+        return 0
+
+    # The state dict also covers the packed weights of quantized layers, which are not parameters.
+    return sum(tensor_bytes(value) for value in model.state_dict().values())
+
+
+class PipelineRegistry:
+    """
+    A thread-safe, process-wide cache of loaded Hugging Face pipelines.
+
+    Pipelines are keyed by (model name, revision, device, dtype, backend) so every evaluator
+    using the same model shares one set of weights. Entries are evicted in least-recently-used
+    order once the estimated memory of the cached models exceeds `max_memory_mb`; the most
+    recently loaded pipeline is always kept even if it alone exceeds the cap.
+
+    Args:
+        max_memory_mb (float, optional): Memory cap for cached models in megabytes. Defaults to
+            the `LLM_EVAL_PIPELINE_CACHE_MB` environment variable, or 4096.
+        loader (Callable, optional): Function building a pipeline from
+            (model_name, revision, device, dtype, backend). Defaults to
+            `load_text_classification_pipeline`.
+        memory_estimator (Callable, optional): Function returning the size in bytes of a loaded
+            pipeline. Defaults to `estimate_pipeline_memory`.
+
+    Example:
+        registry = get_pipeline_registry()
+        classifier = registry.get("s-nlp/roberta_toxicity_classifier")
+    """
+
+    def __init__(
+        self,
+        max_memory_mb: float = None,
+        loader: Callable = None,
+        memory_estimator: Callable = None,
+    ):
+        self.max_memory_bytes = int(
+            (max_memory_mb if max_memory_mb is not None else DEFAULT_MAX_MEMORY_MB)
+            * 1024
+            * 1024
+        )
+        self.loader = loader or load_text_classification_pipeline
+        self.memory_estimator = memory_estimator or estimate_pipeline_memory
+        self._entries: "OrderedDict[PipelineKey, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict = {}
+
+    def get(
+        self,
+        model_name: str,
+        *,
+        revision: str = "main",
+        device: str = "cpu",
+        dtype: Optional[str] = None,
+        backend: str = "pytorch",
+    ):
+        """
+        Returns the cached pipeline for the given configuration, loading it on first use.
+
+        Concurrent requests for the same key wait for a single load; different models can
+        load in parallel.
+
+        Args:
+            model_name (str): Name or path of the model on Hugging Face Hub.
+            revision (str): Branch, tag or commit ID of the model (default is 'main').
+            device (str): Device to run inference on (default is 'cpu').
+            dtype (str, optional): Torch dtype name. Defaults to the model's own dtype.
+            backend (str): Inference backend, either 'pytorch' or 'onnx' (default is 'pytorch').
+
+        Returns:
+            transformers.Pipeline: The shared pipeline instance.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend must be one of {BACKENDS}. Got {backend}.")
+        key = (model_name, revision, str(device), str(dtype), backend)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key][0]
+
+            logger.debug(f"Loading pipeline for {key}")
+            classifier = self.loader(model_name, revision, device, dtype, backend)
+            size = self.memory_estimator(classifier)
+
+            with self._lock:
+                self._entries[key] = (classifier, size)
+                self._key_locks.pop(key, None)
+                self._evict()
+
+        return classifier
+
+    def _evict(self):
+        while len(self._entries) > 1 and self.memory_bytes > self.max_memory_bytes:
+            key, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted pipeline {key} from registry")
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(size for _, size in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: PipelineKey) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_REGISTRY = PipelineRegistry()
+
+
+def get_pipeline_registry() -> PipelineRegistry:
+    """Returns the process-wide pipeline registry shared by all transformer evaluators."""
+    return _REGISTRY
@@ -0,0 +1,150 @@
+import logging
+import os
+from statistics import mean
+from typing import List
+
+from llm_eval.tools.model_tools import resolve_model_revision
+from llm_eval.tools.utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_DTYPE = "qint8"
+
+
+def get_quantized_model_path(model_name: str, revision: str = "main") -> str:
+    """
+    Returns the file caching the dynamic int8 weights of a model.
+
+    The weights are cached in one folder per commit: the revision is resolved to its commit first
+    (see `resolve_model_revision`), so an updated model is quantized again. The torch version is
+    part of the file name, as the packed int8 weight format is tied to it.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        str: Path of the cached quantized state dict.
+
+    Raises:
+        EnvironmentError: If the revision cannot be resolved to a commit.
+    """
+    commit = resolve_model_revision(model_name, revision)
+    if commit is None:
+        raise EnvironmentError(
+            f"Cannot resolve '{model_name}' ({revision}) to a commit to quantize it."
+        )
+
+    import torch
+
+    directory = get_cache_dir("quantized", "models--" + model_name.replace("/", "--"), commit)
+    return os.path.join(directory, f"model_{QUANTIZED_DTYPE}_torch{torch.__version__}.pt")
+
+
+def load_quantized_model(model_name: str, revision: str = "main"):
+    """
+    Loads a sequence-classification model with dynamic int8 quantization of its linear layers.
+
+    The first load quantizes the fp32 checkpoint and caches the int8 weights on disk. Later loads
+    build the quantized architecture from the model config and read the cached weights, skipping
+    both the fp32 weights and re-quantization.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        torch.nn.Module: The quantized model in eval mode.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+    from transformers.modeling_utils import no_init_weights
+
+    path = get_quantized_model_path(model_name, revision)
+    # Load exactly the commit the cached weights are named after.
+    revision = os.path.basename(os.path.dirname(path))
+
+    if os.path.exists(path):
+        config = AutoConfig.from_pretrained(model_name, revision=revision)
+        with no_init_weights():
+            model = AutoModelForSequenceClassification.from_config(config)
+        model = torch.quantization.quantize_dynamic(
+            model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        model.load_state_dict(torch.load(path, weights_only=True))
+        return model.eval()
+
+    logger.info(f"Quantizing '{model_name}' ({revision}) to {QUANTIZED_DTYPE}")
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_name, revision=revision
+    )
+    model = torch.quantization.quantize_dynamic(
+        model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    torch.save(model.state_dict(), temp_path)
+    os.replace(temp_path, path)
+    return model
+
+
+def load_quantized_text_classification_pipeline(model_name: str, revision: str = "main"):
+    """
+    Builds a CPU text-classification pipeline around the dynamic int8 quantized model.
+
+    Args:
+        model_name (str): Name of the model on Hugging Face Hub.
+        revision (str): Branch, tag or commit ID of the model (default is 'main').
+
+    Returns:
+        transformers.Pipeline: The quantized text-classification pipeline.
+    """
+    from transformers import AutoTokenizer, pipeline
+
+    revision = resolve_model_revision(model_name, revision) or revision
+    return pipeline(
+        "text-classification",
+        model=load_quantized_model(model_name, revision),
+        tokenizer=AutoTokenizer.from_pretrained(model_name, revision=revision),
+        return_all_scores=True,
+        device="cpu",
+    )
+
+
+def report_quantization_drift(evaluator_class: type, responses: List[str]) -> dict:
+    """
+    Compares the scores of the int8 quantized model against the fp32 baseline.
+
+    Args:
+        evaluator_class (type): A `TransformerEvaluator` subclass, e.g. `ToxicityEvaluator`.
+        responses (List[str]): The responses to score with both models.
+
+    Returns:
+        dict: Per-response fp32 and int8 scores with their absolute drift, plus the mean and
+        maximum drift across all responses.
+    """
+    baseline = evaluator_class()
+    quantized = evaluator_class(quantize=True)
+    score_key = baseline.evaluator
+
+    baseline_scores = baseline.evaluate_batch(responses)
+    quantized_scores = quantized.evaluate_batch(responses)
+
+    scores = [
+        {
+            "response": response,
+            "fp32": fp32[score_key],
+            QUANTIZED_DTYPE: int8[score_key],
+            "drift": abs(fp32[score_key] - int8[score_key]),
+        }
+        for response, fp32, int8 in zip(responses, baseline_scores, quantized_scores)
+    ]
+    drifts = [score["drift"] for score in scores] or [0.0]
+
+    return {
+        "evaluator": score_key,
+        "model": baseline.model_name,
+        "mean_abs_drift": mean(drifts),
+        "max_abs_drift": max(drifts),
+        "scores": scores,
+    }
@@ -0,0 +1,432 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Mapping, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_MINUTE = os.getenv("LLM_EVAL_REQUESTS_PER_MINUTE")
+DEFAULT_TOKENS_PER_MINUTE = os.getenv("LLM_EVAL_TOKENS_PER_MINUTE")
+DEFAULT_MAX_RETRIES = int(os.getenv("LLM_EVAL_RATE_LIMIT_MAX_RETRIES", "6"))
+
+RETRY_STATUS_CODES = (429,)
+CHARS_PER_TOKEN = 4
+# Completion budget assumed for chat requests that do not set `max_tokens`.
+DEFAULT_COMPLETION_TOKENS = 256
+
+_DEPLOYMENT_PATTERN = re.compile(r"/deployments/([^/]+)/")
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    Callers reserve capacity up front and are told how long to wait before using it, so
+    concurrent callers queue behind one another instead of racing for the same tokens. A request
+    larger than the bucket waits for a full bucket and leaves it in debt.
+
+    Args:
+        rate_per_minute (float): Tokens added per minute.
+        capacity (float, optional): Largest burst allowed. Defaults to one second's worth of the
+            rate, as Azure OpenAI enforces per-minute quotas over windows as short as a second.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be positive. Got {rate_per_minute}.")
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or max(1.0, rate_per_minute / 60)
+        self.rate_factor = 1.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate_per_second(self) -> float:
+        return self.rate_per_minute * self.rate_factor / 60
+
+    def _refill(self, now: float):
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate_per_second
+        )
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Takes `amount` tokens and returns the seconds to wait before they may be used."""
+        with self._lock:
+            self._refill(time.monotonic())
+            needed = min(amount, self.capacity)
+            wait = max(0.0, (needed - self._level) / self.rate_per_second)
+            self._level -= amount
+            return wait
+
+    def limit_level(self, remaining: float):
+        """Lowers the bucket to the remaining quota reported by the server."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self._level, remaining)
+
+    @property
+    def level(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._level
+
+
+def estimate_request_tokens(body: Any) -> int:
+    """
+    Estimates the tokens an OpenAI chat or embedding request counts against the quota.
+
+    Like Azure OpenAI's own estimate, this counts about four characters per prompt token plus
+    the requested completion budget (`max_tokens`).
+
+    Args:
+        body (Any): The JSON request body, as bytes, a string or a parsed dictionary.
+
+    Returns:
+        int: The estimated number of tokens, or 0 if the body is not a recognised request.
+    """
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body or "null")
+        except ValueError:
+            return 0
+    if not isinstance(body, Mapping):
+        return 0
+
+    def text_length(value) -> int:
+        if isinstance(value, str):
+            return len(value)
+        if isinstance(value, Mapping):
+            return sum(text_length(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(text_length(item) for item in value)
+        return 0
+
+    if "messages" in body:
+        prompt = text_length(body["messages"])
+        completion = (
+            body.get("max_tokens")
+            or body.get("max_completion_tokens")
+            or DEFAULT_COMPLETION_TOKENS
+        ) * body.get("n", 1)
+    else:
+        prompt = text_length(body.get("input") or body.get("prompt"))
+        completion = 0
+    return -(-prompt // CHARS_PER_TOKEN) + completion
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Returns the delay in seconds requested by `retry-after-ms` or `retry-after`, if any."""
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def _rate_limit_error(error: BaseException) -> Optional[BaseException]:
+    # Wrapping libraries (e.g. promptflow) re-raise the openai error, so follow the cause chain.
+    while error is not None:
+        if getattr(error, "status_code", None) in RETRY_STATUS_CODES:
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class RateLimiter:
+    """
+    Schedules requests against requests-per-minute and tokens-per-minute budgets.
+
+    Each request reserves one request and its estimated tokens before it is sent. Responses feed
+    back into the budgets: the `x-ratelimit-remaining-*` headers lower the buckets to what the
+    server reports, and a 429 pauses every caller for the server's `retry-after` (or an
+    exponential backoff) with random jitter and halves the request rate. Each successful
+    response restores a little of the rate until it is back at the configured budget.
+
+    Args:
+        requests_per_minute (float, optional): Request budget. Defaults to the
+            `LLM_EVAL_REQUESTS_PER_MINUTE` environment variable, or no limit.
+        tokens_per_minute (float, optional): Token budget. Defaults to the
+            `LLM_EVAL_TOKENS_PER_MINUTE` environment variable, or no limit.
+        max_retries (int, optional): Times a rate-limited request is retried. Defaults to the
+            `LLM_EVAL_RATE_LIMIT_MAX_RETRIES` environment variable, or 6.
+        base_delay (float, optional): First backoff delay in seconds when the server does not
+            send `retry-after`. Defaults to 1.
+        max_delay (float, optional): Longest backoff delay in seconds. Defaults to 60.
+
+    Example:
+        limiter = RateLimiter(requests_per_minute=300, tokens_per_minute=60000)
+        result = limiter.call(evaluator, tokens=500, query=query, response=response)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        max_retries: int = None,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        requests_per_minute = requests_per_minute or DEFAULT_REQUESTS_PER_MINUTE
+        tokens_per_minute = tokens_per_minute or DEFAULT_TOKENS_PER_MINUTE
+        self.requests = TokenBucket(float(requests_per_minute)) if requests_per_minute else None
+        self.tokens = TokenBucket(float(tokens_per_minute)) if tokens_per_minute else None
+        self.max_retries = max_retries if max_retries is not None else DEFAULT_MAX_RETRIES
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def _buckets(self):
+        return [bucket for bucket in (self.requests, self.tokens) if bucket is not None]
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserves budget for one request and returns the seconds to wait before sending it."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        with self._lock:
+            return max(wait, self._paused_until - time.monotonic())
+
+    def acquire(self, tokens: int = 0):
+        """Blocks until one request with `tokens` estimated tokens may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0):
+        """Waits without blocking the event loop until one request may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the jittered delay before retry number `attempt` (starting at 0).
+
+        A server-provided `retry_after` is honoured with up to 10% extra jitter, so callers
+        throttled together do not all retry at the same instant. Otherwise the delay is drawn
+        uniformly up to an exponentially growing cap ("full jitter").
+        """
+        if retry_after is not None:
+            return retry_after * (1 + random.uniform(0, 0.1))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def record_response(self, status_code: int, headers: Mapping[str, str], attempt: int = 0):
+        """
+        Updates the budgets from a response and returns the delay before retrying it, if any.
+
+        Args:
+            status_code (int): The HTTP status code.
+            headers (Mapping[str, str]): The response headers.
+            attempt (int): How many times the request has already been retried.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None if the response is final.
+        """
+        for header, bucket in (
+            ("x-ratelimit-remaining-requests", self.requests),
+            ("x-ratelimit-remaining-tokens", self.tokens),
+        ):
+            if bucket is not None and header in headers:
+                try:
+                    bucket.limit_level(float(headers[header]))
+                except ValueError:
+                    pass
+
+        if status_code not in RETRY_STATUS_CODES:
+            for bucket in self._buckets:
+                bucket.rate_factor = min(1.0, bucket.rate_factor + 0.05)
+            return None
+
+        delay = self.backoff(attempt, parse_retry_after(headers))
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            # Requests sent together are throttled together: slow down once per pause, not once
+            # per rejected request.
+            if now >= self._paused_until:
+                for bucket in self._buckets:
+                    bucket.rate_factor = max(0.1, bucket.rate_factor / 2)
+            if attempt >= self.max_retries:
+                return None
+            self._paused_until = max(self._paused_until, now + delay)
+        logger.debug(f"Rate limited (HTTP {status_code}), retrying in {delay:.2f}s")
+        return delay
+
+    def call(self, fn: Callable, *args, tokens: int = 0, **kwargs) -> Any:
+        """
+        Calls `fn` within the budgets, retrying it when it raises a rate-limit error.
+
+        For clients whose HTTP transport cannot be replaced. An exception counts as a rate-limit
+        error when it, or an exception it was raised from, carries a 429 `status_code` (as the
+        openai errors do).
+
+        Args:
+            fn (Callable): The function making the request.
+            *args: Positional arguments for `fn`.
+            tokens (int, optional): Estimated tokens used by the request. Defaults to 0.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            Any: The return value of `fn`.
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not self._retries(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            self.record_response(200, {})
+            return result
+
+    async def acall(self, fn: Callable, *args, tokens: int = 0, **kwargs) -> Any:
+        """
+        Awaits the coroutine function `fn` within the budgets, retrying it like `call`.
+
+        Args:
+            fn (Callable): The coroutine function making the request.
+            *args: Positional arguments for `fn`.
+            tokens (int, optional): Estimated tokens used by the request. Defaults to 0.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            Any: The result awaited from `fn`.
+        """
+        attempt = 0
+        while True:
+            await self.aacquire(tokens)
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                if not self._retries(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            self.record_response(200, {})
+            return result
+
+    def _retries(self, exception: Exception, attempt: int) -> bool:
+        """Records a failed call and returns whether it was rate limited and may be retried."""
+        error = _rate_limit_error(exception)
+        if error is None:
+            return False
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        return self.record_response(error.status_code, headers, attempt) is not None
+
+
+def deployment_name(url: httpx.URL) -> str:
+    """Returns the Azure OpenAI deployment a request URL targets, or "default"."""
+    match = _DEPLOYMENT_PATTERN.search(url.path)
+    return match.group(1) if match else "default"
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    A sync transport sending requests through a `RateLimiter` and retrying rate-limited ones.
+
+    Args:
+        transport (httpx.BaseTransport): The transport sending the requests.
+        rate_limiter (RateLimiter, optional): The limiter for every request. Defaults to the
+            process-wide limiter of the deployment each request targets.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, rate_limiter: RateLimiter = None):
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+
+    def _limiter(self, request: httpx.Request) -> RateLimiter:
+        return self.rate_limiter or get_rate_limiter(deployment_name(request.url))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self._limiter(request)
+        tokens = estimate_request_tokens(request.read())
+        attempt = 0
+        while True:
+            limiter.acquire(tokens)
+            response = self.transport.handle_request(request)
+            delay = limiter.record_response(response.status_code, response.headers, attempt)
+            if delay is None:
+                return response
+            response.close()
+            attempt += 1
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    An async transport sending requests through a `RateLimiter` and retrying rate-limited ones.
+
+    Args:
+        transport (httpx.AsyncBaseTransport): The transport sending the requests.
+        rate_limiter (RateLimiter, optional): The limiter for every request. Defaults to the
+            process-wide limiter of the deployment each request targets.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, rate_limiter: RateLimiter = None):
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+
+    def _limiter(self, request: httpx.Request) -> RateLimiter:
+        return self.rate_limiter or get_rate_limiter(deployment_name(request.url))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self._limiter(request)
+        tokens = estimate_request_tokens(await request.aread())
+        attempt = 0
+        while True:
+            await limiter.aacquire(tokens)
+            response = await self.transport.handle_async_request(request)
+            delay = limiter.record_response(response.status_code, response.headers, attempt)
+            if delay is None:
+                return response
+            await response.aclose()
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(deployment: str = "default") -> RateLimiter:
+    """
+    Returns the process-wide rate limiter for an Azure OpenAI deployment.
+
+    Quotas apply per deployment, so chat and embedding deployments are scheduled separately.
+    Limiters are created with the `LLM_EVAL_*_PER_MINUTE` budgets unless one was registered with
+    `set_rate_limiter`.
+    """
+    with _LIMITERS_LOCK:
+        if deployment not in _LIMITERS:
+            _LIMITERS[deployment] = RateLimiter()
+        return _LIMITERS[deployment]
+
+
+def set_rate_limiter(deployment: str, rate_limiter: RateLimiter):
+    """Registers the rate limiter used for a deployment, e.g. to give it its own budgets."""
+    with _LIMITERS_LOCK:
+        _LIMITERS[deployment] = rate_limiter
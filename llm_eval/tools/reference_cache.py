@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from statistics import mean, stdev
+from typing import List
+
+from llm_eval.tools.utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+def hash_references(references: List[str]) -> str:
+    """Returns a stable hash of an ordered list of reference responses."""
+    return hashlib.sha256(
+        json.dumps(list(references), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+class ReferenceDistributionCache:
+    """
+    Memoizes the score distribution of golden reference responses.
+
+    Distributions are keyed by the evaluator's identity (evaluator class, model, commit and
+    scoring configuration) and a hash of the reference list, held in memory and persisted as JSON
+    so later runs and other tests sharing the same references skip re-scoring them. On a miss
+    every reference is scored in a single batched pass.
+
+    Only distributions of a known model commit are persisted. A branch such as 'main' may point to
+    another model in the next run, so when the identity has no `commit` the distribution is only
+    kept in memory.
+
+    Args:
+        directory (str, optional): Directory to persist distributions in. Defaults to
+            `reference_distributions` inside the llm_eval cache directory.
+
+    Example:
+        distribution = get_reference_cache().get_or_compute(ToxicityEvaluator(), references)
+        distribution["mean_score"], distribution["stdev"]
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        directory = self.directory or get_cache_dir("reference_distributions")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{key}.json")
+
+    @staticmethod
+    def make_key(identity: dict, references: List[str]) -> str:
+        payload = {
+            "evaluator": identity,
+            "references": hash_references(references),
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def get_or_compute(self, evaluator, references: List[str]) -> dict:
+        """
+        Returns the score distribution of the references, scoring them only on a cache miss.
+
+        Args:
+            evaluator (TransformerEvaluator): Evaluator instance used to score the references.
+            references (List[str]): The golden standard responses.
+
+        Returns:
+            dict: The per-reference scores (`reference_scores`), their `mean_score` and `stdev`.
+        """
+        identity = evaluator.cache_identity
+        key = self.make_key(identity, references)
+
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+
+        persist = identity.get("commit") is not None
+        distribution = self._load(key) if persist else None
+        if distribution is None:
+            logger.debug(f"Scoring {len(references)} references for distribution {key}")
+            scores = [
+                result[evaluator.evaluator]
+                for result in evaluator.evaluate_batch(references)
+            ]
+            distribution = {
+                "reference_scores": scores,
+                "mean_score": mean(scores),
+                "stdev": stdev(scores),
+            }
+            if persist:
+                self._save(key, distribution)
+
+        with self._lock:
+            self._memory[key] = distribution
+        return distribution
+
+    def _load(self, key: str):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: str, distribution: dict):
+        path = self._path(key)
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=os.path.dirname(path), delete=False, encoding="utf-8"
+            ) as temp_file:
+                json.dump(distribution, temp_file)
+            os.replace(temp_file.name, path)
+        except OSError as e:
+            logger.warning(f"Could not persist reference distribution {key}: {e}")
+
+    def clear(self):
+        """Drops the in-memory distributions; persisted files are kept."""
+        with self._lock:
+            self._memory.clear()
+
+
+_REFERENCE_CACHE = ReferenceDistributionCache()
+
+
+def get_reference_cache() -> ReferenceDistributionCache:
+    """Returns the process-wide reference distribution cache."""
+    return _REFERENCE_CACHE
@@ -0,0 +1,334 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, List, Optional
+
+from llm_eval.tools.utils import format_dict_log
+
+logger = logging.getLogger(__name__)
+
+# Context lists are shortened in the log view; sinks always receive them in full.
+_CONTEXT_FIELDS = ("retrieved_contexts", "reference_contexts")
+_CONTEXT_LOG_LENGTH = 200
+
+# Queued by `ResultSink.flush` to write the records buffered before it without waiting.
+_FLUSH = object()
+
+
+class ResultLog:
+    """
+    A lazily formatted log view of an evaluation result.
+
+    Passed to `logger.log` as the message, so the multi-line `format_dict_log` string (and the
+    shortened context lists) are only built if a handler actually emits the record.
+    """
+
+    __slots__ = ("result", "_text")
+
+    def __init__(self, result: dict):
+        self.result = result
+        self._text = None
+
+    def __str__(self) -> str:
+        # Each handler formats the message, so the text is built once and reused.
+        if self._text is None:
+            self._text = self._format()
+        return self._text
+
+    def _format(self) -> str:
+        view = dict(self.result)
+        for field in _CONTEXT_FIELDS:
+            if isinstance(view.get(field), list):
+                view[field] = [
+                    text
+                    if not isinstance(text, str) or len(text) <= _CONTEXT_LOG_LENGTH
+                    else text[:100] + "......" + text[-100:]
+                    for text in view[field]
+                ]
+        return format_dict_log(dictionary=view)
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars and arrays become Python numbers and lists; anything else (types, ...) a string.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class ResultSink:
+    """
+    Base class of the result sinks: buffers records and writes them on a background thread.
+
+    `emit` only enqueues the record, so evaluators never wait on serialization or disk. The
+    writer thread collects records into a batch until it holds `batch_size` records or its first
+    record has waited `flush_interval` seconds, then passes the batch to `write`. `flush` and
+    `close` write the buffered records straight away. When the queue is full, `emit` blocks until
+    the writer catches up.
+
+    Subclasses implement `write(records)`, and `close_output()` if they hold open files.
+
+    Args:
+        batch_size (int, optional): Maximum records per write. Defaults to 1000.
+        flush_interval (float, optional): Seconds a record may wait in the buffer. Defaults to 1.
+        max_queue_size (int, optional): Records buffered before `emit` blocks. Defaults to 100000.
+    """
+
+    def __init__(
+        self, batch_size: int = 1000, flush_interval: float = 1.0, max_queue_size: int = 100_000
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1. Got {batch_size}.")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"llm-eval-{type(self).__name__}", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, evaluator: str, result: dict):
+        """Queues a result record for writing."""
+        if self._closed:
+            raise ValueError(f"{type(self).__name__} is closed.")
+        self._queue.put({"timestamp": time.time(), "evaluator": evaluator, "result": dict(result)})
+
+    def flush(self):
+        """Blocks until every record emitted so far has been written."""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        """Writes the remaining records, stops the writer thread and closes the output."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self.close_output()
+
+    def write(self, records: List[dict]):
+        raise NotImplementedError
+
+    def close_output(self):
+        pass
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Hold the batch open until it is full, its first record has waited `flush_interval`
+            # seconds, or a flush or close asks for it.
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and batch[-1] is not _FLUSH:
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is None
+            records = [record for record in batch if record is not None and record is not _FLUSH]
+            try:
+                if records:
+                    self.write(records)
+                    self.written += len(records)
+            except Exception as e:
+                logger.error(f"{type(self).__name__} dropped {len(records)} records: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+class JsonlResultSink(ResultSink):
+    """
+    Appends result records to a JSON Lines file, one object per line.
+
+    Each line holds `timestamp`, `evaluator` (the evaluator class) and `result` (the dictionary
+    the evaluator returned).
+
+    Args:
+        path (str): The file to append to. Parent directories are created.
+        **kwargs: Buffering options of `ResultSink`.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        super().__init__(**kwargs)
+
+    def write(self, records: List[dict]):
+        self._file.write(
+            "".join(
+                json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+                for record in records
+            )
+        )
+        self._file.flush()
+
+    def close_output(self):
+        self._file.close()
+
+
+class ParquetResultSink(ResultSink):
+    """
+    Writes result records to a Parquet file, one row group per written batch.
+
+    Evaluators return differently shaped results, so rows have a fixed schema: `timestamp`,
+    `evaluator`, and `result` holding the result dictionary as a JSON string. The file is only
+    complete once the sink is closed. Requires pyarrow (`pip install audacia-llm-evaluation[parquet]`).
+
+    Args:
+        path (str): The file to write. It is overwritten.
+        **kwargs: Buffering options of `ResultSink`.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "ParquetResultSink requires pyarrow. Install it with "
+                "`pip install audacia-llm-evaluation[parquet]`."
+            ) from e
+
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._pa = pa
+        self._schema = pa.schema(
+            [("timestamp", pa.float64()), ("evaluator", pa.string()), ("result", pa.string())]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        super().__init__(**kwargs)
+
+    def write(self, records: List[dict]):
+        table = self._pa.Table.from_pydict(
+            {
+                "timestamp": [record["timestamp"] for record in records],
+                "evaluator": [record["evaluator"] for record in records],
+                "result": [
+                    json.dumps(record["result"], ensure_ascii=False, default=_json_default)
+                    for record in records
+                ],
+            },
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+
+    def close_output(self):
+        self._writer.close()
+
+
+def open_result_sink(path: str, **kwargs) -> ResultSink:
+    """Opens a Parquet sink for `.parquet` paths and a JSON Lines sink otherwise."""
+    if path.endswith(".parquet"):
+        return ParquetResultSink(path, **kwargs)
+    return JsonlResultSink(path, **kwargs)
+
+
+_RESULT_SINK: Optional[ResultSink] = None
+_RESULT_SINK_LOCK = threading.Lock()
+_ENV_CHECKED = False
+_LOG_RESULTS: Optional[bool] = None
+
+
+def enable_result_sink(sink) -> ResultSink:
+    """
+    Sends every evaluator result in this process to a sink.
+
+    Args:
+        sink (ResultSink | str): A sink, or a path opened with `open_result_sink`.
+
+    Returns:
+        ResultSink: The active sink. It is flushed and closed at exit.
+    """
+    global _RESULT_SINK
+    if isinstance(sink, str):
+        sink = open_result_sink(sink)
+    with _RESULT_SINK_LOCK:
+        previous, _RESULT_SINK = _RESULT_SINK, sink
+    if previous is not None and previous is not sink:
+        previous.close()
+    return sink
+
+
+def disable_result_sink():
+    """Closes the active sink, writing its remaining records."""
+    global _RESULT_SINK
+    with _RESULT_SINK_LOCK:
+        previous, _RESULT_SINK = _RESULT_SINK, None
+    if previous is not None:
+        previous.close()
+
+
+def get_result_sink() -> Optional[ResultSink]:
+    """
+    Returns the active result sink, or None when results are not recorded.
+
+    No sink is active by default. One is enabled by `enable_result_sink`, or on first use when
+    the `LLM_EVAL_RESULT_SINK` environment variable names an output file.
+    """
+    global _RESULT_SINK, _ENV_CHECKED
+    if not _ENV_CHECKED:
+        with _RESULT_SINK_LOCK:
+            if not _ENV_CHECKED:
+                _ENV_CHECKED = True
+                path = os.getenv("LLM_EVAL_RESULT_SINK")
+                if _RESULT_SINK is None and path:
+                    _RESULT_SINK = open_result_sink(path)
+    return _RESULT_SINK
+
+
+def enable_result_logging(enabled: bool = True):
+    """
+    Logs each evaluator result at INFO as a formatted block.
+
+    Results are otherwise logged at DEBUG. Either way the block is only formatted when a handler
+    emits it. Also enabled by setting `LLM_EVAL_LOG_RESULTS` to a truthy value.
+    """
+    global _LOG_RESULTS
+    _LOG_RESULTS = enabled
+
+
+def result_log_level() -> int:
+    global _LOG_RESULTS
+    if _LOG_RESULTS is None:
+        _LOG_RESULTS = os.getenv("LLM_EVAL_LOG_RESULTS", "").lower() in ("1", "true", "yes")
+    return logging.INFO if _LOG_RESULTS else logging.DEBUG
+
+
+def report_result(evaluator: str, result: dict, log: logging.Logger = logger):
+    """
+    Records an evaluator result: emits it to the active sink and logs a lazy view of it.
+
+    Args:
+        evaluator (str): The name of the evaluator that produced the result.
+        result (dict): The result the evaluator returns.
+        log (logging.Logger, optional): The evaluator module's logger.
+    """
+    sink = get_result_sink()
+    if sink is not None:
+        sink.emit(evaluator, result)
+    level = result_log_level()
+    if log.isEnabledFor(level):
+        log.log(level, ResultLog(result))
+
+
+@atexit.register
+def _close_result_sink():
+    disable_result_sink()
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from enum import Enum
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Optional
+
+from llm_eval.tools.utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_MB = float(os.getenv("LLM_EVAL_SCORE_CACHE_MB", "512"))
+
+
+class SQLiteStore:
+    """
+    A size-bounded key/value store backed by a single SQLite file.
+
+    Values are stored as text alongside their size and last access time. Once the total size
+    of the stored values exceeds `max_size_mb`, the least recently used entries are deleted
+    until the store is back under 90% of the cap. The store is safe to share between threads,
+    and between processes through SQLite's own locking.
+
+    Args:
+        path (str): Location of the SQLite database file.
+        max_size_mb (float): Cap on the total size of stored values in megabytes.
+    """
+
+    _EVICTION_INTERVAL = 64
+
+    def __init__(self, path: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self.path = path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._connection.commit()
+            return row[0]
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), time.time()),
+            )
+            self._connection.commit()
+            self._writes += 1
+            if self._writes % self._EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def evict(self):
+        """Deletes least recently used entries until the store is within its size cap."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        total = self._size_bytes()
+        if total <= self.max_size_bytes:
+            return
+
+        target = int(self.max_size_bytes * 0.9)
+        removed = 0
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= target:
+                break
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        self._connection.commit()
+        logger.debug(f"Evicted {removed} entries from {self.path}")
+
+    def _size_bytes(self) -> int:
+        return self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._size_bytes()
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def library_version(package: str) -> str:
+    """Returns the installed version of a package, or 'unknown' if it is not installed."""
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def normalize_inputs(value: Any) -> Any:
+    """Canonicalises evaluator inputs (NFC unicode, JSON-compatible containers) for hashing."""
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, dict):
+        return {str(k): normalize_inputs(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(v) for v in value]
+    if isinstance(value, Enum):
+        return str(value.value)
+    return value
+
+
+def model_identity(model: Any) -> Any:
+    """
+    Describes an LLM or embedding client by its class and deployment/model name.
+
+    Ragas wrappers are unwrapped to the underlying LangChain client, so the same deployment
+    produces the same identity regardless of how it was wrapped.
+
+    Args:
+        model (Any): A client, wrapper, or plain value.
+
+    Returns:
+        Any: Plain values unchanged, otherwise a dictionary describing the model.
+    """
+    if model is None or isinstance(model, (str, int, float, bool)):
+        return model
+    if isinstance(model, dict):
+        return {k: model_identity(v) for k, v in model.items() if "key" not in k.lower()}
+
+    inner = getattr(model, "langchain_llm", None) or getattr(model, "embeddings", None)
+    if inner is not None and inner is not model:
+        return model_identity(inner)
+
+    identity = {"class": type(model).__name__}
+    for attribute in ("deployment_name", "model_name", "model", "azure_deployment"):
+        value = getattr(model, attribute, None)
+        if isinstance(value, str):
+            identity[attribute] = value
+    return identity
+
+
+def scoring_params(evaluator: Any) -> dict:
+    """Returns the simple, threshold-independent configuration attributes of an evaluator."""
+    return {
+        name: normalize_inputs(value)
+        for name, value in sorted(vars(evaluator).items())
+        if isinstance(value, (str, int, float, bool, Enum))
+        and "threshold" not in name
+        and "higher_is_better" not in name
+    }
+
+
+def apply_threshold(result: dict, threshold: float, higher_is_better: bool = True) -> dict:
+    """
+    Recomputes the `{metric}_result` and `{metric}_threshold` entries of an evaluation result.
+
+    Each `{metric}_result` key is paired with its score under `{metric}` or `{metric}_score`,
+    matching the result layout of the azure.ai.evaluation evaluators, so cached raw scores can
+    be reused with a different threshold.
+
+    Args:
+        result (dict): An evaluation result containing scores and `_result` entries.
+        threshold (float): The threshold to apply.
+        higher_is_better (bool, optional): Whether scores at or above the threshold pass. Defaults to True.
+
+    Returns:
+        dict: A copy of `result` with pass/fail outcomes for the given threshold.
+    """
+    result = dict(result)
+    for result_key in [key for key in result if key.endswith("_result")]:
+        metric = result_key[: -len("_result")]
+        score = result.get(metric, result.get(f"{metric}_score"))
+        if not isinstance(score, (int, float)):
+            continue
+
+        if math.isnan(score):
+            outcome = "unknown"
+        elif higher_is_better:
+            outcome = "pass" if score >= threshold else "fail"
+        else:
+            outcome = "pass" if score <= threshold else "fail"
+
+        result[result_key] = outcome
+        if f"{metric}_threshold" in result:
+            result[f"{metric}_threshold"] = threshold
+    return result
+
+
+class ScoreCache:
+    """
+    A persistent, content-addressed cache of raw evaluator scores.
+
+    Keys hash the evaluator class, the model or metric identity and revision, and the normalized
+    inputs — but never the threshold, so a cached score is reused when only the pass/fail criteria
+    change. Values are stored in a size-bounded SQLite file with least-recently-used eviction.
+
+    Args:
+        directory (str, optional): Directory for the cache database. Defaults to `scores` inside
+            the llm_eval cache directory.
+        max_size_mb (float, optional): Cap on the cache size in megabytes. Defaults to the
+            `LLM_EVAL_SCORE_CACHE_MB` environment variable, or 512.
+
+    Example:
+        cache = enable_score_cache()
+        ...
+        cache.stats  # {"hits": 120, "misses": 4, "hit_rate": 0.97, ...}
+    """
+
+    def __init__(self, directory: str = None, max_size_mb: float = None):
+        directory = directory or get_cache_dir("scores")
+        self.store = SQLiteStore(
+            os.path.join(directory, "scores.sqlite"),
+            max_size_mb if max_size_mb is not None else DEFAULT_MAX_SIZE_MB,
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(evaluator_class: str, identity: dict, inputs: dict) -> str:
+        payload = json.dumps(
+            {
+                "evaluator_class": evaluator_class,
+                "identity": normalize_inputs(identity),
+                "inputs": normalize_inputs(inputs),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.store.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        self.store.set(key, json.dumps(value))
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.store),
+            "size_bytes": self.store.size_bytes,
+        }
+
+    def clear(self):
+        self.store.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+_SCORE_CACHE: Optional[ScoreCache] = None
+_SCORE_CACHE_LOCK = threading.Lock()
+
+
+def enable_score_cache(directory: str = None, max_size_mb: float = None) -> ScoreCache:
+    """
+    Enables the persistent score cache for every evaluator in this process.
+
+    Args:
+        directory (str, optional): Directory for the cache database.
+        max_size_mb (float, optional): Cap on the cache size in megabytes.
+
+    Returns:
+        ScoreCache: The active cache.
+    """
+    global _SCORE_CACHE
+    with _SCORE_CACHE_LOCK:
+        _SCORE_CACHE = ScoreCache(directory=directory, max_size_mb=max_size_mb)
+    return _SCORE_CACHE
+
+
+def disable_score_cache():
+    global _SCORE_CACHE
+    with _SCORE_CACHE_LOCK:
+        _SCORE_CACHE = None
+
+
+def get_score_cache() -> Optional[ScoreCache]:
+    """
+    Returns the active score cache, or None when caching is disabled.
+
+    The cache is off by default. It is enabled by `enable_score_cache`, or on first use when the
+    `LLM_EVAL_SCORE_CACHE` environment variable is set to a truthy value.
+    """
+    global _SCORE_CACHE
+    if _SCORE_CACHE is None and os.getenv("LLM_EVAL_SCORE_CACHE", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    ):
+        with _SCORE_CACHE_LOCK:
+            if _SCORE_CACHE is None:
+                _SCORE_CACHE = ScoreCache()
+    return _SCORE_CACHE
@@ -0,0 +1,99 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_EVAL_TEXT_CACHE_SIZE", "20000"))
+
+
+class TextArtefactCache:
+    """
+    An in-memory LRU cache of artefacts derived from a text: tokens, n-gram counts, normalized forms.
+
+    Artefacts are keyed by their kind (e.g. "nltk_tokens") and a hash of the text, so every
+    metric that needs the same artefact of the same text builds it once. When the cache holds
+    `max_entries` artefacts, the least recently used one is evicted. Cached artefacts are shared
+    between callers and must not be mutated.
+
+    Args:
+        max_entries (int, optional): Maximum number of artefacts held. Defaults to the
+            `LLM_EVAL_TEXT_CACHE_SIZE` environment variable, or 20000.
+
+    Example:
+        tokens = get_text_artefact_cache().get("rouge_tokens", text, rouge_tokenize)
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries if max_entries is not None else DEFAULT_MAX_ENTRIES
+        if self.max_entries < 0:
+            raise ValueError(f"max_entries must not be negative. Got {self.max_entries}.")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind: str, text: str) -> Tuple[str, bytes]:
+        return kind, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, kind: str, text: str, build: Callable[[str], Any]) -> Any:
+        """
+        Returns the `kind` artefact of `text`, building it with `build(text)` on a miss.
+
+        Args:
+            kind (str): The artefact type, which must identify `build`.
+            text (str): The text the artefact is derived from.
+            build (Callable[[str], Any]): Builds the artefact from the text.
+        """
+        key = self.make_key(kind, text)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        value = build(text)
+        if self.max_entries == 0:
+            return value
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_TEXT_ARTEFACT_CACHE = TextArtefactCache()
+
+
+def get_text_artefact_cache() -> TextArtefactCache:
+    """Returns the process-wide cache of text artefacts shared by the lexical metrics."""
+    return _TEXT_ARTEFACT_CACHE
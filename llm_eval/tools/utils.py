@@ -1,4 +1,8 @@
+import importlib
+import os
 import re
+import sys
+from typing import Any, Callable, Dict
 
 
 def format_dict_log(dictionary: dict, stars: int = 100) -> str:
@@ -8,3 +12,52 @@ def format_dict_log(dictionary: dict, stars: int = 100) -> str:
 
 def camel_to_snake(camel_str):
     return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", camel_str).lower()
+
+
+def get_cache_dir(*subdirectories: str) -> str:
+    """
+    Returns (and creates) the directory used for llm_eval's on-disk caches.
+
+    The root defaults to `~/.cache/llm_eval` and can be overridden with the `LLM_EVAL_CACHE_DIR`
+    environment variable.
+
+    Args:
+        *subdirectories (str): Optional path components appended to the cache root.
+
+    Returns:
+        str: The absolute path of the cache directory.
+    """
+    root = os.getenv("LLM_EVAL_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "llm_eval"
+    )
+    path = os.path.join(root, *subdirectories)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def lazy_attributes(module_name: str, attributes: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Builds a module-level `__getattr__` that imports third-party names on first access.
+
+    Heavy dependencies (transformers, langchain, ragas, azure) stay importable from the module
+    that used to import them eagerly, without paying their import cost until they are used.
+
+    Args:
+        module_name (str): The `__name__` of the module defining the `__getattr__`.
+        attributes (Dict[str, str]): Maps each lazy name to the module it is imported from.
+
+    Returns:
+        Callable[[str], Any]: The `__getattr__` function for the module.
+
+    Example:
+        __getattr__ = lazy_attributes(__name__, {"SimilarityEvaluator": "azure.ai.evaluation"})
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name]), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,187 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import (
+    SentimentEvaluator,
+    ToxicityEvaluator,
+)
+from llm_eval.evaluators.toxicity import RunToxicityEvaluatorAgainstExpectedScore
+from llm_eval.tools.micro_batcher import get_micro_batcher
+from llm_eval.tools.score_cache import disable_score_cache, enable_score_cache
+from tests.support.fake_classifier import patched_classifier
+
+
+@pytest.fixture
+def fake_toxicity_classifier():
+    with patched_classifier(ToxicityEvaluator, ["neutral", "toxic"]) as classifier:
+        yield classifier
+
+
+@pytest.fixture
+def fake_sentiment_classifier():
+    with patched_classifier(SentimentEvaluator, ["Negative", "Positive"]) as classifier:
+        yield classifier
+
+
+RESPONSES = [
+    "one two three four five six seven",
+    "one",
+    "one two three four five",
+    "one two",
+]
+
+
+def test_evaluate_batch_matches_single_calls(fake_toxicity_classifier):
+    evaluator = ToxicityEvaluator()
+
+    batch = evaluator.evaluate_batch(RESPONSES, batch_size=2)
+    single = [evaluator(response=response) for response in RESPONSES]
+
+    assert batch == single
+
+
+def test_evaluate_batch_sorts_by_token_length(fake_toxicity_classifier):
+    ToxicityEvaluator().evaluate_batch(RESPONSES, batch_size=2)
+
+    assert fake_toxicity_classifier.batches == [
+        ["one", "one two"],
+        ["one two three four five", "one two three four five six seven"],
+    ]
+
+
+def test_evaluate_batch_applies_aggregate_weights(fake_sentiment_classifier):
+    results = SentimentEvaluator().evaluate_batch(["one two three four five"])
+
+    assert results == [{"sentiment": pytest.approx(0.5 * -0.5 + 0.5 * 0.5)}]
+
+
+def test_evaluate_batch_empty(fake_toxicity_classifier):
+    assert ToxicityEvaluator().evaluate_batch([]) == []
+
+
+def test_run_evaluator_batch_applies_evaluate_method(fake_toxicity_classifier):
+    results = RunToxicityEvaluatorAgainstExpectedScore.evaluate_batch(
+        RESPONSES, batch_size=2, expected_score=0.1, allowed_uncertainty=0.05
+    )
+
+    assert [result["response"] for result in results] == RESPONSES
+    assert [result["toxicity_result"] for result in results] == [
+        "fail",
+        "pass",
+        "fail",
+        "fail",
+    ]
+
+
+def test_evaluate_batch_only_scores_uncached_responses(tmp_path, fake_toxicity_classifier):
+    enable_score_cache(directory=str(tmp_path))
+    try:
+        evaluator = ToxicityEvaluator()
+        evaluator.evaluate_batch(RESPONSES[:2], batch_size=8)
+        fake_toxicity_classifier.batches.clear()
+
+        results = evaluator.evaluate_batch(RESPONSES, batch_size=8)
+    finally:
+        disable_score_cache()
+
+    assert fake_toxicity_classifier.batches == [
+        ["one two", "one two three four five"]
+    ]
+    assert results == [
+        {"toxicity": pytest.approx(0.7)},
+        {"toxicity": pytest.approx(0.1)},
+        {"toxicity": pytest.approx(0.5)},
+        {"toxicity": pytest.approx(0.2)},
+    ]
+
+
+LONG_RESPONSE = " ".join(["calm"] * 9 + ["awful"] * 3)
+
+
+def test_chunked_mode_splits_long_responses_into_overlapping_windows(fake_toxicity_classifier):
+    ToxicityEvaluator(chunked=True, window_stride=1).evaluate_batch([LONG_RESPONSE])
+
+    assert fake_toxicity_classifier.batches == [
+        [
+            "calm calm calm calm",
+            "calm calm calm calm",
+            "calm calm calm awful",
+            "awful awful awful",
+        ]
+    ]
+
+
+def test_chunked_mode_scores_short_responses_unchanged(fake_toxicity_classifier):
+    evaluator = ToxicityEvaluator(chunked=True)
+
+    assert evaluator.evaluate_batch(["one two"]) == ToxicityEvaluator().evaluate_batch(
+        ["one two"]
+    )
+
+
+def test_chunked_toxicity_takes_the_max_window(fake_toxicity_classifier):
+    fake_toxicity_classifier._classify = lambda text: [
+        {"label": "neutral", "score": 0.0},
+        {"label": "toxic", "score": text.count("awful") / 4},
+    ]
+
+    result = ToxicityEvaluator(chunked=True, window_stride=1).evaluate_batch([LONG_RESPONSE])
+
+    assert result == [{"toxicity": pytest.approx(0.75)}]
+
+
+def test_chunked_sentiment_takes_the_length_weighted_mean(fake_sentiment_classifier):
+    fake_sentiment_classifier._classify = lambda text: [
+        {"label": "Negative", "score": 0.0},
+        {"label": "Positive", "score": text.count("awful") / 4},
+    ]
+
+    result = SentimentEvaluator(chunked=True, window_stride=1).evaluate_batch([LONG_RESPONSE])
+
+    # Windows of 4, 4, 4 and 3 tokens (plus two special tokens each) scoring 0, 0, 0.125 and 0.375.
+    expected = (6 * 0 + 6 * 0 + 6 * 0.125 + 5 * 0.375) / 23
+    assert result == [{"sentiment": pytest.approx(expected)}]
+
+
+def test_chunked_mode_tokenizes_long_responses_in_bounded_segments(fake_toxicity_classifier):
+    response = " ".join(["word"] * 500)
+
+    results = ToxicityEvaluator(chunked=True, window_stride=1).evaluate_batch(
+        [response], batch_size=4
+    )
+
+    assert len(fake_toxicity_classifier.tokenizer.calls) > 1
+    assert all(len(segment) <= 6 * 32 for segment in fake_toxicity_classifier.tokenizer.calls)
+    assert all(len(batch) <= 4 for batch in fake_toxicity_classifier.batches)
+    assert results == [{"toxicity": pytest.approx(0.4)}]
+
+
+def test_rejects_unknown_window_combine_rule():
+    with pytest.raises(ValueError):
+        ToxicityEvaluator(chunked=True, window_combine="median")
+
+
+@pytest.mark.asyncio
+async def test_ascore_batches_concurrent_coroutines(fake_toxicity_classifier):
+    evaluator = ToxicityEvaluator()
+
+    results = await asyncio.gather(
+        *(evaluator.ascore(response) for response in RESPONSES)
+    )
+
+    assert results == evaluator.evaluate_batch(RESPONSES)
+    assert len(fake_toxicity_classifier.batches[0]) == len(RESPONSES)
+
+
+
+def test_micro_batcher_is_found_without_resolving_the_model_commit():
+    with patch(
+        "llm_eval.base_evaluators.custom_evaluators.resolve_model_revision",
+        side_effect=AssertionError("the commit was resolved"),
+    ):
+        batcher = get_micro_batcher(ToxicityEvaluator())
+
+    assert get_micro_batcher(ToxicityEvaluator()) is batcher
+    assert get_micro_batcher(ToxicityEvaluator(chunked=True)) is not batcher
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from llm_eval.base_evaluators.ragas_base_evaluator import (
+    RagasBaseEvaluator,
+    evaluate_dataset,
+)
+from llm_eval.evaluators.rag import (
+    RunNonLLMContextPrecisionWithReferenceEvaluator,
+    RunNonLLMContextRecallEvaluator,
+)
+
+
+class CountingMetric:
+    """Scores 1.0 for exact matches and records how it was used."""
+
+    instances = 0
+    running = 0
+    max_running = 0
+
+    def __init__(self):
+        CountingMetric.instances += 1
+
+    async def single_turn_ascore(self, sample):
+        CountingMetric.running += 1
+        CountingMetric.max_running = max(CountingMetric.max_running, CountingMetric.running)
+        await asyncio.sleep(0.01)
+        CountingMetric.running -= 1
+        if sample.response == "boom":
+            raise RuntimeError("metric failed")
+        return float(sample.response == sample.reference)
+
+
+class RunCountingEvaluator(RagasBaseEvaluator):
+    def __init__(self, response: str, reference: str, threshold: float = 0.5):
+        super().__init__(
+            sample_data={"response": response, "reference": reference},
+            threshold=threshold,
+            ragas_metric=CountingMetric,
+            assertion_fail_message="Evaluation failed",
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_counting_metric():
+    CountingMetric.instances = CountingMetric.running = CountingMetric.max_running = 0
+
+
+SAMPLES = [
+    {"response": "Paris", "reference": "Paris", "user_input": "Capital of France?"},
+    {"response": "Lyon", "reference": "Paris", "user_input": "Capital of France?"},
+] * 10
+
+
+@pytest.mark.asyncio
+async def test_evaluate_batch_builds_the_metric_once():
+    results = await RunCountingEvaluator.evaluate_batch(SAMPLES, max_concurrency=4)
+
+    assert CountingMetric.instances == 1
+    assert [result["counting_metric_result"] for result in results] == ["pass", "fail"] * 10
+
+
+@pytest.mark.asyncio
+async def test_evaluate_batch_bounds_concurrency():
+    await RunCountingEvaluator.evaluate_batch(SAMPLES, max_concurrency=3)
+
+    assert CountingMetric.max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_evaluate_batch_records_errors_per_sample():
+    results = await RunCountingEvaluator.evaluate_batch(
+        [{"response": "boom", "reference": "x"}, {"response": "x", "reference": "x"}]
+    )
+
+    assert results[0]["counting_metric_result"] == "error"
+    assert results[0]["counting_metric_error"] == "metric failed"
+    assert results[1]["counting_metric_result"] == "pass"
+
+
+def test_from_sample_passes_only_accepted_fields():
+    evaluator = RunCountingEvaluator.from_sample(SAMPLES[0], threshold=0.9, llm="unused")
+
+    assert evaluator.sample_data == {"response": "Paris", "reference": "Paris"}
+    assert evaluator.threshold == 0.9
+
+
+def test_from_sample_rejects_missing_fields():
+    with pytest.raises(ValueError, match="reference"):
+        RunCountingEvaluator.from_sample({"response": "Paris"})
+
+
+@pytest.mark.asyncio
+async def test_evaluate_dataset_merges_metrics_and_summarises():
+    samples = [
+        {
+            "retrieved_contexts": ["Paris is the capital of France."],
+            "reference_contexts": ["Paris is the capital of France."],
+        },
+        {
+            "retrieved_contexts": ["Bananas are yellow."],
+            "reference_contexts": ["Paris is the capital of France."],
+        },
+    ]
+
+    report = await evaluate_dataset(
+        samples,
+        [RunNonLLMContextRecallEvaluator, RunNonLLMContextPrecisionWithReferenceEvaluator],
+        threshold=0.5,
+    )
+
+    assert [result["non_llmcontext_recall_result"] for result in report["results"]] == [
+        "pass",
+        "fail",
+    ]
+    assert "non_llmcontext_precision_with_reference" in report["results"][0]
+    assert report["summary"]["non_llmcontext_recall"] == {
+        "passed": 1,
+        "failed": 1,
+        "errors": 0,
+        "pass_rate": 0.5,
+        "mean_score": 0.5,
+    }
@@ -0,0 +1,56 @@
+import asyncio
+import random
+import time
+
+import pytest
+from ragas.dataset_schema import SingleTurnSample
+from ragas.metrics import NonLLMContextPrecisionWithReference as RagasContextPrecision
+from ragas.metrics import NonLLMContextRecall as RagasContextRecall
+
+from llm_eval.tools.context_similarity import (
+    NonLLMContextPrecisionWithReference,
+    NonLLMContextRecall,
+)
+
+CONTEXTS = 50
+SAMPLES = 20
+WORDS = ["".join(random.Random(index).choices("abcdefghij", k=6)) for index in range(500)]
+
+
+def make_sample(rng: random.Random) -> SingleTurnSample:
+    def context() -> str:
+        return " ".join(rng.choices(WORDS, k=rng.randint(30, 60)))
+
+    return SingleTurnSample(
+        retrieved_contexts=[context() for _ in range(CONTEXTS)],
+        reference_contexts=[context() for _ in range(CONTEXTS)],
+    )
+
+
+async def time_metric(metric, samples) -> tuple:
+    start = time.perf_counter()
+    scores = [await metric.single_turn_ascore(sample) for sample in samples]
+    return (time.perf_counter() - start) / len(samples), scores
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+def test_benchmark_context_similarity_engine():
+    rng = random.Random(0)
+    samples = [make_sample(rng) for _ in range(SAMPLES)]
+
+    print(f"\n{CONTEXTS} retrieved x {CONTEXTS} reference contexts per sample")
+    for name, ragas_metric, metric in (
+        (
+            "precision",
+            RagasContextPrecision(threshold=0.5),
+            NonLLMContextPrecisionWithReference(threshold=0.5),
+        ),
+        ("recall", RagasContextRecall(threshold=0.5), NonLLMContextRecall(threshold=0.5)),
+    ):
+        ragas_time, ragas_scores = asyncio.run(time_metric(ragas_metric, samples))
+        engine_time, engine_scores = asyncio.run(time_metric(metric, samples))
+        print(
+            f"{name:<10} ragas {ragas_time * 1000:8.1f} ms/sample   "
+            f"cdist {engine_time * 1000:8.1f} ms/sample   {ragas_time / engine_time:6.1f}x"
+        )
+        assert engine_scores == ragas_scores
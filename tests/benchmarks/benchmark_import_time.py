@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+# Seconds allowed to import each public module in a fresh interpreter. Heavy dependencies are
+# imported on first use, so every module should stay well within these budgets.
+IMPORT_BUDGETS = {
+    "llm_eval.evaluators.bias": 0.3,
+    "llm_eval.evaluators.format": 0.1,
+    "llm_eval.evaluators.rag": 0.3,
+    "llm_eval.evaluators.sentiment": 0.3,
+    "llm_eval.evaluators.similarity": 0.3,
+    "llm_eval.evaluators.toxicity": 0.3,
+    "llm_eval.tools.model_tools": 0.2,
+}
+
+SCRIPT = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def import_time(module: str, repeats: int = 5) -> float:
+    """Returns the fastest of several cold imports of a module, in seconds."""
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", SCRIPT.format(module=module)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip().splitlines()[-1]
+        )
+        for _ in range(repeats)
+    )
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+@pytest.mark.parametrize("module, budget", IMPORT_BUDGETS.items())
+def test_benchmark_import_time(module, budget):
+    seconds = import_time(module)
+
+    print(f"\n{module}: {seconds * 1000:.0f} ms (budget {budget * 1000:.0f} ms)")
+    assert seconds <= budget
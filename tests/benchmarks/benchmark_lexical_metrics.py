@@ -0,0 +1,73 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from llm_eval.tools.lexical_metrics import METRICS, score_lexical_metrics
+
+PAIRS = 2000
+WORDS = ["".join(random.Random(index).choices("abcdefgh", k=5)) for index in range(300)]
+
+
+def make_texts(seed: int):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(20, 60))) for _ in range(PAIRS)]
+
+
+def nltk_data_available() -> bool:
+    import nltk
+
+    try:
+        nltk.find("tokenizers/punkt_tab")
+        nltk.find("corpora/wordnet.zip")
+        return True
+    except LookupError:
+        return False
+
+
+def single_pair_evaluators(metrics) -> list:
+    from azure.ai.evaluation import (
+        BleuScoreEvaluator,
+        F1ScoreEvaluator,
+        GleuScoreEvaluator,
+        MeteorScoreEvaluator,
+        RougeScoreEvaluator,
+        RougeType,
+    )
+
+    # The Run*ScoreEvaluator classes build a fresh evaluator per pair.
+    factories = {
+        "bleu": lambda: BleuScoreEvaluator(threshold=0.5),
+        "gleu": lambda: GleuScoreEvaluator(threshold=0.5),
+        "meteor": lambda: MeteorScoreEvaluator(threshold=0.5),
+        "rouge": lambda: RougeScoreEvaluator(rouge_type=RougeType.ROUGE_L),
+        "f1": lambda: F1ScoreEvaluator(threshold=0.5),
+    }
+    return [factories[metric] for metric in metrics]
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+def test_benchmark_lexical_metrics():
+    # BLEU, GLEU and METEOR need the NLTK tokenizer and WordNet data.
+    metrics = METRICS if nltk_data_available() else ("rouge", "f1")
+    responses, references = make_texts(0), make_texts(1)
+    factories = single_pair_evaluators(metrics)
+
+    async def score_one_at_a_time():
+        for response, reference in zip(responses, references):
+            for factory in factories:
+                await factory()._do_eval({"response": response, "ground_truth": reference})
+
+    start = time.perf_counter()
+    asyncio.run(score_one_at_a_time())
+    baseline = time.perf_counter() - start
+    print(f"\n{PAIRS} pairs, metrics {metrics}")
+    print(f"{'one pair at a time':<28}{baseline:8.2f} s")
+
+    for num_workers in (1, 2, 4):
+        start = time.perf_counter()
+        score_lexical_metrics(responses, references, metrics=metrics, num_workers=num_workers)
+        elapsed = time.perf_counter() - start
+        label = f"batch engine, {num_workers} workers"
+        print(f"{label:<28}{elapsed:8.2f} s{baseline / elapsed:8.1f}x")
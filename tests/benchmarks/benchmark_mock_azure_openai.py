@@ -0,0 +1,162 @@
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+
+from tests.support.mock_azure_openai import (
+    RAGAS_CHAT_RESPONSES,
+    MockAzureOpenAIServer,
+    lognormal_latency,
+)
+from llm_eval.tools.model_tools import get_client_provider
+
+MEDIAN_LATENCY_MS = 50
+SAMPLES = 64
+CONCURRENCY_LEVELS = (1, 4, 16, 64)
+
+SAMPLE = {
+    "user_input": "What is the capital of France?",
+    "query": "What is the capital of France?",
+    "response": "Paris is the capital of France.",
+    "reference": "Paris is the capital and largest city of France.",
+    "retrieved_contexts": ["Paris is the capital and largest city of France."],
+}
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = MockAzureOpenAIServer(
+        latency=lognormal_latency(MEDIAN_LATENCY_MS, seed=0),
+        chat_responses=RAGAS_CHAT_RESPONSES,
+        default_chat_response="4",
+        embedding_dimensions=256,
+    )
+    with server:
+        yield server
+
+
+@pytest.fixture
+def azure_openai_env(monkeypatch, server):
+    for name, value in {
+        "AZURE_OPENAI_LLM_MODEL": "gpt-mock",
+        "AZURE_OPENAI_LLM_API_KEY": "mock-key",
+        "AZURE_OPENAI_LLM_ENDPOINT": server.url,
+        "AZURE_OPENAI_LLM_API_VERSION": "2024-06-01",
+        "AZURE_OPENAI_EMBEDDING_MODEL": "embedding-mock",
+        "AZURE_OPENAI_EMBEDDING_MODEL_API_KEY": "mock-key",
+        "AZURE_OPENAI_EMBEDDING_MODEL_ENDPONT": server.url,
+        "AZURE_OPENAI_EMBEDDING_MODEL_API_VERSION": "2024-06-01",
+    }.items():
+        monkeypatch.setenv(name, value)
+    get_client_provider().clear()
+    yield
+    get_client_provider().clear()
+
+
+def offline_embeddings():
+    from langchain_openai import AzureOpenAIEmbeddings
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+
+    # Token-length checks would download the tiktoken encoding, so plain text is sent instead.
+    pool = get_client_provider().http_pool
+    return LangchainEmbeddingsWrapper(
+        AzureOpenAIEmbeddings(
+            model="embedding-mock",
+            api_key="mock-key",
+            azure_endpoint=os.environ["AZURE_OPENAI_EMBEDDING_MODEL_ENDPONT"],
+            api_version="2024-06-01",
+            check_embedding_ctx_length=False,
+            http_client=pool.client,
+            http_async_client=pool.async_client,
+        )
+    )
+
+
+def evaluator_factories() -> dict:
+    from llm_eval.evaluators.rag import (
+        RunFaithfulnessEvaluator,
+        RunLLMContextPrecisionWithReferenceEvaluator,
+        RunLLMContextRecallEvaluator,
+        RunResponseRelevancyEvaluator,
+    )
+    from llm_eval.evaluators.similarity import (
+        RunSemanticSimilarityEvaluator,
+        RunSimilarityEvaluator,
+    )
+
+    embeddings = offline_embeddings()
+    return {
+        "Faithfulness": lambda: RunFaithfulnessEvaluator.from_sample(SAMPLE, threshold=0.5),
+        "LLMContextRecall": lambda: RunLLMContextRecallEvaluator.from_sample(
+            SAMPLE, threshold=0.5
+        ),
+        "LLMContextPrecisionWithReference": (
+            lambda: RunLLMContextPrecisionWithReferenceEvaluator.from_sample(
+                SAMPLE, threshold=0.5
+            )
+        ),
+        "ResponseRelevancy": lambda: RunResponseRelevancyEvaluator.from_sample(
+            SAMPLE, threshold=0.5, embeddings=embeddings
+        ),
+        "SemanticSimilarity": lambda: RunSemanticSimilarityEvaluator(
+            response=SAMPLE["response"],
+            reference=SAMPLE["reference"],
+            threshold=0.5,
+            embedding_model=embeddings,
+        ),
+        "Similarity (prompty)": lambda: RunSimilarityEvaluator(
+            query=SAMPLE["query"],
+            response=SAMPLE["response"],
+            reference=SAMPLE["reference"],
+            threshold=3,
+            model_config=None,
+        ),
+    }
+
+
+async def measure(factory, samples: int, concurrency: int) -> dict:
+    """Runs `samples` evaluations with at most `concurrency` in flight and times each one."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run_one():
+        async with semaphore:
+            evaluator = factory()
+            start = time.perf_counter()
+            if asyncio.iscoroutinefunction(evaluator.__call__):
+                await evaluator()
+            else:
+                await asyncio.to_thread(evaluator)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one() for _ in range(samples)))
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "throughput": samples / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+def test_benchmark_evaluators_against_mock_azure_openai(azure_openai_env, server):
+    factories = evaluator_factories()
+
+    print(f"\nMock Azure OpenAI, log-normal latency with a {MEDIAN_LATENCY_MS} ms median")
+    print(f"{'evaluator':<34}{'conc':>6}{'evals/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, factory in factories.items():
+        asyncio.run(measure(factory, 2, 1))  # warm up clients and prompts
+        for concurrency in CONCURRENCY_LEVELS:
+            result = asyncio.run(measure(factory, SAMPLES, concurrency))
+            print(
+                f"{name:<34}{concurrency:>6}{result['throughput']:>10.1f}"
+                f"{result['p50_ms']:>10.0f}{result['p95_ms']:>10.0f}{result['p99_ms']:>10.0f}"
+            )
+    print(f"Requests served: {server.stats}")
+    assert server.stats["errors"] == 0
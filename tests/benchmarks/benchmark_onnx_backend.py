@@ -0,0 +1,40 @@
+import time
+from statistics import median
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import (
+    BiasEvaluator,
+    SentimentEvaluator,
+    ToxicityEvaluator,
+)
+
+RESPONSES = [
+    "I absolutely love this product, it works perfectly!",
+    "The package was delivered on Wednesday afternoon.",
+    "Doctors are men who lead, and nurses are women who assist.",
+    "You're a worthless piece of trash and everyone hates you.",
+] * 16
+
+
+def time_batches(evaluator, repeats: int = 5, batch_size: int = 16) -> float:
+    evaluator.evaluate_batch(RESPONSES[:batch_size], batch_size=batch_size)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        evaluator.evaluate_batch(RESPONSES, batch_size=batch_size)
+        timings.append(time.perf_counter() - start)
+    return median(timings)
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+@pytest.mark.parametrize("evaluator_class", [SentimentEvaluator, BiasEvaluator, ToxicityEvaluator])
+def test_benchmark_onnx_against_pytorch(evaluator_class):
+    pytorch_seconds = time_batches(evaluator_class())
+    onnx_seconds = time_batches(evaluator_class(backend="onnx"))
+
+    print(
+        f"\n{evaluator_class.__name__}: {len(RESPONSES)} responses | "
+        f"pytorch {pytorch_seconds * 1000:.1f} ms | onnx {onnx_seconds * 1000:.1f} ms | "
+        f"speed-up x{pytorch_seconds / onnx_seconds:.2f}"
+    )
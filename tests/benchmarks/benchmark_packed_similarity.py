@@ -0,0 +1,54 @@
+import asyncio
+import json
+import re
+import time
+
+import pytest
+
+from llm_eval.evaluators.similarity import AzureOpenAIModelConfiguration, RunSimilarityEvaluator
+from tests.support.mock_azure_openai import MockAzureOpenAIServer, lognormal_latency
+
+MEDIAN_LATENCY_MS = 300
+TRIPLES = [
+    (f"What is fact number {index}?", f"Fact {index} is true.", f"Fact {index} holds.")
+    for index in range(256)
+]
+
+
+def rate_packed_items(body: dict) -> str:
+    item_ids = re.findall(r"^item (\d+)$", body["messages"][-1]["content"], re.MULTILINE)
+    return json.dumps([{"id": int(item_id), "stars": 4} for item_id in item_ids])
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+def test_benchmark_packed_similarity():
+    server = MockAzureOpenAIServer(
+        latency=lognormal_latency(MEDIAN_LATENCY_MS, seed=0),
+        chat_responses=[("one object per item", rate_packed_items)],
+        default_chat_response="4",
+    )
+    with server:
+        model_config = AzureOpenAIModelConfiguration(
+            azure_endpoint=server.url,
+            api_key="mock-key",
+            azure_deployment="gpt-mock",
+            api_version="2024-06-01",
+        )
+        print(f"\n{len(TRIPLES)} triples, log-normal latency with a {MEDIAN_LATENCY_MS} ms median")
+        print(f"{'mode':<26}{'requests':>10}{'triples/s':>12}")
+        runs = [("one per request", {})] + [
+            (f"packed, {budget} tokens", {"packed": True, "pack_token_budget": budget})
+            for budget in (1500, 4000, 8000)
+        ]
+        for label, options in runs:
+            requests = server.stats["chat"]
+            start = time.perf_counter()
+            asyncio.run(
+                RunSimilarityEvaluator.abatch(
+                    TRIPLES, threshold=3, model_config=model_config, max_concurrency=16, **options
+                )
+            )
+            elapsed = time.perf_counter() - start
+            sent = server.stats["chat"] - requests
+            print(f"{label:<26}{sent:>10}{len(TRIPLES) / elapsed:>12.1f}")
+        assert server.stats["errors"] == 0
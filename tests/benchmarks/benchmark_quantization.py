@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import (
+    BiasEvaluator,
+    SentimentEvaluator,
+    ToxicityEvaluator,
+)
+from llm_eval.tools.pipeline_registry import estimate_pipeline_memory
+
+RESPONSES = [
+    "I absolutely love this product, it works perfectly!",
+    "The package was delivered on Wednesday afternoon.",
+    "Doctors are men who lead, and nurses are women who assist.",
+    "You're a worthless piece of trash and everyone hates you.",
+] * 32
+
+
+def throughput(evaluator, batch_size: int = 16) -> float:
+    evaluator.evaluate_batch(RESPONSES[:batch_size], batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    evaluator.evaluate_batch(RESPONSES, batch_size=batch_size)
+    return len(RESPONSES) / (time.perf_counter() - start)
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+@pytest.mark.parametrize("evaluator_class", [SentimentEvaluator, BiasEvaluator, ToxicityEvaluator])
+def test_benchmark_quantized_against_fp32(evaluator_class):
+    fp32 = evaluator_class()
+    int8 = evaluator_class(quantize=True)
+
+    fp32_rate, int8_rate = throughput(fp32), throughput(int8)
+    fp32_mb = estimate_pipeline_memory(fp32.classifier) / 1024**2
+    int8_mb = estimate_pipeline_memory(int8.classifier) / 1024**2
+
+    print(
+        f"\n{evaluator_class.__name__}: fp32 {fp32_rate:.1f}/s, {fp32_mb:.0f} MB | "
+        f"int8 {int8_rate:.1f}/s, {int8_mb:.0f} MB | x{int8_rate / fp32_rate:.2f} throughput"
+    )
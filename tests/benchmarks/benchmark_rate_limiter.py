@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from llm_eval.tools.rate_limiter import AsyncRateLimitedTransport, RateLimiter
+
+URL = "https://example.test/openai/deployments/gpt-4o/chat/completions"
+QUOTA_PER_SECOND = 20
+LATENCY_S = 0.05
+
+
+class QuotaEndpoint:
+    """A fake Azure OpenAI endpoint allowing QUOTA_PER_SECOND requests per one-second window."""
+
+    def __init__(self):
+        self.window_start = time.monotonic()
+        self.used = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(LATENCY_S)
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1:
+                self.window_start, self.used = now, 0
+            if self.used >= QUOTA_PER_SECOND:
+                self.throttled += 1
+                retry_ms = int((1 - (now - self.window_start)) * 1000)
+                return httpx.Response(429, headers={"retry-after-ms": str(retry_ms)})
+            self.used += 1
+            return httpx.Response(200, json={"choices": []})
+
+
+async def run(limiter: RateLimiter, total: int) -> dict:
+    endpoint = QuotaEndpoint()
+    transport = AsyncRateLimitedTransport(httpx.MockTransport(endpoint), limiter)
+    async with httpx.AsyncClient(transport=transport) as client:
+        start = time.perf_counter()
+        body = {"messages": [{"role": "user", "content": "Rate this."}], "max_tokens": 5}
+        responses = await asyncio.gather(*(client.post(URL, json=body) for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "ok": sum(response.status_code == 200 for response in responses),
+        "throttled": endpoint.throttled,
+        "requests_per_s": total / elapsed,
+    }
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+def test_benchmark_rate_limited_throughput():
+    total = 100
+    # Backoff on 429s alone, against budgets matching the endpoint's quota.
+    unscheduled = asyncio.run(run(RateLimiter(max_retries=20, base_delay=0.1), total))
+    scheduled = asyncio.run(
+        run(RateLimiter(requests_per_minute=QUOTA_PER_SECOND * 60 * 0.9, max_retries=20), total)
+    )
+
+    print(f"\nbackoff only: {unscheduled}")
+    print(f"scheduled:    {scheduled}")
+    assert scheduled["ok"] == total
+    assert scheduled["throttled"] < unscheduled["throttled"]
@@ -0,0 +1,38 @@
+import random
+import time
+
+import pytest
+
+from llm_eval.tools.lexical_metrics import lcs_length
+
+WORDS = ["".join(random.Random(index).choices("abcdefgh", k=5)) for index in range(2000)]
+
+# The vendored scorer's LCS table has len(a) * len(b) cells, too many to build at 10k tokens.
+MAX_TABLE_TOKENS = 3000
+
+
+def make_tokens(seed: int, length: int) -> list:
+    return random.Random(seed).choices(WORDS, k=length)
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+@pytest.mark.parametrize("length", [1_000, 10_000])
+def test_benchmark_rouge_lcs(length):
+    from azure.ai.evaluation._vendor.rouge_score.rouge_scorer import _lcs_table
+
+    response, reference = make_tokens(0, length), make_tokens(1, length)
+
+    start = time.perf_counter()
+    lcs = lcs_length(reference, response)
+    elapsed = time.perf_counter() - start
+    print(f"\n{length} tokens, LCS {lcs}")
+    print(f"{'bit-parallel':<24}{elapsed:10.4f} s")
+
+    if length <= MAX_TABLE_TOKENS:
+        start = time.perf_counter()
+        table = _lcs_table(reference, response)
+        baseline = time.perf_counter() - start
+        assert table[-1][-1] == lcs
+        print(f"{'azure.ai.evaluation':<24}{baseline:10.4f} s{baseline / elapsed:10.1f}x")
+    else:
+        print(f"{'azure.ai.evaluation':<24}{'skipped, table too large':>26}")
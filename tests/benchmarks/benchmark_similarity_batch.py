@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+import pytest
+
+from llm_eval.evaluators.similarity import AzureOpenAIModelConfiguration, RunSimilarityEvaluator
+from tests.support.mock_azure_openai import MockAzureOpenAIServer, lognormal_latency
+
+MEDIAN_LATENCY_MS = 200
+TRIPLES = [
+    (f"What is fact number {index}?", f"Fact {index} is true.", f"Fact {index} holds.")
+    for index in range(128)
+]
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+def test_benchmark_similarity_abatch():
+    server = MockAzureOpenAIServer(
+        latency=lognormal_latency(MEDIAN_LATENCY_MS, seed=0), default_chat_response="4"
+    )
+    with server:
+        model_config = AzureOpenAIModelConfiguration(
+            azure_endpoint=server.url,
+            api_key="mock-key",
+            azure_deployment="gpt-mock",
+            api_version="2024-06-01",
+        )
+        RunSimilarityEvaluator(*TRIPLES[0], threshold=3, model_config=model_config)()
+
+        start = time.perf_counter()
+        for triple in TRIPLES:
+            RunSimilarityEvaluator(*triple, threshold=3, model_config=model_config)()
+        baseline = time.perf_counter() - start
+
+        print(f"\n{len(TRIPLES)} triples, log-normal latency with a {MEDIAN_LATENCY_MS} ms median")
+        print(f"{'one at a time':<24}{len(TRIPLES) / baseline:10.1f} triples/s")
+        for max_concurrency in (4, 16, 64):
+            start = time.perf_counter()
+            asyncio.run(
+                RunSimilarityEvaluator.abatch(
+                    TRIPLES, threshold=3, model_config=model_config, max_concurrency=max_concurrency
+                )
+            )
+            elapsed = time.perf_counter() - start
+            label = f"abatch, {max_concurrency} in flight"
+            print(f"{label:<24}{len(TRIPLES) / elapsed:10.1f} triples/s{baseline / elapsed:8.1f}x")
+        assert server.stats["errors"] == 0
@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Runs in a fresh interpreter so nothing is already imported or loaded.
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from llm_eval.base_evaluators.custom_evaluators import {evaluator}
+imported = time.perf_counter()
+evaluator = {evaluator}()
+evaluator.classifier
+loaded = time.perf_counter()
+evaluator(response="The package was delivered on Wednesday afternoon.")
+scored = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "load_s": loaded - imported,
+    "first_score_s": scored - loaded,
+    "total_s": scored - start,
+}}))
+"""
+
+
+def measure_startup(evaluator: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(evaluator=evaluator)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.skip(reason="benchmark")  # comment out to run
+@pytest.mark.parametrize(
+    "evaluator", ["SentimentEvaluator", "BiasEvaluator", "ToxicityEvaluator"]
+)
+def test_benchmark_warm_start_to_first_score(evaluator):
+    measure_startup(evaluator)  # make sure the model is cached before timing
+    timings = measure_startup(evaluator)
+
+    print(
+        f"\n{evaluator}: import {timings['import_s']:.2f}s, load {timings['load_s']:.2f}s, "
+        f"first score {timings['first_score_s']:.2f}s, total {timings['total_s']:.2f}s"
+    )
@@ -115,3 +115,25 @@ def test_evaluate_sentiment_against_golden_standards():
     )
     assert result["references"] == GOLDEN_STANDARDS
     assert result["sentiment_result"] == "pass"
+
+
+def test_sentiment_batch_matches_single_scores():
+    responses = [
+        "I absolutely love this product, it works perfectly!",
+        "It is fine.",
+        "This is the worst service I have ever received and I want a refund.",
+    ]
+
+    batch_results = RunSentimentEvaluatorAgainstExpectedScore.evaluate_batch(
+        responses, batch_size=2, expected_score=0.0, allowed_uncertainty=1.0
+    )
+    single_results = [
+        RunSentimentEvaluatorAgainstExpectedScore(
+            response=response, expected_score=0.0, allowed_uncertainty=1.0
+        )()
+        for response in responses
+    ]
+
+    assert [result["response"] for result in batch_results] == responses
+    for batch_result, single_result in zip(batch_results, single_results):
+        assert batch_result["sentiment"] == pytest.approx(single_result["sentiment"], abs=1e-4)
@@ -1,7 +1,11 @@
+import asyncio
+import json
+import re
 from typing import Optional
 
 import pytest
 
+import llm_eval.evaluators.similarity as similarity
 from llm_eval.evaluators.similarity import (
     AzureOpenAIModelConfiguration,
     RunBleuScoreEvaluator,
@@ -14,7 +18,19 @@ from llm_eval.evaluators.similarity import (
     RunSemanticSimilarityEvaluator,
     RunSimilarityEvaluator,
     RunStringPresenceEvaluator,
+    report_packed_similarity_calibration,
 )
+from llm_eval.tools.completion_cache import disable_completion_cache, enable_completion_cache
+from tests.support.mock_azure_openai import MockAzureOpenAIServer, fixed_latency
+
+
+def mock_model_config(server: MockAzureOpenAIServer) -> AzureOpenAIModelConfiguration:
+    return AzureOpenAIModelConfiguration(
+        azure_endpoint=server.url,
+        api_key="mock-key",
+        azure_deployment="gpt-mock",
+        api_version="2024-06-01",
+    )
 
 
 @pytest.mark.parametrize(
@@ -376,3 +392,126 @@ async def test_run_exact_match_fails(
 ):
     with pytest.raises(AssertionError):
         await RunExactMatchEvaluator(response, reference).assert_result()
+
+
+def test_run_similarity_evaluator_reuses_the_loaded_judge(monkeypatch):
+    monkeypatch.setattr(similarity, "_SIMILARITY_EVALUATORS", {})
+    with MockAzureOpenAIServer(default_chat_response="4") as server:
+        model_config = mock_model_config(server)
+        results = [
+            RunSimilarityEvaluator("q", f"response {index}", "reference", 3, model_config)()
+            for index in range(3)
+        ]
+
+    assert [result["similarity"] for result in results] == [4.0, 4.0, 4.0]
+    assert results[0]["similarity_result"] == "pass"
+    assert len(similarity._SIMILARITY_EVALUATORS) == 1
+
+
+def test_run_similarity_evaluator_abatch_overlaps_requests():
+    triples = [(f"query {index}", f"response {index}", "reference") for index in range(16)]
+    with MockAzureOpenAIServer(default_chat_response="2", latency=fixed_latency(200)) as server:
+        results = asyncio.run(
+            RunSimilarityEvaluator.abatch(
+                triples, threshold=3, model_config=mock_model_config(server), max_concurrency=16
+            )
+        )
+
+    assert [result["query"] for result in results] == [query for query, _, _ in triples]
+    assert all(result["similarity_result"] == "fail" for result in results)
+    assert server.stats["chat"] == 16
+    assert server.stats["peak_concurrency"] >= 16 / 2
+
+
+def test_run_similarity_evaluator_abatch_reports_errors_per_sample():
+    with MockAzureOpenAIServer(error_rate=1.0, error_status=400) as server:
+        results = asyncio.run(
+            RunSimilarityEvaluator.abatch(
+                [{"query": "q", "response": "r", "reference": "g"}],
+                threshold=3,
+                model_config=mock_model_config(server),
+            )
+        )
+
+    assert results[0]["similarity_result"] == "error"
+    assert results[0]["similarity"] is None
+    assert results[0]["similarity_error"]
+
+
+def rate_packed_items(body: dict) -> str:
+    """Answers a packed similarity request with 5 stars for "Paris" answers and 2 otherwise."""
+    content = body["messages"][-1]["content"]
+    items = re.findall(
+        r"^item (\d+)\nquestion: .*\ncorrect answer: .*\npredicted answer: (.*)$",
+        content,
+        re.MULTILINE,
+    )
+    return json.dumps(
+        [{"id": int(item_id), "stars": 5 if "Paris" in answer else 2} for item_id, answer in items]
+    )
+
+
+PACKED_TRIPLES = [
+    ("What is the capital of France?", "Paris.", "Paris is the capital of France."),
+    ("What is the capital of Spain?", "Lisbon.", "Madrid is the capital of Spain."),
+    ("Where is the Louvre?", "In Paris.", "The Louvre is in Paris."),
+]
+
+
+def test_run_similarity_evaluator_abatch_packed_sends_one_request():
+    with MockAzureOpenAIServer(
+        chat_responses=[("one object per item", rate_packed_items)]
+    ) as server:
+        results = asyncio.run(
+            RunSimilarityEvaluator.abatch(
+                PACKED_TRIPLES, threshold=3, model_config=mock_model_config(server), packed=True
+            )
+        )
+
+    assert [result["similarity"] for result in results] == [5.0, 2.0, 5.0]
+    assert [result["similarity_result"] for result in results] == ["pass", "fail", "pass"]
+    assert results[1]["gpt_similarity"] == 2.0
+    assert results[1]["reference"] == "Madrid is the capital of Spain."
+    assert server.stats["chat"] == 1
+
+
+def test_packed_similarity_calibration_report():
+    with MockAzureOpenAIServer(
+        chat_responses=[("one object per item", rate_packed_items)], default_chat_response="5"
+    ) as server:
+        report = asyncio.run(
+            report_packed_similarity_calibration(
+                PACKED_TRIPLES, threshold=3, model_config=mock_model_config(server)
+            )
+        )
+
+    assert report["requests"] == {"unpacked": 3, "packed": 1}
+    assert report["compared"] == 3
+    assert report["exact_agreement"] == pytest.approx(2 / 3)
+    assert report["within_one"] == pytest.approx(2 / 3)
+    assert report["verdict_agreement"] == pytest.approx(2 / 3)
+    assert report["max_abs_difference"] == 3.0
+    assert report["scores"][1]["difference"] == -3.0
+    assert report["errors"] == {"unpacked": 0, "packed": 0}
+
+
+def test_packed_similarity_calibration_report_counts_only_model_requests(tmp_path):
+    enable_completion_cache(directory=str(tmp_path))
+    try:
+        with MockAzureOpenAIServer(
+            chat_responses=[("one object per item", rate_packed_items)], default_chat_response="5"
+        ) as server:
+            reports = [
+                asyncio.run(
+                    report_packed_similarity_calibration(
+                        PACKED_TRIPLES, threshold=3, model_config=mock_model_config(server)
+                    )
+                )
+                for _ in range(2)
+            ]
+    finally:
+        disable_completion_cache()
+
+    assert reports[0]["requests"] == {"unpacked": 3, "packed": 1}
+    assert reports[1]["requests"] == {"unpacked": 0, "packed": 0}
+    assert server.stats["chat"] == 4
@@ -139,3 +139,25 @@ def test_evaluate_toxicity_against_biased_golden_standards():
     )
     assert result["references"] == GOLDEN_STANDARDS_TOXIC
     assert result["toxicity_result"] == "pass"
+
+
+def test_toxicity_batch_matches_single_scores():
+    responses = [
+        "I absolutely love this product, it works perfectly!",
+        "It is fine.",
+        "This is the worst service I have ever received and I want a refund.",
+    ]
+
+    batch_results = RunToxicityEvaluatorAgainstExpectedScore.evaluate_batch(
+        responses, batch_size=2, expected_score=0.0, allowed_uncertainty=1.0
+    )
+    single_results = [
+        RunToxicityEvaluatorAgainstExpectedScore(
+            response=response, expected_score=0.0, allowed_uncertainty=1.0
+        )()
+        for response in responses
+    ]
+
+    assert [result["response"] for result in batch_results] == responses
+    for batch_result, single_result in zip(batch_results, single_results):
+        assert batch_result["toxicity"] == pytest.approx(single_result["toxicity"], abs=1e-4)
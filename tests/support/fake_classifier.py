@@ -0,0 +1,64 @@
+import re
+from contextlib import contextmanager
+from typing import Iterator, List
+from unittest.mock import patch
+
+
+class FakeTokenizer:
+    """Splits on whitespace and mimics the overflowing-token windows of fast tokenizers."""
+
+    model_max_length = 6
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(
+        self, texts, max_length=None, stride=0, return_overflowing_tokens=False, **kwargs
+    ):
+        if not return_overflowing_tokens:
+            return {"input_ids": [text.split() for text in texts]}
+
+        self.calls.append(texts)
+        offsets = [match.span() for match in re.finditer(r"\S+", texts)]
+        size = max_length - 2
+        windows = [
+            offsets[start : start + size]
+            for start in range(0, max(len(offsets) - stride, 1), size - stride)
+        ]
+        return {
+            "input_ids": [[0] * (len(window) + 2) for window in windows],
+            "offset_mapping": [[(0, 0)] + window + [(0, 0)] for window in windows],
+        }
+
+
+class FakeClassifier:
+    """Scores a text by its word count so results can be traced back to inputs."""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.tokenizer = FakeTokenizer()
+        self.batches = []
+
+    def _classify(self, text):
+        score = min(len(text.split()) / 10, 1.0)
+        return [
+            {"label": self.labels[0], "score": 1 - score},
+            {"label": self.labels[1], "score": score},
+        ]
+
+    def __call__(self, inputs, batch_size=None, **kwargs):
+        if isinstance(inputs, str):
+            return [self._classify(inputs)]
+        for start in range(0, len(inputs), batch_size or 1):
+            self.batches.append(inputs[start : start + (batch_size or 1)])
+        return [self._classify(text) for text in inputs]
+
+
+@contextmanager
+def patched_classifier(evaluator_class: type, labels: List[str]) -> Iterator[FakeClassifier]:
+    """Makes every `evaluator_class` instance score with one shared `FakeClassifier`."""
+    classifier = FakeClassifier(labels)
+    with patch.object(
+        evaluator_class, "classifier", new_callable=lambda: property(lambda self: classifier)
+    ):
+        yield classifier
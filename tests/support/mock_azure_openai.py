@@ -0,0 +1,322 @@
+import base64
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ChatResponse = Union[str, Callable[[dict], str]]
+
+DEFAULT_CHAT_RESPONSE = "This is a mock response."
+
+# Parseable answers to the ragas judge prompts, matched on the output schema each prompt embeds.
+RAGAS_CHAT_RESPONSES = (
+    (
+        r"title\W+StatementGeneratorOutput\b",
+        json.dumps({"statements": ["The answer is supported by the context."]}),
+    ),
+    (
+        r"title\W+NLIStatementOutput\b",
+        json.dumps(
+            {
+                "statements": [
+                    {
+                        "statement": "The answer is supported by the context.",
+                        "reason": "The context states it.",
+                        "verdict": 1,
+                    }
+                ]
+            }
+        ),
+    ),
+    (
+        r"title\W+ResponseRelevanceOutput\b",
+        json.dumps({"question": "What does the context say?", "noncommittal": 0}),
+    ),
+    (
+        r"title\W+ContextRecallClassifications\b",
+        json.dumps(
+            {
+                "classifications": [
+                    {
+                        "statement": "The answer is supported by the context.",
+                        "reason": "The context states it.",
+                        "attributed": 1,
+                    }
+                ]
+            }
+        ),
+    ),
+    (
+        r"title\W+Verification\b",
+        json.dumps({"reason": "The context was useful.", "verdict": 1}),
+    ),
+)
+
+
+def fixed_latency(ms: float) -> Callable[[], float]:
+    """Returns a latency model answering every request after `ms` milliseconds."""
+    return lambda: ms / 1000
+
+
+def uniform_latency(low_ms: float, high_ms: float, seed: int = None) -> Callable[[], float]:
+    """Returns a latency model drawing each delay uniformly between `low_ms` and `high_ms`."""
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low_ms, high_ms) / 1000
+
+
+def lognormal_latency(
+    median_ms: float, sigma: float = 0.5, seed: int = None
+) -> Callable[[], float]:
+    """
+    Returns a latency model drawing log-normally distributed delays around `median_ms`.
+
+    LLM endpoints have a long right tail, which a log-normal distribution approximates well:
+    with the default `sigma` of 0.5, p95 is about 2.3 times and p99 about 3.2 times the median.
+    """
+    rng = random.Random(seed)
+    return lambda: rng.lognormvariate(np.log(median_ms / 1000), sigma)
+
+
+def mock_embedding(text, dimensions: int) -> np.ndarray:
+    """Returns a deterministic unit vector for a text (or token list), equal for equal inputs."""
+    seed = hashlib.sha256(json.dumps(text).encode("utf-8")).digest()
+    vector = np.random.default_rng(int.from_bytes(seed[:8], "little")).standard_normal(dimensions)
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 refuses connections when many requests are sent at once.
+    request_queue_size = 256
+
+
+class MockAzureOpenAIServer:
+    """
+    A local stand-in for an Azure OpenAI deployment, for benchmarks and offline tests.
+
+    Serves the chat-completions and embeddings API shapes on any deployment path (e.g.
+    `/openai/deployments/{name}/chat/completions`), so the openai, LangChain, ragas and
+    azure.ai.evaluation clients can be pointed at it through their endpoint setting. Requests are
+    handled concurrently on a thread per connection.
+
+    Chat responses are chosen by the first of `chat_responses` whose regular expression matches
+    the request's messages, or `default_chat_response` otherwise. A response is either a fixed
+    string, or a function of the request body (a template). Embeddings are deterministic unit
+    vectors derived from each input, so equal texts have a cosine similarity of 1.
+
+    `stats` counts the chat, embedding and error responses, and records in `peak_concurrency` the
+    largest number of requests the server was handling at once.
+
+    Args:
+        latency (Callable[[], float], optional): Returns the delay in seconds before each response,
+            e.g. `lognormal_latency(300)`. Defaults to no delay.
+        error_rate (float, optional): Fraction of requests answered with `error_status`.
+            Defaults to 0.
+        error_status (int, optional): Status code of injected errors. 429 responses carry a
+            `retry-after-ms` header. Defaults to 429.
+        chat_responses (Sequence[Tuple[str, ChatResponse]], optional): (pattern, response) rules.
+            `RAGAS_CHAT_RESPONSES` answers the prompts of the ragas LLM metrics.
+        default_chat_response (ChatResponse, optional): Response when no rule matches. Defaults
+            to a fixed sentence; use e.g. "4" for the azure.ai.evaluation similarity judge.
+        embedding_dimensions (int, optional): Length of the embedding vectors. Defaults to 1536.
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 0, a free port.
+        seed (int, optional): Seed of the error injection.
+
+    Example:
+        with MockAzureOpenAIServer(latency=lognormal_latency(300), error_rate=0.02) as server:
+            os.environ["AZURE_OPENAI_LLM_ENDPOINT"] = server.url
+            ...
+            print(server.stats)
+    """
+
+    def __init__(
+        self,
+        latency: Callable[[], float] = None,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        chat_responses: Sequence[Tuple[str, ChatResponse]] = (),
+        default_chat_response: ChatResponse = DEFAULT_CHAT_RESPONSE,
+        embedding_dimensions: int = 1536,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = None,
+    ):
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0 and 1. Got {error_rate}.")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chat_responses = [
+            (re.compile(pattern), response) for pattern, response in chat_responses
+        ]
+        self.default_chat_response = default_chat_response
+        self.embedding_dimensions = embedding_dimensions
+        self.stats = {"chat": 0, "embeddings": 0, "errors": 0, "peak_concurrency": 0}
+        self._active = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _MockHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockAzureOpenAIServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="mock-azure-openai",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockAzureOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _track_active(self, change: int):
+        with self._lock:
+            self._active += change
+            self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self._active)
+
+    def _inject_error(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def chat_completion(self, body: dict) -> dict:
+        """Builds the chat-completions response for a request body."""
+        messages = json.dumps(body.get("messages", []), ensure_ascii=False)
+        response = self.default_chat_response
+        for pattern, candidate in self.chat_responses:
+            if pattern.search(messages):
+                response = candidate
+                break
+        content = response(body) if callable(response) else response
+
+        prompt_tokens = len(messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-mock-{time.monotonic_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": index,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+                for index in range(body.get("n") or 1)
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def embeddings(self, body: dict) -> dict:
+        """Builds the embeddings response for a request body, honouring `encoding_format`."""
+        inputs = body.get("input", [])
+        # A single string, or a single list of token ids, is one input.
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = body.get("dimensions") or self.embedding_dimensions
+
+        data = []
+        for index, text in enumerate(inputs):
+            vector = mock_embedding(text, dimensions)
+            embedding = (
+                base64.b64encode(vector.tobytes()).decode("ascii")
+                if body.get("encoding_format") == "base64"
+                else vector.tolist()
+            )
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        tokens = sum(len(json.dumps(text)) // 4 for text in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "mock"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                server._track_active(1)
+                try:
+                    self._handle()
+                finally:
+                    server._track_active(-1)
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?", 1)[0]
+
+                if server.latency is not None:
+                    time.sleep(server.latency())
+
+                if path.endswith("/chat/completions"):
+                    kind, build = "chat", server.chat_completion
+                elif path.endswith("/embeddings"):
+                    kind, build = "embeddings", server.embeddings
+                else:
+                    return self._send(404, {"error": {"code": "NotFound", "message": path}})
+
+                server._count(kind)
+                if server._inject_error():
+                    server._count("errors")
+                    headers = {"retry-after-ms": "10"} if server.error_status == 429 else {}
+                    return self._send(
+                        server.error_status,
+                        {"error": {"code": str(server.error_status), "message": "Injected error"}},
+                        headers,
+                    )
+                self._send(200, build(body))
+
+            def _send(self, status: int, payload: dict, headers: dict = None):
+                content = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
@@ -0,0 +1,114 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import numpy as np
+import pytest
+from openai import AzureOpenAI
+
+from tests.support.mock_azure_openai import (
+    RAGAS_CHAT_RESPONSES,
+    MockAzureOpenAIServer,
+    fixed_latency,
+    lognormal_latency,
+)
+
+API_VERSION = "2024-06-01"
+
+
+def azure_client(server: MockAzureOpenAIServer) -> AzureOpenAI:
+    return AzureOpenAI(
+        azure_endpoint=server.url, api_key="test-key", api_version=API_VERSION, max_retries=0
+    )
+
+
+def test_chat_completions_match_rules_and_templates():
+    rules = [
+        ("capital", "Paris"),
+        ("echo", lambda body: body["messages"][-1]["content"].upper()),
+    ]
+    with MockAzureOpenAIServer(chat_responses=rules) as server:
+        client = azure_client(server)
+
+        def ask(content: str, n: int = 1):
+            return client.chat.completions.create(
+                model="gpt-mock", messages=[{"role": "user", "content": content}], n=n
+            )
+
+        assert ask("What is the capital of France?").choices[0].message.content == "Paris"
+        assert ask("echo this").choices[0].message.content == "ECHO THIS"
+        assert [choice.message.content for choice in ask("Hello", n=2).choices] == [
+            "This is a mock response.",
+            "This is a mock response.",
+        ]
+        assert server.stats["chat"] == 3
+
+
+def test_embeddings_are_deterministic_unit_vectors():
+    with MockAzureOpenAIServer(embedding_dimensions=16) as server:
+        response = azure_client(server).embeddings.create(
+            model="embedding-mock", input=["a cat", "a dog", "a cat"]
+        )
+
+    vectors = [np.array(item.embedding) for item in response.data]
+    assert [len(vector) for vector in vectors] == [16, 16, 16]
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0, abs=1e-5)
+    assert np.allclose(vectors[0], vectors[2])
+    assert not np.allclose(vectors[0], vectors[1])
+
+
+def test_ragas_responses_match_their_prompt_schemas():
+    with MockAzureOpenAIServer(chat_responses=RAGAS_CHAT_RESPONSES) as server:
+        client = azure_client(server)
+        prompt = json.dumps({"title": "ResponseRelevanceOutput", "type": "object"})
+        content = client.chat.completions.create(
+            model="gpt-mock", messages=[{"role": "user", "content": prompt}]
+        ).choices[0].message.content
+
+    assert set(json.loads(content)) == {"question", "noncommittal"}
+
+
+def test_injected_errors_are_rate_limits_with_retry_after():
+    with MockAzureOpenAIServer(error_rate=1.0) as server:
+        response = httpx.post(
+            f"{server.url}/openai/deployments/gpt-mock/chat/completions",
+            json={"messages": []},
+        )
+
+    assert response.status_code == 429
+    assert response.headers["retry-after-ms"] == "10"
+    assert server.stats["errors"] == 1
+
+
+def test_latency_is_applied():
+    with MockAzureOpenAIServer(latency=fixed_latency(100)) as server:
+        start = time.perf_counter()
+        httpx.post(f"{server.url}/openai/deployments/gpt-mock/embeddings", json={"input": "a"})
+
+    assert time.perf_counter() - start >= 0.1
+
+
+def test_peak_concurrency_counts_overlapping_requests():
+    with MockAzureOpenAIServer(latency=fixed_latency(200)) as server:
+        url = f"{server.url}/openai/deployments/gpt-mock/embeddings"
+        httpx.post(url, json={"input": "a"})
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: httpx.post(url, json={"input": "a"}), range(4)))
+
+    assert server.stats["embeddings"] == 5
+    assert server.stats["peak_concurrency"] == 4
+
+
+def test_lognormal_latency_is_centred_on_the_median():
+    latency = lognormal_latency(200, seed=0)
+
+    assert np.median([latency() for _ in range(2000)]) == pytest.approx(0.2, rel=0.05)
+
+
+def test_unknown_paths_and_invalid_error_rates():
+    with MockAzureOpenAIServer() as server:
+        assert httpx.post(f"{server.url}/openai/models", json={}).status_code == 404
+
+    with pytest.raises(ValueError):
+        MockAzureOpenAIServer(error_rate=2)
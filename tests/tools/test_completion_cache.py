@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from llm_eval.evaluators.similarity import RunSimilarityEvaluator
+from llm_eval.tools.completion_cache import (
+    CompletionCache,
+    disable_completion_cache,
+    enable_completion_cache,
+    get_completion_cache,
+)
+from llm_eval.tools.model_tools import get_azure_openai_llm, get_client_provider
+
+
+@pytest.fixture
+def completion_cache(tmp_path):
+    cache = enable_completion_cache(directory=str(tmp_path))
+    yield cache
+    disable_completion_cache()
+
+
+def test_lookup_matches_prompt_and_model_configuration(tmp_path):
+    cache = CompletionCache(directory=str(tmp_path))
+    cache.update("Is the sky blue?", "gpt-4o,temperature=0", ["Yes"])
+
+    assert cache.lookup("Is the sky blue?", "gpt-4o,temperature=0") == ["Yes"]
+    assert cache.lookup("Is the sky blue?", "gpt-4o,temperature=0.3") is None
+    assert cache.lookup("Is grass green?", "gpt-4o,temperature=0") is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+
+
+def test_completions_persist_across_runs(tmp_path):
+    responses = ["Yes", "No"]
+    first_run = CompletionCache(directory=str(tmp_path))
+    model = FakeListChatModel(responses=responses, cache=first_run.langchain_cache)
+    assert model.invoke("Is the sky blue?").content == "Yes"
+
+    second_run = CompletionCache(directory=str(tmp_path))
+    model = FakeListChatModel(responses=responses, cache=second_run.langchain_cache)
+
+    assert model.invoke("Is the sky blue?").content == "Yes"
+    assert second_run.stats["hits"] == 1
+    # The cached prompt never reached the model, so this is its first response.
+    assert model.invoke("Is grass green?").content == "Yes"
+    assert second_run.stats["misses"] == 1
+
+
+def test_azure_openai_llm_uses_the_cache_when_enabled(monkeypatch, completion_cache):
+    for name, value in {
+        "AZURE_OPENAI_LLM_MODEL": "gpt-test",
+        "AZURE_OPENAI_LLM_API_KEY": "test-key",
+        "AZURE_OPENAI_LLM_ENDPOINT": "https://example.openai.azure.com",
+        "AZURE_OPENAI_LLM_API_VERSION": "2024-06-01",
+    }.items():
+        monkeypatch.setenv(name, value)
+    get_client_provider().clear()
+
+    cached_llm = get_azure_openai_llm()
+    disable_completion_cache()
+    uncached_llm = get_azure_openai_llm()
+    get_client_provider().clear()
+
+    assert cached_llm.cache is completion_cache.langchain_cache
+    assert uncached_llm.cache is None
+
+
+def test_similarity_judge_is_answered_from_the_cache(completion_cache):
+    model_config = {
+        "azure_endpoint": "https://example.openai.azure.com",
+        "api_key": "test-key",
+        "azure_deployment": "gpt-test",
+        "api_version": "2024-06-01",
+    }
+    judged = {"similarity": 4.0, "similarity_result": "pass", "similarity_threshold": 3}
+
+    with patch("azure.ai.evaluation.SimilarityEvaluator") as evaluator_class:
+        evaluator_class.return_value.return_value = dict(judged)
+        for threshold in (3, 5):
+            result = RunSimilarityEvaluator(
+                query="What colour is the sky?",
+                response="Blue.",
+                reference="The sky is blue.",
+                threshold=threshold,
+                model_config=model_config,
+            )()
+
+    assert evaluator_class.return_value.call_count == 1
+    assert result["similarity_result"] == "fail"
+    assert result["similarity_threshold"] == 5
+    assert get_completion_cache() is completion_cache
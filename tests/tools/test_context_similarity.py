@@ -0,0 +1,106 @@
+import asyncio
+import random
+
+import pytest
+from ragas.dataset_schema import SingleTurnSample
+from ragas.metrics import DistanceMeasure, NonLLMStringSimilarity
+from ragas.metrics import NonLLMContextPrecisionWithReference as RagasContextPrecision
+from ragas.metrics import NonLLMContextRecall as RagasContextRecall
+
+from llm_eval.evaluators import rag
+from llm_eval.evaluators.rag import (
+    RunNonLLMContextPrecisionWithReferenceEvaluator,
+    RunNonLLMContextRecallEvaluator,
+)
+from llm_eval.tools.context_similarity import (
+    NonLLMContextPrecisionWithReference,
+    NonLLMContextRecall,
+    average_precision,
+    similarity_matrix,
+)
+
+
+def random_contexts(rng: random.Random, count: int):
+    words = ["".join(rng.choices("abcde", k=rng.randint(1, 4))) for _ in range(12)]
+    return [" ".join(rng.choices(words, k=rng.randint(1, 8))) for _ in range(count)]
+
+
+def samples(seed: int = 0, count: int = 40):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield SingleTurnSample(
+            retrieved_contexts=random_contexts(rng, rng.randint(1, 8)),
+            reference_contexts=random_contexts(rng, rng.randint(1, 8)),
+        )
+
+
+def score(metric, sample) -> float:
+    return asyncio.run(metric.single_turn_ascore(sample))
+
+
+@pytest.mark.parametrize("measure", list(DistanceMeasure))
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.75])
+def test_precision_matches_ragas(measure, threshold):
+    ours = NonLLMContextPrecisionWithReference(
+        distance_measure=NonLLMStringSimilarity(distance_measure=measure), threshold=threshold
+    )
+    ragas = RagasContextPrecision(
+        distance_measure=NonLLMStringSimilarity(distance_measure=measure), threshold=threshold
+    )
+
+    for sample in samples():
+        assert score(ours, sample) == score(ragas, sample)
+
+
+@pytest.mark.parametrize("measure", list(DistanceMeasure))
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.75])
+def test_recall_matches_ragas(measure, threshold):
+    ours = NonLLMContextRecall(threshold=threshold)
+    ours.distance_measure = measure
+    ragas = RagasContextRecall(threshold=threshold)
+    ragas.distance_measure = measure
+
+    for sample in samples(seed=1):
+        assert score(ours, sample) == score(ragas, sample)
+
+
+def test_thresholds_apply_at_the_boundary():
+    # "abcd" vs "abce" has a Levenshtein similarity of exactly 0.75.
+    sample = SingleTurnSample(retrieved_contexts=["abcd"], reference_contexts=["abce"])
+
+    assert score(NonLLMContextPrecisionWithReference(threshold=0.75), sample) == pytest.approx(1)
+    assert score(NonLLMContextRecall(threshold=0.75), sample) == 0.0
+
+
+def test_similarity_matrix_is_retrieved_by_reference():
+    matrix = similarity_matrix(["abc", "xyz", "abd"], ["abc", "xyz"], score_cutoff=0.5)
+
+    assert matrix.shape == (3, 2)
+    assert matrix[0, 0] == 1.0
+    assert matrix[0, 1] == 0.0
+    assert matrix[2, 0] == pytest.approx(2 / 3)
+
+
+def test_average_precision():
+    assert average_precision([1, 0, 1]) == pytest.approx((1 + 2 / 3) / 2)
+    assert average_precision([]) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_evaluators_use_the_matrix_metrics_with_unchanged_keys():
+    contexts = {
+        "retrieved_contexts": ["Paris is the capital of France."],
+        "reference_contexts": ["Paris is the capital of France."],
+    }
+    precision = RunNonLLMContextPrecisionWithReferenceEvaluator(**contexts, threshold=0.5)
+    recall = RunNonLLMContextRecallEvaluator(**contexts, threshold=0.5)
+
+    assert precision.ragas_metric is NonLLMContextPrecisionWithReference
+    assert recall.ragas_metric is NonLLMContextRecall
+    assert (await precision())["non_llmcontext_precision_with_reference_result"] == "pass"
+    assert (await recall())["non_llmcontext_recall"] == 1.0
+
+
+def test_rag_module_exposes_the_metrics_its_evaluators_run():
+    assert rag.NonLLMContextPrecisionWithReference is NonLLMContextPrecisionWithReference
+    assert rag.NonLLMContextRecall is NonLLMContextRecall
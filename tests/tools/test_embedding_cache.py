@@ -0,0 +1,137 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from openai import RateLimitError
+from ragas.run_config import RunConfig
+
+from llm_eval.tools.embedding_cache import (
+    CachedEmbeddings,
+    CachedEmbeddingsWrapper,
+    EmbeddingStore,
+    disable_embedding_cache,
+    enable_embedding_cache,
+)
+from llm_eval.tools.model_tools import (
+    get_client_provider,
+    get_ragas_wrapped_azure_open_ai_embedding_model,
+)
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeds a text as [length, number of spaces, 1] and records every request."""
+
+    def __init__(self):
+        self.requests = []
+
+    def embed_documents(self, texts):
+        self.requests.append(list(texts))
+        return [[float(len(text)), float(text.count(" ")), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_misses_are_deduplicated_into_one_request(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, EmbeddingStore(str(tmp_path)))
+
+    first = embeddings.embed_documents(["a cat", "a dog", "a cat"])
+    second = embeddings.embed_documents(["a dog", "the bird"])
+
+    assert model.requests == [["a cat", "a dog"], ["the bird"]]
+    assert first == [[5.0, 1.0, 1.0], [5.0, 1.0, 1.0], [5.0, 1.0, 1.0]]
+    assert second == [[5.0, 1.0, 1.0], [8.0, 1.0, 1.0]]
+    assert embeddings.stats["hits"] == 1
+
+
+def test_stats_count_every_lookup_across_threads(tmp_path):
+    embeddings = CachedEmbeddings(CountingEmbeddings(), EmbeddingStore(str(tmp_path)))
+    embeddings.embed_query("a cat")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: embeddings.embed_query("a cat"), range(400)))
+
+    assert embeddings.stats["hits"] == 400
+    assert embeddings.stats["misses"] == 1
+
+
+def test_vectors_are_reused_by_a_new_store(tmp_path):
+    CachedEmbeddings(CountingEmbeddings(), EmbeddingStore(str(tmp_path))).embed_query("a cat")
+
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, EmbeddingStore(str(tmp_path)))
+
+    assert embeddings.embed_query("a cat") == [5.0, 1.0, 1.0]
+    assert model.requests == []
+
+
+def test_reader_sees_rows_appended_by_another_store(tmp_path):
+    reader = EmbeddingStore(str(tmp_path))
+    writer = EmbeddingStore(str(tmp_path))
+    writer.put_many(["one"], [[1.0, 2.0]])
+    assert reader.get_many(["one"]) == [[1.0, 2.0]]
+
+    writer.put_many(["two", "three"], [[3.0, 4.0], [5.0, 6.0]])
+
+    assert reader.get_many(["three", "missing", "one"]) == [[5.0, 6.0], None, [1.0, 2.0]]
+    assert len(reader) == 3
+
+
+def test_float16_store_halves_the_vector_file(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dtype="float16")
+    store.put_many(["a"], [[0.1, 0.2, 0.3, 0.4]])
+
+    assert store.get_many(["a"])[0] == pytest.approx([0.1, 0.2, 0.3, 0.4], abs=1e-3)
+    assert (tmp_path / "vectors.float16").stat().st_size == 4 * 2
+
+
+def test_store_rejects_vectors_of_another_size(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many(["a"], [[1.0, 2.0]])
+
+    with pytest.raises(ValueError):
+        store.put_many(["b"], [[1.0, 2.0, 3.0]])
+    assert store.get_many(["b"]) == [None]
+
+
+def test_invalid_dtype_raises(tmp_path):
+    with pytest.raises(ValueError):
+        EmbeddingStore(str(tmp_path), dtype="int8")
+
+
+@pytest.mark.asyncio
+async def test_async_embeddings_use_the_cache(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, EmbeddingStore(str(tmp_path)))
+
+    assert await embeddings.aembed_query("a cat") == [5.0, 1.0, 1.0]
+    assert await embeddings.aembed_documents(["a cat"]) == [[5.0, 1.0, 1.0]]
+    assert model.requests == [["a cat"]]
+
+
+def test_ragas_embedding_model_is_cached_when_enabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_EVAL_CACHE_DIR", str(tmp_path))
+    for name, value in {
+        "AZURE_OPENAI_EMBEDDING_MODEL": "embedding-test",
+        "AZURE_OPENAI_EMBEDDING_MODEL_API_KEY": "test-key",
+        "AZURE_OPENAI_EMBEDDING_MODEL_ENDPONT": "https://example.openai.azure.com",
+        "AZURE_OPENAI_EMBEDDING_MODEL_API_VERSION": "2024-06-01",
+    }.items():
+        monkeypatch.setenv(name, value)
+    get_client_provider().clear()
+
+    enable_embedding_cache()
+    try:
+        wrapper = get_ragas_wrapped_azure_open_ai_embedding_model()
+    finally:
+        disable_embedding_cache()
+        get_client_provider().clear()
+
+    assert isinstance(wrapper.embeddings, CachedEmbeddings)
+    assert wrapper.embeddings.model == "embedding-test"
+
+    wrapper.set_run_config(RunConfig(timeout=42))
+
+    assert wrapper.embeddings.embeddings.request_timeout == 42
+    assert wrapper.run_config.exception_types is RateLimitError
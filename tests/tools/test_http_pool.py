@@ -0,0 +1,77 @@
+import asyncio
+import gc
+
+import httpx
+
+from llm_eval.tools.http_pool import HTTPPool
+
+
+def ok_transport():
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+
+
+def test_pool_limits_and_timeout_are_configurable():
+    pool = HTTPPool(max_connections=7, max_keepalive_connections=3, timeout=12)
+
+    assert pool.limits.max_connections == 7
+    assert pool.limits.max_keepalive_connections == 3
+    assert pool.timeout.read == 12
+
+
+def test_clients_are_shared():
+    pool = HTTPPool(transport_factory=ok_transport)
+
+    assert pool.client is pool.client
+    assert pool.async_client is pool.async_client
+    assert pool.client.get("https://example.test/").json() == {"ok": True}
+
+
+def test_async_client_keeps_one_transport_per_event_loop():
+    created = []
+
+    def factory():
+        created.append(ok_transport())
+        return created[-1]
+
+    pool = HTTPPool(async_transport_factory=factory)
+
+    async def fetch_twice():
+        for _ in range(2):
+            response = await pool.async_client.get("https://example.test/")
+            assert response.status_code == 200
+
+    # Explicit loops, as nest_asyncio (applied by ragas) makes asyncio.run reuse one loop.
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(fetch_twice())
+        finally:
+            loop.close()
+
+    assert len(created) == 2
+
+
+def test_close_rebuilds_the_sync_client():
+    pool = HTTPPool(transport_factory=ok_transport)
+    client = pool.client
+
+    pool.close()
+
+    assert client.is_closed
+    assert pool.client is not client
+
+
+def test_sync_connections_close_when_a_dropped_pool_is_collected():
+    closed = []
+
+    class TrackingTransport(httpx.MockTransport):
+        def close(self):
+            closed.append(True)
+
+    pool = HTTPPool(transport_factory=lambda: TrackingTransport(lambda request: httpx.Response(200)))
+    assert pool.client.get("https://example.test/").status_code == 200
+
+    del pool
+    gc.collect()
+
+    assert closed == [True]
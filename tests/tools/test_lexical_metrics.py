@@ -0,0 +1,167 @@
+import asyncio
+import random
+
+import pytest
+from nltk.translate.bleu_score import SmoothingFunction, sentence_bleu
+from nltk.translate.bleu_score import corpus_bleu as nltk_corpus_bleu
+from nltk.translate.gleu_score import corpus_gleu as nltk_corpus_gleu
+from nltk.translate.gleu_score import sentence_gleu
+
+from llm_eval.tools.lexical_metrics import (
+    bleu,
+    corpus_bleu,
+    corpus_gleu,
+    gleu,
+    lcs_length,
+    ngram_stats,
+    score_lexical_metrics,
+)
+
+WORDS = ["the", "cat", "sat", "on", "mat", "a", "dog", "ran", "Paris", "is", "capital", "."]
+
+
+def random_texts(seed: int, count: int, max_words: int = 20):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(0, max_words))) for _ in range(count)]
+
+
+RESPONSES = random_texts(0, 60) + ["", "the", "Marie Curie was born in Warsaw."]
+REFERENCES = random_texts(1, 60) + [
+    "the cat",
+    "",
+    "Marie Curie was not born in Paris, but in Warsaw!",
+]
+
+
+def nltk_data_available() -> bool:
+    import nltk
+
+    try:
+        nltk.find("tokenizers/punkt_tab")
+        return True
+    except LookupError:
+        return False
+
+
+def test_bleu_and_gleu_match_nltk_from_shared_counts():
+    method4 = SmoothingFunction().method4
+    for response, reference in zip(RESPONSES, REFERENCES):
+        hypothesis, target = response.split(), reference.split()
+        stats = ngram_stats(hypothesis, target)
+
+        assert bleu(stats) == sentence_bleu([target], hypothesis, smoothing_function=method4)
+        assert gleu(stats) == sentence_gleu([target], hypothesis)
+
+
+def test_corpus_bleu_and_gleu_match_nltk():
+    hypotheses = [response.split() for response in RESPONSES]
+    targets = [[reference.split()] for reference in REFERENCES]
+    stats = [ngram_stats(hypothesis, target[0]) for hypothesis, target in zip(hypotheses, targets)]
+
+    assert corpus_bleu(stats) == nltk_corpus_bleu(
+        targets, hypotheses, smoothing_function=SmoothingFunction().method4
+    )
+    assert corpus_gleu(stats) == nltk_corpus_gleu(targets, hypotheses)
+
+
+@pytest.mark.parametrize("rouge_type", ["rouge1", "rouge2", "rougeL"])
+def test_rouge_and_f1_match_azure_ai_evaluation(rouge_type):
+    from azure.ai.evaluation import F1ScoreEvaluator, RougeScoreEvaluator
+
+    rouge_evaluator = RougeScoreEvaluator(
+        rouge_type=rouge_type,
+        precision_threshold=0.5,
+        recall_threshold=0.5,
+        f1_score_threshold=0.5,
+    )
+    f1_evaluator = F1ScoreEvaluator(threshold=0.5)
+
+    report = score_lexical_metrics(
+        RESPONSES, REFERENCES, metrics=("rouge", "f1"), threshold=0.5, rouge_type=rouge_type
+    )
+
+    for result, response, reference in zip(report["results"], RESPONSES, REFERENCES):
+        eval_input = {"response": response, "ground_truth": reference}
+        expected = {
+            **asyncio.run(rouge_evaluator._do_eval(eval_input)),
+            **asyncio.run(f1_evaluator._do_eval(eval_input)),
+            **eval_input,
+        }
+        assert result == expected
+
+
+@pytest.mark.skipif(not nltk_data_available(), reason="needs the NLTK punkt data")
+def test_bleu_and_gleu_match_azure_ai_evaluation():
+    from azure.ai.evaluation import BleuScoreEvaluator, GleuScoreEvaluator
+
+    report = score_lexical_metrics(RESPONSES, REFERENCES, metrics=("bleu", "gleu"), threshold=0.3)
+
+    for result, response, reference in zip(report["results"], RESPONSES, REFERENCES):
+        eval_input = {"response": response, "ground_truth": reference}
+        expected = {
+            **asyncio.run(BleuScoreEvaluator(threshold=0.3)._do_eval(eval_input)),
+            **asyncio.run(GleuScoreEvaluator(threshold=0.3)._do_eval(eval_input)),
+            **eval_input,
+        }
+        assert result == expected
+
+
+def test_lcs_length_matches_dynamic_programming():
+    rng = random.Random(2)
+    for _ in range(500):
+        a = rng.choices("abcde", k=rng.randint(0, 80))
+        b = rng.choices("abcdef", k=rng.randint(0, 80))
+        previous = [0] * (len(b) + 1)
+        for token in a:
+            current = [0]
+            for j, other in enumerate(b, start=1):
+                current.append(
+                    previous[j - 1] + 1 if token == other else max(previous[j], current[j - 1])
+                )
+            previous = current
+
+        assert lcs_length(a, b) == lcs_length(b, a) == previous[-1]
+
+
+def test_rouge_l_matches_azure_ai_evaluation_on_long_texts():
+    from azure.ai.evaluation import RougeScoreEvaluator
+
+    evaluator = RougeScoreEvaluator(rouge_type="rougeL")
+    responses = random_texts(3, 3, max_words=1500)
+    references = random_texts(4, 3, max_words=1500)
+
+    report = score_lexical_metrics(responses, references, metrics=("rouge",))
+
+    for result, response, reference in zip(report["results"], responses, references):
+        eval_input = {"response": response, "ground_truth": reference}
+        expected = asyncio.run(evaluator._do_eval(eval_input))
+        for key in ("rouge_precision", "rouge_recall", "rouge_f1_score"):
+            assert result[key] == expected[key]
+
+
+def test_process_pool_preserves_order_and_scores():
+    single = score_lexical_metrics(RESPONSES, REFERENCES, metrics=("rouge", "f1"), threshold=0.5)
+    pooled = score_lexical_metrics(
+        RESPONSES, REFERENCES, metrics=("rouge", "f1"), threshold=0.5, num_workers=2, shard_size=7
+    )
+
+    assert pooled == single
+
+
+def test_summary_aggregates_scores_and_pass_rates():
+    report = score_lexical_metrics(
+        ["a b c", "x y"], ["a b c", "a b"], metrics=("f1", "rouge"), threshold=0.5
+    )
+
+    assert report["summary"]["f1"]["mean_score"] == pytest.approx(0.5)
+    assert report["summary"]["rouge"]["mean_f1_score"] == pytest.approx(0.5)
+    assert report["summary"]["pass_rates"]["f1_result"] == 0.5
+
+
+def test_rejects_mismatched_inputs():
+    with pytest.raises(ValueError):
+        score_lexical_metrics(["a"], ["a", "b"])
+    with pytest.raises(ValueError):
+        score_lexical_metrics(["a"], ["a"], metrics=("cider",))
+    with pytest.raises(ValueError):
+        score_lexical_metrics(["a"], ["a"], rouge_type="rougeLsum")
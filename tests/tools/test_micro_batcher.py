@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import pytest
+
+from llm_eval.tools.micro_batcher import MicroBatcher
+
+
+class RecordingScorer:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        return [item * 10 for item in items]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_flushed_when_the_batch_is_full():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=200)
+
+    results = await asyncio.gather(*(batcher.ascore(i) for i in range(10)))
+    batcher.close()
+
+    assert results == [i * 10 for i in range(10)]
+    assert [len(batch) for batch in scorer.batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_max_wait():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=100, max_wait_ms=5)
+
+    assert await asyncio.wait_for(batcher.ascore(3), timeout=2) == 30
+    batcher.close()
+
+    assert scorer.batches == [[3]]
+
+
+@pytest.mark.asyncio
+async def test_scoring_errors_are_raised_in_every_caller():
+    def failing_scorer(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(failing_scorer, max_batch_size=2, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        batcher.ascore("a"), batcher.ascore("b"), return_exceptions=True
+    )
+    batcher.close()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_result_count_mismatch_is_raised_in_every_caller():
+    batcher = MicroBatcher(lambda items: [0.5], max_batch_size=2, max_wait_ms=200)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.ascore("a"), batcher.ascore("b"), return_exceptions=True),
+        timeout=2,
+    )
+    batcher.close()
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_submit_from_threads():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=8, max_wait_ms=20)
+    results = {}
+
+    def call(i):
+        results[i] = batcher.submit(i).result(timeout=2)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert results == {i: i * 10 for i in range(16)}
+    assert all(len(batch) <= 8 for batch in scorer.batches)
+
+
+def test_rejects_non_positive_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher(RecordingScorer(), max_batch_size=-1)
@@ -1,3 +1,9 @@
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -8,8 +14,16 @@ from llm_eval.tools.model_tools import (
     get_azure_openai_embedding_model,
     get_azure_openai_llm,
     get_azure_openai_llm_inference,
+    get_client_provider,
+    get_ragas_wrapped_azure_openai_llm,
+    is_snapshot_complete,
     preload_huggingface_model,
+    read_safetensors_header,
+    resolve_model_revision,
+    verify_cached_model,
+    write_model_manifest,
 )
+from tests.support.mock_azure_openai import MockAzureOpenAIServer, fixed_latency
 
 
 @pytest.fixture
@@ -43,6 +57,91 @@ def test_preload_huggingface_model_success(
     mock_model.assert_called()
 
 
+def write_safetensors(path, data=b"\x00" * 16):
+    header = json.dumps(
+        {"weight": {"dtype": "F32", "shape": [4], "data_offsets": [0, len(data)]}}
+    ).encode()
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header)) + header + data)
+
+
+def make_hub_snapshot(tmp_path, content_hash=None):
+    """Lays out a model like the hub cache: a snapshot file linking to a sha256-named blob."""
+    blob = tmp_path / "blobs" / "pending"
+    blob.parent.mkdir()
+    write_safetensors(blob)
+    digest = content_hash or hashlib.sha256(blob.read_bytes()).hexdigest()
+    blob = blob.rename(blob.parent / digest)
+
+    snapshot = tmp_path / "snapshots" / "abc123"
+    snapshot.mkdir(parents=True)
+    os.symlink(blob, snapshot / "model.safetensors")
+    return str(snapshot)
+
+
+@pytest.fixture(autouse=True)
+def llm_eval_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_EVAL_CACHE_DIR", str(tmp_path / "llm_eval"))
+
+
+def test_read_safetensors_header(tmp_path):
+    path = tmp_path / "model.safetensors"
+    write_safetensors(path)
+
+    assert read_safetensors_header(str(path))["weight"]["shape"] == [4]
+
+
+def test_read_safetensors_header_detects_truncation(tmp_path):
+    path = tmp_path / "model.safetensors"
+    write_safetensors(path)
+    path.write_bytes(path.read_bytes()[:-4])
+
+    with pytest.raises(EnvironmentError):
+        read_safetensors_header(str(path))
+
+
+def test_verify_cached_model_hashes_each_blob_once(tmp_path, llm_eval_cache_dir):
+    snapshot = make_hub_snapshot(tmp_path)
+
+    with patch(
+        "llm_eval.tools.model_tools._sha256_file",
+        side_effect=lambda path: os.path.basename(path),
+    ) as mock_hash:
+        assert verify_cached_model(snapshot)
+        assert verify_cached_model(snapshot)
+
+    assert mock_hash.call_count == 1
+
+
+def test_verify_cached_model_rejects_corrupt_blob(tmp_path, llm_eval_cache_dir):
+    snapshot = make_hub_snapshot(tmp_path, content_hash="0" * 64)
+
+    with pytest.raises(EnvironmentError):
+        verify_cached_model(snapshot)
+
+
+def test_verify_cached_model_without_safetensors(tmp_path):
+    (tmp_path / "pytorch_model.bin").write_bytes(b"weights")
+
+    assert not verify_cached_model(str(tmp_path))
+
+
+@patch("llm_eval.tools.model_tools.snapshot_download")
+@patch("llm_eval.tools.model_tools.AutoConfig.from_pretrained")
+@patch("llm_eval.tools.model_tools.AutoTokenizer.from_pretrained")
+@patch("llm_eval.tools.model_tools.AutoModel")
+def test_preload_huggingface_model_skips_instantiating_safetensors_models(
+    mock_model, mock_tokenizer, mock_config, mock_snapshot, tmp_path, llm_eval_cache_dir
+):
+    mock_snapshot.return_value = make_hub_snapshot(tmp_path)
+
+    preload_huggingface_model(model_name="test/test-model")
+
+    mock_config.assert_called_once()
+    mock_tokenizer.assert_called_once()
+    mock_model.from_pretrained.assert_not_called()
+
+
 @patch("llm_eval.tools.model_tools.preload_huggingface_model")
 def test_cache_required_models_with_default(mock_preload):
     # Should call preload 3 times for the default _REQUIRED_MODELS
@@ -62,6 +161,198 @@ def test_cache_required_models_with_custom_config(mock_preload, custom_model_con
     )
 
 
+@patch("llm_eval.tools.model_tools.snapshot_download")
+@patch("llm_eval.tools.model_tools.AutoConfig.from_pretrained")
+@patch("llm_eval.tools.model_tools.AutoTokenizer.from_pretrained")
+@patch("llm_eval.tools.model_tools.AutoModel")
+def test_preload_writes_a_manifest_of_the_verified_snapshot(
+    mock_model, mock_tokenizer, mock_config, mock_snapshot, tmp_path
+):
+    snapshot = make_hub_snapshot(tmp_path)
+    mock_snapshot.return_value = snapshot
+
+    assert preload_huggingface_model(model_name="test/test-model") == snapshot
+    assert is_snapshot_complete("test/test-model") == os.path.abspath(snapshot)
+    assert is_snapshot_complete("test/test-model", revision="v2") is None
+
+
+def test_snapshot_with_changed_file_is_incomplete(tmp_path):
+    snapshot = tmp_path / "snapshot"
+    snapshot.mkdir()
+    (snapshot / "config.json").write_text("{}")
+    write_model_manifest("test/test-model", str(snapshot))
+
+    (snapshot / "config.json").write_text('{"changed": 1}')
+
+    assert is_snapshot_complete("test/test-model") is None
+
+
+@patch("llm_eval.tools.model_tools.preload_huggingface_model")
+def test_cache_required_models_skips_complete_snapshots(
+    mock_preload, custom_model_config, tmp_path
+):
+    snapshot = tmp_path / "snapshot"
+    snapshot.mkdir()
+    (snapshot / "config.json").write_text("{}")
+    write_model_manifest("test/test-model", str(snapshot), local_dir="/tmp/custom")
+
+    cache_required_models(
+        use_standard_models=False,
+        custom_model_config=custom_model_config,
+        custom_cache_dir="/tmp/custom",
+    )
+
+    mock_preload.assert_not_called()
+
+
+@patch("llm_eval.tools.model_tools.preload_huggingface_model")
+def test_cache_required_models_prefetches_concurrently(mock_preload):
+    # Only passes if all three models are being prefetched at the same time.
+    barrier = threading.Barrier(3, timeout=5)
+    mock_preload.side_effect = lambda **kwargs: barrier.wait()
+
+    cache_required_models()
+
+    assert mock_preload.call_count == 3
+
+
+def test_resolve_model_revision_prefers_the_cached_snapshot():
+    commit = "0123456789abcdef0123456789abcdef01234567"
+    snapshot = os.path.join("hub", "models--test--model", "snapshots", commit)
+
+    with patch(
+        "llm_eval.tools.model_tools.get_local_snapshot", return_value=snapshot
+    ) as get_local_snapshot, patch("llm_eval.tools.model_tools.HfApi", create=True) as hf_api:
+        assert resolve_model_revision("test/cached-model", "main") == commit
+        assert resolve_model_revision("test/cached-model", "main") == commit
+        assert resolve_model_revision("test/cached-model", "f" * 40) == "f" * 40
+
+    get_local_snapshot.assert_called_once()
+    hf_api.assert_not_called()
+
+
+def test_resolve_model_revision_asks_the_hub_once_for_uncached_models():
+    commit = "fedcba9876543210fedcba9876543210fedcba98"
+
+    with patch("llm_eval.tools.model_tools.get_local_snapshot", return_value=None), patch(
+        "llm_eval.tools.model_tools.HfApi", create=True
+    ) as hf_api:
+        hf_api.return_value.model_info.return_value.sha = commit
+        assert resolve_model_revision("test/uncached-model", "main") == commit
+        assert resolve_model_revision("test/uncached-model", "main") == commit
+
+        hf_api.return_value.model_info.side_effect = OSError("offline")
+        assert resolve_model_revision("test/unreachable-model", "main") is None
+
+    assert hf_api.return_value.model_info.call_count == 2
+
+
+@pytest.fixture
+def azure_openai_env(monkeypatch):
+    for name, value in {
+        "AZURE_OPENAI_LLM_MODEL": "gpt-test",
+        "AZURE_OPENAI_LLM_API_KEY": "test-key",
+        "AZURE_OPENAI_LLM_ENDPOINT": "https://example.openai.azure.com",
+        "AZURE_OPENAI_LLM_API_VERSION": "2024-06-01",
+        "AZURE_OPENAI_EMBEDDING_MODEL": "embedding-test",
+        "AZURE_OPENAI_EMBEDDING_MODEL_API_KEY": "test-key",
+        "AZURE_OPENAI_EMBEDDING_MODEL_ENDPONT": "https://example.openai.azure.com",
+        "AZURE_OPENAI_EMBEDDING_MODEL_API_VERSION": "2024-06-01",
+    }.items():
+        monkeypatch.setenv(name, value)
+    get_client_provider().clear()
+    yield
+    get_client_provider().clear()
+
+
+def test_clients_are_cached_per_configuration(azure_openai_env):
+    llm = get_azure_openai_llm()
+
+    assert get_azure_openai_llm() is llm
+    assert get_azure_openai_llm(model="other-deployment") is not llm
+
+
+def test_ragas_llms_are_built_per_metric_on_the_shared_pool(azure_openai_env):
+    pool = get_client_provider().http_pool
+
+    first, second = get_ragas_wrapped_azure_openai_llm(), get_ragas_wrapped_azure_openai_llm()
+
+    assert first.langchain_llm is not second.langchain_llm
+    assert first.langchain_llm is not get_azure_openai_llm()
+    assert first.langchain_llm.http_async_client is second.langchain_llm.http_async_client
+    assert first.langchain_llm.http_async_client is pool.async_client
+
+
+def test_concurrent_ragas_llms_keep_their_own_generation_settings(azure_openai_env, monkeypatch):
+    from langchain_core.prompt_values import StringPromptValue
+
+    requests = []
+
+    def record(body: dict) -> str:
+        requests.append((body.get("n") or 1, body.get("temperature")))
+        return "answer"
+
+    with MockAzureOpenAIServer(latency=fixed_latency(50), default_chat_response=record) as server:
+        monkeypatch.setenv("AZURE_OPENAI_LLM_ENDPOINT", server.url)
+        relevancy_llm = get_ragas_wrapped_azure_openai_llm()
+        faithfulness_llm = get_ragas_wrapped_azure_openai_llm()
+        prompt = StringPromptValue(text="Rate this answer.")
+
+        async def run():
+            return await asyncio.gather(
+                *(relevancy_llm.agenerate_text(prompt, n=3) for _ in range(4)),
+                *(faithfulness_llm.agenerate_text(prompt, n=1) for _ in range(4)),
+            )
+
+        results = asyncio.run(run())
+
+    assert [len(result.generations[0]) for result in results] == [3] * 4 + [1] * 4
+    assert sorted(requests) == sorted(
+        [(3, relevancy_llm.get_temperature(3))] * 4 + [(1, faithfulness_llm.get_temperature(1))] * 4
+    )
+
+
+def test_clients_share_one_http_pool(azure_openai_env):
+    pool = get_client_provider().http_pool
+
+    llm = get_azure_openai_llm()
+    embeddings = get_azure_openai_embedding_model()
+
+    assert llm.http_client is pool.client
+    assert embeddings.http_client is pool.client
+    assert llm.http_async_client is pool.async_client
+    assert embeddings.http_async_client is pool.async_client
+
+
+def test_pool_clients_leave_retries_to_the_rate_limiter(azure_openai_env):
+    llm = get_azure_openai_llm()
+    embeddings = get_azure_openai_embedding_model()
+
+    assert llm.max_retries == 0
+    assert embeddings.max_retries == 0
+    assert llm.client._client.max_retries == 0
+    assert embeddings.client._client.max_retries == 0
+
+
+def test_configure_replaces_the_pool_and_clients(azure_openai_env):
+    llm = get_azure_openai_llm()
+
+    get_client_provider().configure(max_connections=5, timeout=10)
+
+    assert get_client_provider().http_pool.limits.max_connections == 5
+    assert get_azure_openai_llm() is not llm
+
+
+def test_configure_keeps_the_pool_of_existing_clients_open(azure_openai_env):
+    llm = get_azure_openai_llm()
+    ragas_llm = get_ragas_wrapped_azure_openai_llm()
+
+    get_client_provider().configure(max_connections=5)
+
+    assert not llm.http_client.is_closed
+    assert not ragas_llm.langchain_llm.http_client.is_closed
+
+
 def test_cache_required_models_raises_if_no_custom_config():
     with pytest.raises(ValueError):
         # This will raise due to `custom_model_config=None` when use_standard_models=False
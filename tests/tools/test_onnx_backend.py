@@ -0,0 +1,100 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import (
+    BiasEvaluator,
+    SentimentEvaluator,
+    ToxicityEvaluator,
+)
+from llm_eval.tools.onnx_backend import export_onnx_model, get_onnx_model_dir
+
+PARITY_TOLERANCE = 1e-3
+
+PARITY_RESPONSES = [
+    "I absolutely love this product, it works perfectly!",
+    "The package was delivered on Wednesday afternoon.",
+    "Doctors are men who lead, and nurses are women who assist.",
+    "You're a worthless piece of trash and everyone hates you.",
+    "It is fine, I suppose, although the instructions could be clearer.",
+]
+
+
+def test_onnx_model_dir_sits_next_to_hf_cache():
+    from huggingface_hub.constants import HF_HUB_CACHE
+
+    commit = "0123456789abcdef0123456789abcdef01234567"
+    export_dir = get_onnx_model_dir("s-nlp/roberta_toxicity_classifier", commit)
+
+    assert export_dir.startswith(os.path.dirname(os.path.abspath(HF_HUB_CACHE)))
+    assert export_dir.endswith(
+        os.path.join("models--s-nlp--roberta_toxicity_classifier", commit)
+    )
+
+
+def test_onnx_model_dir_follows_the_commit_main_points_to():
+    with patch("llm_eval.tools.onnx_backend.resolve_model_revision", return_value="a" * 40):
+        before = get_onnx_model_dir("s-nlp/roberta_toxicity_classifier", "main")
+    with patch("llm_eval.tools.onnx_backend.resolve_model_revision", return_value="b" * 40):
+        after = get_onnx_model_dir("s-nlp/roberta_toxicity_classifier", "main")
+
+    assert os.path.basename(before) == "a" * 40
+    assert os.path.basename(after) == "b" * 40
+
+
+def test_onnx_model_dir_requires_a_resolvable_revision():
+    with patch("llm_eval.tools.onnx_backend.resolve_model_revision", return_value=None):
+        with pytest.raises(EnvironmentError):
+            get_onnx_model_dir("s-nlp/roberta_toxicity_classifier", "main")
+
+
+def test_onnx_export_that_loses_the_race_removes_its_temp_dir(tmp_path):
+    pytest.importorskip("optimum.onnxruntime")
+
+    class Saveable:
+        def save_pretrained(self, directory):
+            with open(os.path.join(directory, "model.onnx"), "w") as file:
+                file.write("graph")
+
+    # Another export has already claimed the directory.
+    export_dir = tmp_path / "models--test--model" / ("a" * 40)
+    export_dir.mkdir(parents=True)
+    (export_dir / "config.json").write_text("{}")
+
+    with patch(
+        "llm_eval.tools.onnx_backend.get_onnx_model_dir", return_value=str(export_dir)
+    ), patch(
+        "optimum.onnxruntime.ORTModelForSequenceClassification.from_pretrained",
+        return_value=Saveable(),
+    ), patch(
+        "transformers.AutoTokenizer.from_pretrained", return_value=Saveable()
+    ):
+        assert export_onnx_model("test/model") == str(export_dir)
+
+    assert os.listdir(export_dir.parent) == [export_dir.name]
+
+
+def test_onnx_backend_rejects_non_cpu_device():
+    with pytest.raises(ValueError):
+        ToxicityEvaluator(backend="onnx", device="cuda")
+
+
+@pytest.mark.parametrize(
+    "evaluator_class, score_key",
+    [
+        (SentimentEvaluator, "sentiment"),
+        (BiasEvaluator, "bias"),
+        (ToxicityEvaluator, "toxicity"),
+    ],
+)
+def test_onnx_scores_match_pytorch(evaluator_class, score_key):
+    pytest.importorskip("optimum.onnxruntime")
+
+    pytorch_scores = evaluator_class().evaluate_batch(PARITY_RESPONSES)
+    onnx_scores = evaluator_class(backend="onnx").evaluate_batch(PARITY_RESPONSES)
+
+    for pytorch_score, onnx_score in zip(pytorch_scores, onnx_scores):
+        assert onnx_score[score_key] == pytest.approx(
+            pytorch_score[score_key], abs=PARITY_TOLERANCE
+        )
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+from llm_eval.tools.completion_cache import disable_completion_cache, enable_completion_cache
+from llm_eval.tools.packed_similarity import (
+    PackedSimilarityJudge,
+    pack_triples,
+    parse_ratings,
+    render_messages,
+)
+from tests.support.mock_azure_openai import MockAzureOpenAIServer
+
+TRIPLES = [(f"What is fact {index}?", f"Fact {index}.", f"Fact {index} holds.") for index in range(9)]
+
+
+def packed_items(body: dict) -> list:
+    """The (item id, predicted answer) pairs of a packed similarity request."""
+    content = body["messages"][-1]["content"]
+    return re.findall(
+        r"^item (\d+)\nquestion: .*\ncorrect answer: .*\npredicted answer: (.*)$",
+        content,
+        re.MULTILINE,
+    )
+
+
+@pytest.fixture
+def completion_cache(tmp_path):
+    cache = enable_completion_cache(directory=str(tmp_path))
+    yield cache
+    disable_completion_cache()
+
+
+def model_config(server: MockAzureOpenAIServer) -> dict:
+    return {
+        "azure_endpoint": server.url,
+        "api_key": "mock-key",
+        "azure_deployment": "gpt-mock",
+        "api_version": "2024-06-01",
+    }
+
+
+def test_packs_fit_the_token_budget():
+    header = len(json.dumps(render_messages([]))) // 4
+
+    assert pack_triples(TRIPLES) == [list(range(9))]
+    assert pack_triples(TRIPLES, max_pack_size=4) == [[0, 1, 2, 3], [4, 5, 6, 7], [8]]
+    packs = pack_triples(TRIPLES, token_budget=header + 60)
+    assert 1 < len(packs) < len(TRIPLES)
+    assert [index for pack in packs for index in pack] == list(range(9))
+    assert pack_triples(TRIPLES[:2], token_budget=1) == [[0], [1]]
+    with pytest.raises(ValueError):
+        pack_triples(TRIPLES, max_pack_size=0)
+
+
+def test_parse_ratings_keeps_only_valid_items():
+    text = (
+        "```json\n"
+        '[{"id": 1, "stars": 4}, {"id": 2, "stars": "5"}, {"id": 3, "stars": 7},'
+        ' {"id": 4, "stars": 2}, {"id": 4, "stars": 3}, {"id": true, "stars": 1},'
+        ' {"id": 9, "stars": 1}, "5"]\n```'
+    )
+
+    assert parse_ratings(text, 5) == {1: 4, 2: 5}
+    assert parse_ratings("I cannot rate these.", 3) == {}
+    assert parse_ratings("[{", 3) == {}
+
+
+def test_judge_retries_only_missing_and_malformed_items():
+    requests, settings = [], []
+
+    def respond(body):
+        items = packed_items(body)
+        requests.append([answer for _, answer in items])
+        settings.append((body.get("temperature"), body.get("max_tokens")))
+        ratings = [{"id": int(item_id), "stars": 4} for item_id, _ in items]
+        if len(requests) == 1:
+            # Item 2 is left out and item 3 gets an invalid rating.
+            ratings = [ratings[0], {"id": 3, "stars": "four"}, *ratings[3:]]
+        return json.dumps(ratings)
+
+    with MockAzureOpenAIServer(default_chat_response=respond) as server:
+        judge = PackedSimilarityJudge(model_config(server))
+        stars = asyncio.run(judge.arate(TRIPLES))
+
+    assert stars == [4] * 9
+    assert requests[1] == ["Fact 1.", "Fact 2."]
+    assert settings[1] == (0.0, 2 * 12 + 8)
+    assert judge.requests == 2
+    assert judge.retried == 2
+
+
+def test_judge_gives_up_after_max_attempts():
+    with MockAzureOpenAIServer(default_chat_response="[]") as server:
+        judge = PackedSimilarityJudge(model_config(server), max_attempts=2)
+        stars = asyncio.run(judge.arate(TRIPLES[:3]))
+
+    assert stars == [None, None, None]
+    assert server.stats["chat"] == 2
+
+
+def test_judge_retries_reach_the_model_and_bad_answers_are_not_cached(completion_cache):
+    with MockAzureOpenAIServer(default_chat_response="I cannot rate these.") as server:
+        judge = PackedSimilarityJudge(model_config(server))
+        stars = asyncio.run(judge.arate(TRIPLES[:2]))
+
+    assert stars == [None, None]
+    assert judge.requests == server.stats["chat"] == 3
+    assert completion_cache.stats["entries"] == 0
+
+
+def test_judge_replays_complete_answers_from_the_completion_cache(completion_cache):
+    def respond(body):
+        return json.dumps([{"id": int(item_id), "stars": 3} for item_id, _ in packed_items(body)])
+
+    with MockAzureOpenAIServer(default_chat_response=respond) as server:
+        first = PackedSimilarityJudge(model_config(server))
+        asyncio.run(first.arate(TRIPLES))
+        second = PackedSimilarityJudge(model_config(server))
+        stars = asyncio.run(second.arate(TRIPLES))
+
+    assert stars == [3] * 9
+    assert server.stats["chat"] == first.requests == 1
+    assert (second.requests, second.cached) == (0, 1)
@@ -0,0 +1,70 @@
+import multiprocessing
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import ToxicityEvaluator
+from llm_eval.tools.parallel_scoring import score_in_processes, shard_responses
+from llm_eval.tools.score_cache import disable_score_cache, enable_score_cache
+from tests.support.fake_classifier import patched_classifier
+
+requires_fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="sharing the patched classifier with workers requires fork",
+)
+
+RESPONSES = [" ".join(["word"] * (i % 11)) for i in range(60)]
+
+
+@pytest.fixture
+def fake_toxicity_classifier():
+    with patched_classifier(ToxicityEvaluator, ["neutral", "toxic"]) as classifier:
+        yield classifier
+
+
+def test_shards_cover_every_response_in_order():
+    shards = shard_responses(RESPONSES, num_workers=3, batch_size=4)
+
+    assert [start for start, _ in shards] == list(range(0, 60, 5))
+    assert [response for _, shard in shards for response in shard] == RESPONSES
+
+
+def test_shards_hold_at_least_one_batch():
+    shards = shard_responses(RESPONSES, num_workers=64, batch_size=16)
+
+    assert all(len(shard) == 16 for _, shard in shards[:-1])
+
+
+@requires_fork
+def test_results_are_reassembled_in_input_order(fake_toxicity_classifier):
+    evaluator = ToxicityEvaluator()
+
+    results = score_in_processes(evaluator, RESPONSES, num_workers=3, batch_size=4)
+
+    assert results == evaluator.evaluate_batch(RESPONSES)
+
+
+@requires_fork
+def test_workers_write_to_the_score_cache(tmp_path, fake_toxicity_classifier):
+    enable_score_cache(directory=str(tmp_path))
+    try:
+        evaluator = ToxicityEvaluator()
+        score_in_processes(evaluator, RESPONSES, num_workers=2, batch_size=4)
+        fake_toxicity_classifier.batches.clear()
+
+        evaluator.evaluate_batch(RESPONSES)
+    finally:
+        disable_score_cache()
+
+    assert fake_toxicity_classifier.batches == []
+
+
+def test_single_worker_scores_in_process(fake_toxicity_classifier):
+    results = ToxicityEvaluator().evaluate_parallel(RESPONSES, num_workers=1)
+
+    assert len(results) == len(RESPONSES)
+    assert fake_toxicity_classifier.batches
+
+
+def test_rejects_non_positive_intra_op_threads():
+    with pytest.raises(ValueError):
+        score_in_processes(ToxicityEvaluator(), RESPONSES, intra_op_threads=0)
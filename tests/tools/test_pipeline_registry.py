@@ -0,0 +1,129 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import (
+    BiasEvaluator,
+    SentimentEvaluator,
+    ToxicityEvaluator,
+)
+from llm_eval.tools.pipeline_registry import PipelineRegistry
+
+
+def make_registry(sizes=None, max_memory_mb=1.0):
+    sizes = sizes or {}
+    loader = MagicMock(side_effect=lambda model_name, *args: f"pipeline:{model_name}")
+    registry = PipelineRegistry(
+        max_memory_mb=max_memory_mb,
+        loader=loader,
+        memory_estimator=lambda pipe: sizes.get(pipe, 0),
+    )
+    return registry, loader
+
+
+def test_get_loads_once_per_key():
+    registry, loader = make_registry()
+
+    first = registry.get("model-a")
+    second = registry.get("model-a")
+
+    assert first is second
+    assert loader.call_count == 1
+
+
+def test_key_includes_revision_device_and_dtype():
+    registry, loader = make_registry()
+
+    registry.get("model-a")
+    registry.get("model-a", revision="v2")
+    registry.get("model-a", device="cuda")
+    registry.get("model-a", dtype="float16")
+    registry.get("model-a", backend="onnx")
+
+    assert loader.call_count == 5
+    assert ("model-a", "v2", "cpu", "None", "pytorch") in registry
+
+
+def test_rejects_unknown_backend():
+    registry, _ = make_registry()
+
+    with pytest.raises(ValueError):
+        registry.get("model-a", backend="tensorflow")
+
+
+def test_evicts_least_recently_used_over_memory_cap():
+    half_mb = 512 * 1024
+    registry, loader = make_registry(
+        sizes={
+            "pipeline:model-a": half_mb,
+            "pipeline:model-b": half_mb,
+            "pipeline:model-c": half_mb,
+        }
+    )
+
+    registry.get("model-a")
+    registry.get("model-b")
+    registry.get("model-a")
+    registry.get("model-c")
+
+    assert ("model-a", "main", "cpu", "None", "pytorch") in registry
+    assert ("model-b", "main", "cpu", "None", "pytorch") not in registry
+    assert ("model-c", "main", "cpu", "None", "pytorch") in registry
+    assert registry.memory_bytes <= registry.max_memory_bytes
+
+
+def test_keeps_newest_pipeline_even_if_over_cap():
+    registry, _ = make_registry(sizes={"pipeline:huge": 10 * 1024 * 1024})
+
+    registry.get("huge")
+
+    assert len(registry) == 1
+
+
+def test_concurrent_gets_share_a_single_load():
+    release = threading.Event()
+
+    def slow_loader(model_name, *args):
+        release.wait(timeout=5)
+        return object()
+
+    loader = MagicMock(side_effect=slow_loader)
+    registry = PipelineRegistry(loader=loader, memory_estimator=lambda pipe: 0)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("model-a")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert loader.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_evaluators_share_the_process_wide_registry():
+    def fake_pipeline(*args):
+        classifier = MagicMock(
+            return_value=[[{"label": "a", "score": 0.25}, {"label": "b", "score": 0.75}]]
+        )
+        classifier.tokenizer.return_value = {"input_ids": [[0, 1, 2]]}
+        return classifier
+
+    registry, loader = make_registry()
+    loader.side_effect = fake_pipeline
+
+    with patch(
+        "llm_eval.base_evaluators.custom_evaluators.get_pipeline_registry",
+        return_value=registry,
+    ):
+        for _ in range(3):
+            ToxicityEvaluator()(response="first")
+            BiasEvaluator()(response="second")
+
+    assert loader.call_count == 2
+    assert SentimentEvaluator().model_name == "tabularisai/multilingual-sentiment-analysis"
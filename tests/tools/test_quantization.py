@@ -0,0 +1,71 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from llm_eval.base_evaluators.custom_evaluators import (
+    BiasEvaluator,
+    SentimentEvaluator,
+    ToxicityEvaluator,
+)
+from llm_eval.tools.quantization import (
+    QUANTIZED_DTYPE,
+    get_quantized_model_path,
+    report_quantization_drift,
+)
+
+DRIFT_RESPONSES = [
+    "I absolutely love this product, it works perfectly!",
+    "The package was delivered on Wednesday afternoon.",
+    "Doctors are men who lead, and nurses are women who assist.",
+    "He is a brilliant doctor, and she’s a wonderful nurse who keeps things tidy.",
+    "You're a worthless piece of trash and everyone hates you.",
+    "This is the worst service I have ever received and I want a refund.",
+]
+
+
+def test_quantized_model_path_follows_the_commit_main_points_to(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_EVAL_CACHE_DIR", str(tmp_path))
+    with patch("llm_eval.tools.quantization.resolve_model_revision", return_value="a" * 40):
+        before = get_quantized_model_path("s-nlp/roberta_toxicity_classifier", "main")
+    with patch("llm_eval.tools.quantization.resolve_model_revision", return_value="b" * 40):
+        after = get_quantized_model_path("s-nlp/roberta_toxicity_classifier", "main")
+
+    assert os.path.basename(os.path.dirname(before)) == "a" * 40
+    assert os.path.basename(os.path.dirname(after)) == "b" * 40
+
+
+def test_quantized_model_path_requires_a_resolvable_revision():
+    with patch("llm_eval.tools.quantization.resolve_model_revision", return_value=None):
+        with pytest.raises(EnvironmentError):
+            get_quantized_model_path("s-nlp/roberta_toxicity_classifier", "main")
+
+
+def test_quantize_uses_qint8_registry_dtype():
+    evaluator = ToxicityEvaluator(quantize=True)
+
+    assert evaluator.dtype == QUANTIZED_DTYPE
+    assert evaluator.cache_identity["dtype"] == QUANTIZED_DTYPE
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"backend": "onnx"}, {"device": "cuda"}, {"dtype": "float16"}],
+)
+def test_quantize_rejects_incompatible_options(kwargs):
+    with pytest.raises(ValueError):
+        ToxicityEvaluator(quantize=True, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "evaluator_class", [SentimentEvaluator, BiasEvaluator, ToxicityEvaluator]
+)
+def test_quantization_drift_within_tolerance(evaluator_class):
+    report = report_quantization_drift(evaluator_class, DRIFT_RESPONSES)
+
+    print(
+        f"\n{report['model']}: mean drift {report['mean_abs_drift']:.4f}, "
+        f"max drift {report['max_abs_drift']:.4f}"
+    )
+    assert len(report["scores"]) == len(DRIFT_RESPONSES)
+    assert report["max_abs_drift"] < 0.1
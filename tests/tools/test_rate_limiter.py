@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from llm_eval.tools.http_pool import HTTPPool
+from llm_eval.tools.rate_limiter import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RateLimiter,
+    TokenBucket,
+    deployment_name,
+    estimate_request_tokens,
+)
+
+CHAT_URL = "https://example.test/openai/deployments/gpt-4o/chat/completions"
+
+
+class FakeAzureEndpoint:
+    """Answers 429 with `retry-after-ms` to the first `throttle` requests, then 200."""
+
+    def __init__(self, throttle: int = 0, headers: dict = None):
+        self.throttle = throttle
+        self.headers = headers or {}
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.requests <= self.throttle:
+            return httpx.Response(429, headers={"retry-after-ms": "1"}, json={"error": "busy"})
+        return httpx.Response(200, headers=self.headers, json={"ok": True})
+
+
+def chat_body(content: str = "Hello there", max_tokens: int = 10) -> dict:
+    return {"messages": [{"role": "user", "content": content}], "max_tokens": max_tokens}
+
+
+def test_token_bucket_allows_bursts_then_waits():
+    bucket = TokenBucket(rate_per_minute=600, capacity=10)
+
+    assert bucket.reserve(10) == 0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.01)
+
+
+def test_estimate_request_tokens():
+    # 40 characters of content plus the 4-character role, and the 10-token completion budget.
+    assert estimate_request_tokens(json.dumps(chat_body("x" * 40))) == 11 + 10
+    assert estimate_request_tokens({"input": ["abcd", "efgh"]}) == 2
+    assert estimate_request_tokens(b"not json") == 0
+
+
+def test_deployment_name():
+    assert deployment_name(httpx.URL(CHAT_URL)) == "gpt-4o"
+    assert deployment_name(httpx.URL("https://example.test/v1/models")) == "default"
+
+
+def test_transport_retries_rate_limited_requests():
+    endpoint = FakeAzureEndpoint(throttle=2)
+    limiter = RateLimiter(max_retries=3)
+    client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(endpoint), limiter))
+
+    response = client.post(CHAT_URL, json=chat_body())
+
+    assert response.status_code == 200
+    assert endpoint.requests == 3
+    assert limiter.throttled == 2
+
+
+def test_transport_returns_the_429_once_retries_run_out():
+    endpoint = FakeAzureEndpoint(throttle=5)
+    limiter = RateLimiter(max_retries=1)
+    client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(endpoint), limiter))
+
+    assert client.post(CHAT_URL, json=chat_body()).status_code == 429
+    assert endpoint.requests == 2
+
+
+def test_throttling_halves_the_rate_and_success_restores_it():
+    limiter = RateLimiter(requests_per_minute=60, max_retries=0)
+
+    limiter.record_response(429, {})
+    assert limiter.requests.rate_factor == 0.5
+
+    limiter.record_response(200, {})
+    assert limiter.requests.rate_factor == pytest.approx(0.55)
+
+
+def test_remaining_quota_headers_lower_the_buckets():
+    endpoint = FakeAzureEndpoint(
+        headers={"x-ratelimit-remaining-requests": "2", "x-ratelimit-remaining-tokens": "50"}
+    )
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60000)
+    client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(endpoint), limiter))
+
+    client.post(CHAT_URL, json=chat_body())
+
+    assert limiter.requests.level == pytest.approx(2, abs=0.1)
+    assert limiter.tokens.level == pytest.approx(50, abs=1)
+
+
+def test_backoff_honours_retry_after_with_jitter():
+    limiter = RateLimiter(base_delay=1, max_delay=8)
+
+    assert 2 <= limiter.backoff(0, retry_after=2) <= 2.2
+    assert all(0 <= limiter.backoff(10) <= 8 for _ in range(20))
+
+
+@pytest.mark.asyncio
+async def test_async_transport_retries_rate_limited_requests():
+    endpoint = FakeAzureEndpoint(throttle=1)
+    limiter = RateLimiter()
+    client = httpx.AsyncClient(
+        transport=AsyncRateLimitedTransport(httpx.MockTransport(endpoint), limiter)
+    )
+
+    responses = await asyncio.gather(
+        *(client.post(CHAT_URL, json=chat_body()) for _ in range(3))
+    )
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert endpoint.requests == 4
+
+
+def test_pool_sends_requests_through_its_rate_limiter():
+    endpoint = FakeAzureEndpoint(throttle=1)
+    limiter = RateLimiter()
+    pool = HTTPPool(transport_factory=lambda: httpx.MockTransport(endpoint), rate_limiter=limiter)
+
+    assert pool.client.post(CHAT_URL, json=chat_body()).status_code == 200
+    assert limiter.throttled == 1
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_call_retries_errors_raised_from_a_rate_limit():
+    calls = []
+
+    def evaluate(query):
+        calls.append(query)
+        if len(calls) < 3:
+            try:
+                raise RateLimitError()
+            except RateLimitError as e:
+                raise RuntimeError("wrapped") from e
+        return {"similarity": 5.0}
+
+    limiter = RateLimiter(base_delay=0.001)
+
+    assert limiter.call(evaluate, tokens=10, query="q") == {"similarity": 5.0}
+    assert calls == ["q", "q", "q"]
+
+
+@pytest.mark.asyncio
+async def test_acall_retries_errors_raised_from_a_rate_limit():
+    calls = []
+
+    async def evaluate(query):
+        calls.append(query)
+        if len(calls) < 3:
+            raise RateLimitError()
+        return {"similarity": 5.0}
+
+    limiter = RateLimiter(base_delay=0.001)
+
+    assert await limiter.acall(evaluate, tokens=10, query="q") == {"similarity": 5.0}
+    assert calls == ["q", "q", "q"]
+    assert limiter.throttled == 2
+
+
+def test_call_raises_other_errors_immediately():
+    def evaluate():
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        RateLimiter().call(evaluate)
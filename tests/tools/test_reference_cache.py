@@ -0,0 +1,99 @@
+from statistics import mean, stdev
+
+import pytest
+
+from llm_eval.tools.reference_cache import ReferenceDistributionCache
+
+REFERENCES = ["first reference", "a second reference", "the third reference here"]
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+
+class FakeEvaluator:
+    evaluator = "toxicity"
+
+    def __init__(self, revision="main", commit=COMMIT):
+        self.revision = revision
+        self.commit = commit
+        self.batches = []
+        self.identity_reads = 0
+
+    @property
+    def cache_identity(self):
+        self.identity_reads += 1
+        return {"evaluator": self.evaluator, "revision": self.revision, "commit": self.commit}
+
+    def evaluate_batch(self, responses, batch_size=32):
+        self.batches.append(list(responses))
+        return [{self.evaluator: len(response) / 100} for response in responses]
+
+
+def test_scores_references_in_one_batch(tmp_path):
+    cache = ReferenceDistributionCache(directory=str(tmp_path))
+    evaluator = FakeEvaluator()
+
+    distribution = cache.get_or_compute(evaluator, REFERENCES)
+
+    scores = [len(reference) / 100 for reference in REFERENCES]
+    assert evaluator.batches == [REFERENCES]
+    assert distribution["reference_scores"] == scores
+    assert distribution["mean_score"] == pytest.approx(mean(scores))
+    assert distribution["stdev"] == pytest.approx(stdev(scores))
+
+
+def test_reuses_distribution_in_memory(tmp_path):
+    cache = ReferenceDistributionCache(directory=str(tmp_path))
+    evaluator = FakeEvaluator()
+
+    for _ in range(10):
+        cache.get_or_compute(evaluator, REFERENCES)
+
+    assert len(evaluator.batches) == 1
+
+
+def test_reads_the_cache_identity_once_per_lookup(tmp_path):
+    cache = ReferenceDistributionCache(directory=str(tmp_path))
+    evaluator = FakeEvaluator()
+
+    cache.get_or_compute(evaluator, REFERENCES)
+
+    assert evaluator.identity_reads == 1
+
+
+def test_persists_distribution_between_runs(tmp_path):
+    first_run = ReferenceDistributionCache(directory=str(tmp_path))
+    expected = first_run.get_or_compute(FakeEvaluator(), REFERENCES)
+
+    evaluator = FakeEvaluator()
+    second_run = ReferenceDistributionCache(directory=str(tmp_path))
+
+    assert second_run.get_or_compute(evaluator, REFERENCES) == expected
+    assert evaluator.batches == []
+
+
+@pytest.mark.parametrize(
+    "evaluator, references",
+    [
+        (FakeEvaluator(revision="v2"), REFERENCES),
+        (FakeEvaluator(commit="f" * 40), REFERENCES),
+        (FakeEvaluator(), REFERENCES[:2]),
+        (FakeEvaluator(), list(reversed(REFERENCES))),
+    ],
+)
+def test_key_changes_with_revision_commit_and_references(tmp_path, evaluator, references):
+    cache = ReferenceDistributionCache(directory=str(tmp_path))
+    cache.get_or_compute(FakeEvaluator(), REFERENCES)
+
+    cache.get_or_compute(evaluator, references)
+
+    assert evaluator.batches == [references]
+
+
+def test_only_persists_distributions_of_a_known_commit(tmp_path):
+    first_run = ReferenceDistributionCache(directory=str(tmp_path))
+    first_run.get_or_compute(FakeEvaluator(commit=None), REFERENCES)
+
+    evaluator = FakeEvaluator(commit=None)
+    ReferenceDistributionCache(directory=str(tmp_path)).get_or_compute(evaluator, REFERENCES)
+
+    assert list(tmp_path.iterdir()) == []
+    assert evaluator.batches == [REFERENCES]
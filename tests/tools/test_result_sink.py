@@ -0,0 +1,157 @@
+import json
+import logging
+import time
+
+import numpy as np
+import pytest
+
+import llm_eval.tools.result_sink as result_sink
+from llm_eval.evaluators.format import RunCustomResponseEvaluator
+from llm_eval.tools.result_sink import (
+    JsonlResultSink,
+    ParquetResultSink,
+    ResultLog,
+    disable_result_sink,
+    enable_result_logging,
+    enable_result_sink,
+    get_result_sink,
+    open_result_sink,
+    report_result,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_active_sink(monkeypatch):
+    monkeypatch.delenv("LLM_EVAL_RESULT_SINK", raising=False)
+    monkeypatch.setattr(result_sink, "_ENV_CHECKED", False)
+    monkeypatch.setattr(result_sink, "_LOG_RESULTS", None)
+    disable_result_sink()
+    yield
+    disable_result_sink()
+
+
+def read_jsonl(path) -> list:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_jsonl_sink_writes_records_in_order(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with JsonlResultSink(str(path), batch_size=3) as sink:
+        for index in range(10):
+            sink.emit("RunExampleEvaluator", {"index": index, "score": np.float32(0.5)})
+
+    records = read_jsonl(path)
+    assert [record["result"]["index"] for record in records] == list(range(10))
+    assert records[0]["evaluator"] == "RunExampleEvaluator"
+    assert records[0]["result"]["score"] == 0.5
+    assert sink.written == 10
+
+
+class RecordingSink(result_sink.ResultSink):
+    def __init__(self, **kwargs):
+        self.batches = []
+        super().__init__(**kwargs)
+
+    def write(self, records):
+        self.batches.append(len(records))
+
+
+def test_records_emitted_slowly_are_buffered_into_batches():
+    with RecordingSink(batch_size=8, flush_interval=60) as sink:
+        for index in range(20):
+            sink.emit("RunExampleEvaluator", {"index": index})
+            time.sleep(0.01)
+
+    assert sink.batches == [8, 8, 4]
+
+
+def test_partial_batch_is_written_after_flush_interval():
+    sink = RecordingSink(batch_size=1000, flush_interval=0.2)
+    for index in range(5):
+        sink.emit("RunExampleEvaluator", {"index": index})
+        time.sleep(0.01)
+    time.sleep(0.5)
+
+    assert sink.batches == [5]
+    sink.close()
+
+
+def test_flush_waits_for_pending_records(tmp_path):
+    path = tmp_path / "results.jsonl"
+    sink = JsonlResultSink(str(path), flush_interval=60)
+    sink.emit("RunExampleEvaluator", {"score": 1})
+    sink.flush()
+
+    assert len(read_jsonl(path)) == 1
+    sink.close()
+    with pytest.raises(ValueError):
+        sink.emit("RunExampleEvaluator", {"score": 1})
+
+
+def test_emit_copies_the_result(tmp_path):
+    path = tmp_path / "results.jsonl"
+    result = {"score": 1}
+    with JsonlResultSink(str(path)) as sink:
+        sink.emit("RunExampleEvaluator", result)
+        result["score"] = 2
+
+    assert read_jsonl(path)[0]["result"]["score"] == 1
+
+
+def test_parquet_sink_round_trips(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "results.parquet"
+    sink = open_result_sink(str(path), batch_size=2)
+    assert isinstance(sink, ParquetResultSink)
+    for index in range(5):
+        sink.emit("RunExampleEvaluator", {"index": index, "format": str})
+    sink.close()
+
+    table = pq.read_table(path).to_pylist()
+    assert [json.loads(row["result"])["index"] for row in table] == list(range(5))
+    assert json.loads(table[0]["result"])["format"] == "<class 'str'>"
+
+
+def test_evaluators_report_to_the_active_sink(tmp_path):
+    path = tmp_path / "results.jsonl"
+    enable_result_sink(str(path))
+
+    RunCustomResponseEvaluator("some string", str)()
+    disable_result_sink()
+
+    (record,) = read_jsonl(path)
+    assert record["evaluator"] == "RunCustomResponseEvaluator"
+    assert record["result"]["custom_response_result"] == "pass"
+
+
+def test_sink_is_enabled_from_the_environment(tmp_path, monkeypatch):
+    path = tmp_path / "results.jsonl"
+    monkeypatch.setenv("LLM_EVAL_RESULT_SINK", str(path))
+
+    assert isinstance(get_result_sink(), JsonlResultSink)
+
+
+def test_result_log_is_formatted_only_when_emitted(monkeypatch, caplog):
+    formatted = []
+    monkeypatch.setattr(
+        result_sink, "format_dict_log", lambda dictionary: formatted.append(dictionary) or ""
+    )
+    log = logging.getLogger("llm_eval.tests.result_sink")
+
+    with caplog.at_level(logging.INFO, logger=log.name):
+        report_result("RunExampleEvaluator", {"score": 1}, log)
+        assert formatted == []
+
+        enable_result_logging()
+        report_result("RunExampleEvaluator", {"score": 1}, log)
+        assert formatted == [{"score": 1}]
+
+
+def test_result_log_shortens_contexts():
+    text = "x" * 150 + "y" * 150
+    view = str(ResultLog({"retrieved_contexts": [text, "short"]}))
+
+    assert "x" * 100 + "......" + "y" * 100 in view
+    assert text not in view
+    assert "short" in view
@@ -0,0 +1,127 @@
+import math
+from unittest.mock import patch
+
+import pytest
+
+from llm_eval.evaluators.similarity import RunExactMatchEvaluator, RunF1ScoreEvaluator
+from llm_eval.tools.score_cache import (
+    ScoreCache,
+    SQLiteStore,
+    apply_threshold,
+    disable_score_cache,
+    enable_score_cache,
+)
+
+
+@pytest.fixture
+def score_cache(tmp_path):
+    cache = enable_score_cache(directory=str(tmp_path))
+    yield cache
+    disable_score_cache()
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store.sqlite"))
+
+    store.set("key", "value")
+
+    assert store.get("key") == "value"
+    assert store.get("missing") is None
+    assert len(store) == 1
+
+
+def test_sqlite_store_evicts_least_recently_used(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store.sqlite"), max_size_mb=1000 / (1024 * 1024))
+
+    for index in range(10):
+        store.set(f"key-{index}", "x" * 100)
+    store.get("key-0")
+    store.set("key-10", "x" * 100)
+    store.evict()
+
+    assert store.size_bytes <= 900
+    assert store.get("key-0") is not None
+    assert store.get("key-1") is None
+    assert store.get("key-10") is not None
+
+
+def test_score_cache_counts_hits_and_misses(tmp_path):
+    cache = ScoreCache(directory=str(tmp_path))
+    key = cache.make_key("Evaluator", {"model": "m"}, {"response": "text"})
+
+    assert cache.get(key) is None
+    cache.set(key, 0.25)
+    assert cache.get(key) == 0.25
+
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hit_rate"] == 0.5
+    assert cache.stats["entries"] == 1
+
+
+def test_score_cache_key_normalizes_unicode():
+    composed = ScoreCache.make_key("E", {}, {"response": "caf\u00e9"})
+    decomposed = ScoreCache.make_key("E", {}, {"response": "cafe\u0301"})
+
+    assert composed == decomposed
+    assert composed != ScoreCache.make_key("E", {"revision": "v2"}, {"response": "caf\u00e9"})
+
+
+def test_apply_threshold_recomputes_azure_result_layout():
+    cached = {
+        "rouge_precision": 0.6,
+        "rouge_f1_score": 0.4,
+        "rouge_precision_result": "pass",
+        "rouge_f1_score_result": "pass",
+        "rouge_precision_threshold": 0.3,
+        "rouge_f1_score_threshold": 0.3,
+        "bleu_score": 0.55,
+        "bleu_result": "fail",
+        "bleu_threshold": 0.9,
+        "similarity": math.nan,
+        "similarity_result": "pass",
+    }
+
+    result = apply_threshold(cached, 0.5)
+
+    assert result["rouge_precision_result"] == "pass"
+    assert result["rouge_f1_score_result"] == "fail"
+    assert result["rouge_f1_score_threshold"] == 0.5
+    assert result["bleu_result"] == "pass"
+    assert result["bleu_threshold"] == 0.5
+    assert result["similarity_result"] == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_base_score_evaluator_reuses_cached_score_across_thresholds(score_cache):
+    response = "According to wikipedia, Marie Curie was not born in Paris but in Warsaw."
+    reference = "Marie Curie was born in Warsaw."
+
+    first = await RunF1ScoreEvaluator(response, reference, 0.5)()
+    with patch(
+        "llm_eval.base_evaluators.azure_ai_similarity_base_evaluator.BaseScoreEvaluator._score",
+        side_effect=AssertionError("should use the cache"),
+    ):
+        second = await RunF1ScoreEvaluator(response, reference, 0.9)()
+
+    assert second["f1_score"] == first["f1_score"]
+    assert first["f1_result"] == "pass"
+    assert second["f1_result"] == "fail"
+    assert second["f1_threshold"] == 0.9
+    assert score_cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ragas_evaluator_uses_cached_score(score_cache):
+    await RunExactMatchEvaluator("Paris", "Paris")()
+
+    with patch(
+        "ragas.metrics.ExactMatch.single_turn_ascore",
+        side_effect=AssertionError("should use the cache"),
+    ):
+        result = await RunExactMatchEvaluator("Paris", "Paris")()
+
+    assert result["exact_match"] == 1.0
+    assert result["exact_match_result"] == "pass"
+    assert score_cache.stats["hits"] == 1
+    assert score_cache.stats["misses"] == 1
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from llm_eval.evaluators.similarity import RunF1ScoreEvaluator, RunRougeScoreEvaluator
+from llm_eval.tools.lexical_metrics import score_pair
+from llm_eval.tools.text_artefacts import TextArtefactCache, get_text_artefact_cache
+
+RESPONSE = "According to wikipedia, Marie Curie was not born in Paris but in Warsaw."
+REFERENCE = "Marie Curie was born in Warsaw."
+
+
+@pytest.fixture
+def artefact_cache():
+    cache = get_text_artefact_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_builds_each_artefact_once_and_counts_hits():
+    cache = TextArtefactCache(max_entries=10)
+    built = []
+
+    def build(text):
+        built.append(text)
+        return tuple(text.split())
+
+    assert cache.get("tokens", "a b", build) == ("a", "b")
+    assert cache.get("tokens", "a b", build) == ("a", "b")
+    cache.get("other", "a b", build)
+
+    assert built == ["a b", "a b"]
+    assert cache.stats == {"hits": 1, "misses": 2, "hit_rate": 1 / 3, "entries": 2, "evictions": 0}
+
+
+def test_evicts_least_recently_used():
+    cache = TextArtefactCache(max_entries=2)
+    cache.get("tokens", "a", str.split)
+    cache.get("tokens", "b", str.split)
+    cache.get("tokens", "a", str.split)
+    cache.get("tokens", "c", str.split)
+
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+    cache.get("tokens", "a", str.split)
+    assert cache.stats["hits"] == 2
+    cache.get("tokens", "b", str.split)
+    assert cache.stats["misses"] == 4
+
+
+def test_zero_entries_disables_storage():
+    cache = TextArtefactCache(max_entries=0)
+    cache.get("tokens", "a", str.split)
+    cache.get("tokens", "a", str.split)
+
+    assert len(cache) == 0
+    assert cache.stats["misses"] == 2
+    with pytest.raises(ValueError):
+        TextArtefactCache(max_entries=-1)
+
+
+@pytest.mark.parametrize(
+    "evaluator_type, metric",
+    [
+        (RunRougeScoreEvaluator, "RougeScoreEvaluator"),
+        (RunF1ScoreEvaluator, "F1ScoreEvaluator"),
+    ],
+)
+def test_evaluators_match_azure_ai_evaluation(artefact_cache, evaluator_type, metric):
+    import azure.ai.evaluation
+
+    evaluator = evaluator_type(RESPONSE, REFERENCE, 0.5)
+    expected = asyncio.run(
+        evaluator.evaluator._do_eval({"response": RESPONSE, "ground_truth": REFERENCE})
+    )
+
+    result = asyncio.run(evaluator())
+
+    assert isinstance(evaluator.evaluator, getattr(azure.ai.evaluation, metric))
+    assert result == {**expected, "response": RESPONSE, "ground_truth": REFERENCE}
+
+
+def test_battery_on_one_pair_tokenizes_each_text_once(artefact_cache):
+    for rouge_type in ("rougeL", "rouge1", "rouge2"):
+        score_pair("rouge", RESPONSE, REFERENCE, rouge_type=rouge_type)
+    asyncio.run(RunRougeScoreEvaluator(RESPONSE, REFERENCE, 0.5)())
+    asyncio.run(RunF1ScoreEvaluator(RESPONSE, REFERENCE, 0.5)())
+    asyncio.run(RunF1ScoreEvaluator(RESPONSE, REFERENCE, 0.9)())
+
+    # rouge_tokens, rouge_ngrams1, rouge_ngrams2 and f1_counts, for each of the two texts.
+    assert artefact_cache.stats["misses"] == 8
+    assert artefact_cache.stats["hits"] == 8
+    assert len(artefact_cache) == 8
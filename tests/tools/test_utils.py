@@ -1,4 +1,33 @@
-from llm_eval.tools.utils import format_dict_log
+import json
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+import llm_eval
+from llm_eval.tools.utils import format_dict_log, lazy_attributes
+
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "huggingface_hub",
+    "langchain",
+    "langchain_openai",
+    "ragas",
+    "azure.ai.evaluation",
+]
+
+PUBLIC_MODULES = [
+    "llm_eval.evaluators.bias",
+    "llm_eval.evaluators.format",
+    "llm_eval.evaluators.rag",
+    "llm_eval.evaluators.sentiment",
+    "llm_eval.evaluators.similarity",
+    "llm_eval.evaluators.toxicity",
+    "llm_eval.tools.model_tools",
+]
 
 
 def test_format_dict_log():
@@ -30,3 +59,51 @@ faithfulness_result: pass
 
 """
     )
+
+
+def test_lazy_attributes_imports_on_first_access(monkeypatch):
+    module = types.ModuleType("lazy_example")
+    module.__getattr__ = lazy_attributes("lazy_example", {"dumps": "json"})
+    monkeypatch.setitem(sys.modules, "lazy_example", module)
+
+    assert "dumps" not in vars(module)
+    assert module.dumps is json.dumps
+    assert vars(module)["dumps"] is json.dumps
+
+    with pytest.raises(AttributeError):
+        module.loads
+
+
+@pytest.mark.parametrize("module", PUBLIC_MODULES)
+def test_importing_public_modules_does_not_import_heavy_dependencies(module):
+    # Runs in a fresh interpreter, as this test process has already imported everything.
+    script = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert json.loads(output.strip().splitlines()[-1]) == []
+
+
+def test_env_file_settings_apply_before_modules_read_them(tmp_path):
+    # `python -c` has no script file, so python-dotenv looks for `.env` in the working directory.
+    (tmp_path / ".env").write_text("LLM_EVAL_MAX_BATCH_SIZE=7\n")
+    script = (
+        "from llm_eval.tools import micro_batcher, model_tools; "
+        "print(micro_batcher.DEFAULT_MAX_BATCH_SIZE)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(llm_eval.__file__))}
+    env.pop("LLM_EVAL_MAX_BATCH_SIZE", None)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        env=env,
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "7"